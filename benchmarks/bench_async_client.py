@@ -0,0 +1,74 @@
+# benchmarks/bench_async_client.py
+"""
+Prueba de carga del cliente async contra el stub con latencia simulada de agente.
+
+Escenarios:
+  1. N solicitudes idénticas concurrentes (mismo prompt y rol): con coalescing el backend
+     recibe UNA sola llamada.
+  2. Prompts predefinidos distintos: secuencial (requests) vs concurrente (`prefetch`).
+
+Uso:
+    python -m benchmarks.bench_async_client --concurrency 20 --delay-ms 300
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_backend import start_stub_server
+from src.security.models import UserProfile
+from src.services.async_client import AsyncApiClient
+from src.services.http_session import HttpTransport
+from src.views.dashboard_content import get_canned_prompts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--delay-ms", type=float, default=300.0,
+                        help="Latencia simulada del agente por petición")
+    args = parser.parse_args()
+
+    server, url = start_stub_server(response_delay_ms=args.delay_ms)
+    user = UserProfile(username="bench", role="admin", name="Bench", token="stub-token")
+    client = AsyncApiClient(base_url=url)
+    prompt = get_canned_prompts()[0]
+
+    # --- 1. Coalescing: N analistas piden lo mismo a la vez ---
+    def ask(_):
+        return client.run(client.chat(prompt, user))
+
+    server.request_counts.clear()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(ask, range(args.concurrency)))
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"Idénticas x{args.concurrency:<3} {elapsed:8.1f} ms  "
+          f"llamadas al backend={server.request_counts.get('/chat', 0)}  "
+          f"respuestas={sum(r is not None for r in results)}  stats={client.stats()}")
+
+    # --- 2. Prompts distintos: secuencial vs concurrente ---
+    prompts = get_canned_prompts()
+    transport = HttpTransport()
+    headers = {"Authorization": f"Bearer {user.token}"}
+
+    start = time.perf_counter()
+    for p in prompts:
+        transport.post(f"{url}/chat", json={"message": p, "session_id": "bench",
+                                             "context_profile": user.role}, headers=headers).json()
+    sequential = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    client.run(client.prefetch(prompts, user))
+    concurrent = (time.perf_counter() - start) * 1000
+
+    print(f"{len(prompts)} prompts distintos  secuencial={sequential:8.1f} ms  "
+          f"concurrente={concurrent:8.1f} ms  speedup={sequential / concurrent:5.1f}x")
+
+    client.close()
+    transport.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
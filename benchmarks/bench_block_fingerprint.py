@@ -0,0 +1,84 @@
+# benchmarks/bench_block_fingerprint.py
+"""
+Costo de las claves de bloque (widgets, cache de render, exportaciones) por rerun.
+
+- "antes": `md5(str(payload))` en cada render de cada bloque del historial (el `str` de un
+  payload grande domina; con modelos se sumaba `payload.dict()`).
+- "después": `VisualBlock.fingerprint` (blake2b de la serialización canónica), calculado una
+  vez en `parse_visual_block`; en cada render es solo leer un atributo.
+
+También verifica que la clave sea estable (mismo contenido -> misma clave, también tras
+pickle como en el spill del historial) y que distinga contenidos distintos.
+
+Uso:
+    python -m benchmarks.bench_block_fingerprint --rows 10000 --reruns 20
+"""
+
+import argparse
+import hashlib
+import pickle
+import statistics
+import time
+import warnings
+
+from benchmarks.stub_backend import sample_visual_package
+from src.schemas import parse_visual_block
+from src.utils.fingerprint import content_fingerprint
+
+
+def table_block(n_rows: int) -> dict:
+    headers = ["Colaborador", "UO2", "Motivo", "Antigüedad", "Edad"]
+    rows = [[f"Persona {i}", f"División {i % 8}", "RENUNCIA", i * 0.37, 20 + i % 40] for i in range(n_rows)]
+    return {"type": "TABLE", "payload": {"headers": headers, "rows": rows}, "metadata": {"title": "Bajas"}}
+
+
+def legacy_hash(payload) -> str:
+    data = payload.dict() if hasattr(payload, "dict") else payload
+    return hashlib.md5(str(data).encode()).hexdigest()[:8]
+
+
+def timeit(fn, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def check_stability(rows: int):
+    raw = table_block(rows)
+    a, b = parse_visual_block(raw), parse_visual_block(table_block(rows))
+    assert a.fingerprint == b.fingerprint, "mismo contenido debe dar la misma clave"
+    assert pickle.loads(pickle.dumps(a)).fingerprint == a.fingerprint, "la clave debe sobrevivir al spill"
+    changed = table_block(rows)
+    changed["payload"]["rows"][-1][3] += 1
+    assert parse_visual_block(changed).fingerprint != a.fingerprint, "contenidos distintos deben dar claves distintas"
+    for block in sample_visual_package()["content"]:
+        parsed = parse_visual_block(block)
+        assert parsed.fingerprint == parse_visual_block(block).fingerprint
+    print("✅ Claves estables y sensibles al contenido")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--reruns", type=int, default=20, help="Reruns de la sesión a proyectar")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    check_stability(min(args.rows, 1000))
+
+    block = parse_visual_block(table_block(args.rows))
+    before = timeit(lambda: legacy_hash(block.payload))
+    ingest = timeit(lambda: content_fingerprint(block.payload))
+    render = timeit(lambda: block.fingerprint)
+    print(f"TABLE {args.rows} filas")
+    print(f"  md5(str(payload)) por render : {before:8.2f} ms")
+    print(f"  fingerprint al ingresar      : {ingest:8.2f} ms (una vez)")
+    print(f"  fingerprint por render       : {render:8.4f} ms (atributo ya calculado)")
+    print(f"  {args.reruns} reruns -> antes {before * args.reruns:8.1f} ms | después {ingest + render * args.reruns:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_block_validation.py
+"""
+Costo de validación Pydantic de un bloque TABLE grande.
+
+- "antes": `VisualBlock(**raw)` (payload = Union amplio, se prueba miembro por miembro),
+  repetido en cada rerun por cada bloque del historial.
+- "después": el adaptador discriminado por `type` que usa `parse_visual_block`, una sola vez al
+  ingresar. Se mide solo la validación: `parse_visual_block` además arma la copia columnar y el
+  fingerprint del bloque, que no son parte de este cambio.
+
+Uso:
+    python -m benchmarks.bench_block_validation --rows 10000 --reruns 20
+"""
+
+import argparse
+import statistics
+import time
+import warnings
+
+from src.schemas import _BLOCK_ADAPTER, VisualBlock
+
+
+def table_block(n_rows: int, as_dicts: bool) -> dict:
+    headers = ["Colaborador", "UO2", "Motivo", "Antigüedad", "Edad"]
+    if as_dicts:
+        rows = [{"Colaborador": f"Persona {i}", "UO2": f"División {i % 8}", "Motivo": "RENUNCIA",
+                 "Antigüedad": i * 0.37, "Edad": 20 + i % 40} for i in range(n_rows)]
+    else:
+        rows = [[f"Persona {i}", f"División {i % 8}", "RENUNCIA", i * 0.37, 20 + i % 40] for i in range(n_rows)]
+    return {"type": "TABLE", "payload": {"headers": headers, "rows": rows}, "metadata": {"title": "Bajas"}}
+
+
+def timeit(fn, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--reruns", type=int, default=20, help="Reruns de la sesión a proyectar")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    for as_dicts in (False, True):
+        raw = table_block(args.rows, as_dicts)
+        before = timeit(lambda: VisualBlock(**raw))
+        after = timeit(lambda: _BLOCK_ADAPTER.validate_python(raw))
+        shape = "rows=dict" if as_dicts else "rows=list"
+        print(f"TablePayload {args.rows} filas ({shape})")
+        print(f"  Union amplio (VisualBlock)        : {before:8.1f} ms por validación")
+        print(f"  Discriminado (_BLOCK_ADAPTER)     : {after:8.1f} ms por validación")
+        print(f"  {args.reruns} reruns -> antes {before * args.reruns:8.1f} ms | después {after:8.1f} ms (una vez al ingresar)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_columnar_memory.py
+"""
+Memoria de una sesión de N turnos: payloads validados (listas Python) vs bloques ingresados
+(la forma columnar -float64 + códigos categóricos- reemplaza las filas/listas del payload),
+y costo por rerun que la forma columnar elimina.
+
+Antes, cada rerun del historial:
+  - CHART: guardaba en el RenderCache una copia `payload.dict()` del bloque (listas).
+  - TABLE: reconstruía `pd.DataFrame(rows)` desde las filas (no se cacheaba).
+Ahora ambos usan el payload columnar construido una vez al ingresar el bloque.
+tracemalloc no ve los buffers de Arrow (columnas `[pyarrow]` de las tablas): el total de
+"arrays + categorías" (nbytes) sí los incluye.
+
+Uso:
+    python -m benchmarks.bench_columnar_memory --turns 20 --labels 200 --rows 2000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.stub_backend import sample_visual_package
+from src.schemas import _BLOCK_ADAPTER
+from src.utils.columnar import columnar_nbytes
+
+
+def _traced(fn):
+    """(resultado, bytes retenidos por el resultado)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def _mb(n: int) -> str:
+    return f"{n / (1024 * 1024):7.2f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--labels", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    # JSON de ida y vuelta: mismos objetos que produce response.json()
+    raw_turns = [json.loads(json.dumps(sample_visual_package(args.labels, args.rows))) for _ in range(args.turns)]
+
+    validate = lambda: [_BLOCK_ADAPTER.validate_python(b) for t in raw_turns for b in t["content"]]
+    models, models_bytes = _traced(validate)
+
+    def ingest():
+        blocks = validate()
+        for b in blocks:
+            if b.type in ("CHART", "TABLE"):
+                b.columnar  # Construye la forma columnar y suelta las filas/listas del payload
+        return blocks
+    blocks, ingested_bytes = _traced(ingest)
+    reported = sum(columnar_nbytes(b.columnar) for b in blocks if b.type in ("CHART", "TABLE"))
+
+    charts = [b for b in models if b.type == "CHART"]
+    tables = [b for b in models if b.type == "TABLE"]
+    _, chart_dict_bytes = _traced(lambda: [b.payload.model_dump() for b in charts])
+
+    start = time.perf_counter()
+    for b in tables:
+        pd.DataFrame(b.payload.rows, columns=b.payload.headers)
+    table_rebuild_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Sesión de {args.turns} turnos ({args.labels} labels por gráfico, {args.rows} filas por tabla)")
+    print(f"  Modelos validados (listas Python)          {_mb(models_bytes)}")
+    print(f"  Bloques ingresados (columnar, tracemalloc) {_mb(ingested_bytes)}   (arrays + categorías: {_mb(reported)})")
+    print(f"  Eliminado del RenderCache: payload.dict()  {_mb(chart_dict_bytes)}")
+    print(f"  Eliminado por rerun: DataFrame de tablas   {table_rebuild_ms:7.1f} ms para {len(tables)} tablas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_compact_history.py
+"""
+Tiempo de rerun vs largo del historial: historial completo vs modo compacto
+(`render_chat_history` del dashboard, headless con Streamlit AppTest).
+
+Uso:
+    python -m benchmarks.bench_compact_history --turns 1 5 10 20 40
+"""
+
+import argparse
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+
+def history_app(turns: int, compact: bool, live_turns: int, n_labels: int, n_rows: int):
+    """Script AppTest: historial sintético dibujado por `render_chat_history`."""
+    import streamlit as st
+    from benchmarks.stub_backend import sample_visual_package
+    from src.schemas import parse_visual_blocks
+    from src.utils.history_store import HistoryStore
+    from src.views.dashboard import render_chat_history
+
+    if "messages" not in st.session_state:
+        package = sample_visual_package(n_labels=n_labels, n_rows=n_rows)
+        st.session_state.messages = HistoryStore(budget_mb=0)
+        for turn in range(turns):
+            st.session_state.messages.append({"role": "user", "content": f"Pregunta {turn}"})
+            st.session_state.messages.append({"role": "assistant", "content": parse_visual_blocks(package["content"]),
+                                              "summary": package["summary"]})
+
+    render_chat_history(st.session_state.messages, compact=compact, live_turns=live_turns)
+
+
+def measure(turns: int, compact: bool, live_turns: int, reruns: int, n_labels: int, n_rows: int) -> float:
+    at = AppTest.from_function(history_app, args=(turns, compact, live_turns, n_labels, n_rows), default_timeout=600)
+    at.run()
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    assert not at.exception, at.exception
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, nargs="+", default=[1, 5, 10, 20, 40])
+    parser.add_argument("--live-turns", type=int, default=2)
+    parser.add_argument("--reruns", type=int, default=3)
+    parser.add_argument("--labels", type=int, default=60)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'turnos':>7} | {'completo (ms)':>14} | {'compacto (ms)':>14} | speedup")
+    for turns in args.turns:
+        full = measure(turns, False, args.live_turns, args.reruns, args.labels, args.rows)
+        compact = measure(turns, True, args.live_turns, args.reruns, args.labels, args.rows)
+        print(f"{turns:>7} | {full:>14.1f} | {compact:>14.1f} | {full / compact:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
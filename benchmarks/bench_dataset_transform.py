@@ -0,0 +1,128 @@
+# benchmarks/bench_dataset_transform.py
+"""
+Filtro/orden de datasets de gráficos: implementación previa (listas, O(n·m)) vs
+`transform_chart_datasets` (permutación de índices NumPy).
+
+La equivalencia con `legacy_transform` se verifica en tests/test_dataset_transform.py.
+
+Uso:
+    python -m benchmarks.bench_dataset_transform --labels 500
+"""
+
+import argparse
+import random
+import time
+
+from src.utils.columnar import ColumnarChart
+from src.utils.dataset_transform import transform_chart_datasets
+
+
+def legacy_transform(labels, datasets, tooltip_datasets, selected_labels, sort_option):
+    """Copia literal del filtro/orden previo de `_prepare_chart_data` (referencia)."""
+    tooltip_datasets = tooltip_datasets or []
+
+    # Apply Filter
+    # 1. Identify indices based on original labels to maintain Data <-> Label alignment
+    indices = [i for i, label in enumerate(labels) if label in selected_labels]
+
+    # 2. Reconstruct labels from indices (Safe method)
+    filtered_labels = [labels[i] for i in indices]
+
+    # Function to filter a list of datasets (handling nested related_datasets)
+    def filter_ds_list(ds_list, idxs):
+        filtered = []
+        for ds in ds_list:
+            new_ds = ds.copy()
+            source_data = ds.get("data", [])
+            new_ds["data"] = [source_data[i] for i in idxs if i < len(source_data)]
+
+            # Recursively filter related_datasets if they exist
+            if ds.get("related_datasets"):
+                new_ds["related_datasets"] = filter_ds_list(ds["related_datasets"], idxs)
+
+            filtered.append(new_ds)
+        return filtered
+
+    filtered_datasets = filter_ds_list(datasets, indices)
+    filtered_tooltip_datasets = filter_ds_list(tooltip_datasets, indices)
+
+    # --- SORTING LOGIC ---
+    if filtered_datasets and sort_option != "Predeterminado":
+        # Primary Metric (Standard: First Dataset)
+        # Zipping safely: Labels | Main Datasets... | Tooltip Datasets...
+        # Structure: [ (label, val_m1, val_m2..., val_t1, val_t2...), ... ]
+
+        num_main = len(filtered_datasets)
+
+        all_series_data = [d["data"] for d in filtered_datasets] + [d["data"] for d in filtered_tooltip_datasets]
+        combined_data = list(zip(filtered_labels, *all_series_data))
+
+        # Sort Key: Value of first dataset (index 1 of tuple)
+        def get_sort_key(row):
+            val = row[1]
+            if val is None: return 0 if sort_option == "Ascendente" else -float('inf') 
+            return val
+
+        combined_data.sort(
+            key=get_sort_key, 
+            reverse=(sort_option == "Descendente")
+        )
+
+        # Unzip and reassign
+        if combined_data:
+            unzipped = list(zip(*combined_data))
+            filtered_labels = list(unzipped[0])
+
+            # Distribute back to main datasets (including their related_datasets)
+            for idx, ds in enumerate(filtered_datasets):
+                ds["data"] = list(unzipped[idx+1])
+                # Handle sorting for related_datasets if they exist
+                if ds.get("related_datasets"):
+                    # This is complex because related_datasets are nested. 
+                    # We need to apply the SAME sorting to them.
+                    # For simplicity in this logic, we'll re-filter them using the new order of labels
+                    indices_new = [labels.index(l) for l in filtered_labels]
+                    ds["related_datasets"] = filter_ds_list(datasets[idx].get("related_datasets", []), indices_new)
+
+            # Distribute back to tooltip datasets
+            for idx, ds in enumerate(filtered_tooltip_datasets):
+                ds["data"] = list(unzipped[num_main + idx + 1])
+
+    return {"labels": filtered_labels, "datasets": filtered_datasets, "tooltip_datasets": filtered_tooltip_datasets}
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--labels", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    n = args.labels
+    labels = [f"UO-{i:05d}" for i in range(n)]
+    rng = random.Random(1)
+    datasets = [{"label": f"M{k}", "data": [rng.uniform(0, 100) for _ in range(n)],
+                 "related_datasets": [{"label": "R", "data": [rng.uniform(0, 10) for _ in range(n)]}]}
+                for k in range(3)]
+    tooltip = [{"label": "T", "data": [rng.randint(0, 50) for _ in range(n)]}]
+    selected = labels[: int(n * 0.8)]
+
+    chart = ColumnarChart.from_payload({"labels": labels, "datasets": datasets, "tooltip_datasets": tooltip})
+
+    for sort_option in ("Predeterminado", "Descendente"):
+        legacy_ms = _time(lambda: legacy_transform(labels, datasets, tooltip, selected, sort_option), args.repeat)
+        new_ms = _time(lambda: transform_chart_datasets(labels, datasets, tooltip, selected, sort_option), args.repeat)
+        col_ms = _time(lambda: transform_chart_datasets(chart.labels, chart.datasets, chart.tooltip_datasets,
+                                                        selected, sort_option), args.repeat)
+        print(f"{n} labels, {sort_option:<15} legacy={legacy_ms:8.2f} ms  numpy={new_ms:7.2f} ms  "
+              f"columnar={col_ms:7.2f} ms  speedup={legacy_ms / col_ms:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
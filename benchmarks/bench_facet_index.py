@@ -0,0 +1,89 @@
+# benchmarks/bench_facet_index.py
+"""
+Filtros de facetas de TABLE por rerun:
+
+- Antes: `unique()` por columna para decidir qué columnas tienen multiselect, `sorted(unique())`
+  para las opciones y filtros encadenados `df[df[col].isin(...)]` (un DataFrame intermedio por filtro).
+- Ahora: `build_facet_index` una vez por tabla (cardinalidad, opciones ordenadas, bitmaps por valor)
+  y, por rerun, solo la intersección de bitmaps de las selecciones activas.
+
+Verifica que columnas, opciones y filas filtradas coincidan.
+
+Uso:
+    python -m benchmarks.bench_facet_index --rows 10000 100000 200000
+"""
+
+import argparse
+import time
+import warnings
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import table_block
+from src.utils.columnar import table_frame
+from src.utils.table_index import FACET_MAX_VALUES, build_facet_index
+
+FILTERS = {"UO2": ["División 1", "División 3", "División 7"], "Motivo": ["RENUNCIA", "DESPIDO"]}
+
+
+def best_ms(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def rerun_before(df: pd.DataFrame) -> Tuple[Dict[str, List[Any]], pd.DataFrame]:
+    options = {}
+    for col in df.columns:
+        unique_vals = df[col].dropna().unique()
+        is_label_col = df[col].dtype == object or pd.api.types.is_string_dtype(df[col].dtype) \
+            or isinstance(df[col].dtype, pd.CategoricalDtype)
+        if len(unique_vals) < FACET_MAX_VALUES and is_label_col:
+            options[col] = sorted(df[col].dropna().unique().tolist())
+    filtered = df
+    for col, values in FILTERS.items():
+        filtered = filtered[filtered[col].isin(values)]
+    return options, filtered
+
+
+def rerun_after(index) -> Tuple[Dict[str, List[Any]], np.ndarray]:
+    options = {col: facet.values for col, facet in index.facets.items()}
+    return options, np.flatnonzero(index.mask(FILTERS))
+
+
+def run(n_rows: int, repeat: int) -> None:
+    df = table_frame(table_block(n_rows)["payload"])
+    index = build_facet_index(df)
+
+    options_before, filtered = rerun_before(df)
+    options_after, rows = rerun_after(index)
+    assert options_before == options_after
+    assert filtered.index.tolist() == rows.tolist()
+
+    ms_build = best_ms(lambda: build_facet_index(df), repeat)
+    ms_before = best_ms(lambda: rerun_before(df), repeat)
+    ms_after = best_ms(lambda: rerun_after(index), repeat)
+    print(f"\n=== {n_rows} filas ({len(rows)} tras filtrar, índice {index.nbytes / 1024:.0f} KB) ===")
+    print(f"índice (una vez por tabla)   : {ms_build:8.2f} ms")
+    print(f"rerun antes (unique + isin)  : {ms_before:8.2f} ms")
+    print(f"rerun ahora (bitmaps)        : {ms_after:8.2f} ms ({ms_before / ms_after:.0f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 200000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    for n_rows in args.rows:
+        run(n_rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/bench_fragment_reruns.py
+"""
+Latencia por interacción (cambiar el orden del gráfico de la última respuesta) con un
+historial largo: rerun completo de la app vs rerun del fragmento del bloque (FRAGMENT_RERUNS).
+
+La app sintética ejecuta lo mismo que cada rerun del dashboard: `apply_custom_css`,
+`render_sidebar` y el historial completo (modo compacto apagado, peor caso).
+
+AppTest siempre ejecuta el script completo; para simular el rerun que el navegador pide al
+interactuar con un widget dentro de un fragmento se encola el id del fragmento
+(`RerunData.fragment_id_queue`), igual que hace el frontend.
+
+Uso:
+    python -m benchmarks.bench_fragment_reruns --turns 5 10 20
+"""
+
+import argparse
+import functools
+import statistics
+import time
+from unittest import mock
+
+import streamlit.testing.v1.local_script_runner as local_script_runner
+from streamlit.testing.v1 import AppTest
+
+
+def dashboard_app(turns: int, n_labels: int, n_rows: int):
+    """Script AppTest: CSS + sidebar + historial sintético dibujado por `render_chat_history`."""
+    import streamlit as st
+    from benchmarks.stub_backend import sample_visual_package
+    from src.components.sidebar import render_sidebar
+    from src.schemas import parse_visual_blocks
+    from src.security.models import UserProfile
+    from src.state import init_session
+    from src.styles import apply_custom_css
+    from src.utils.history_store import HistoryStore
+    from src.views.dashboard import render_chat_history
+
+    apply_custom_css()
+    init_session()
+    if st.session_state.user is None:
+        st.session_state.user = UserProfile("admin", "Admin Bench", "admin", "t")
+        package = sample_visual_package(n_labels=n_labels, n_rows=n_rows)
+        st.session_state.messages = HistoryStore(budget_mb=0)
+        for turn in range(turns):
+            st.session_state.messages.append({"role": "user", "content": f"Pregunta {turn}"})
+            st.session_state.messages.append({"role": "assistant", "content": parse_visual_blocks(package["content"]),
+                                              "summary": package["summary"]})
+
+    render_sidebar()
+    render_chat_history(st.session_state.messages, compact=False)
+
+
+def run_fragment(at: AppTest, fragment_id: str) -> AppTest:
+    """Rerun de un solo fragmento (lo que pide el navegador al tocar un widget del bloque)."""
+    rerun_data = functools.partial(local_script_runner.RerunData, fragment_id_queue=[fragment_id])
+    with mock.patch.object(local_script_runner, "RerunData", rerun_data):
+        return at.run()
+
+
+def last_chart_sort(at: AppTest, turns: int):
+    """Selectbox de orden del gráfico de la última respuesta."""
+    prefix = f"sort_msg_{2 * turns - 1}_"
+    return next(sb for sb in at.selectbox if (sb.key or "").startswith(prefix))
+
+
+def measure(turns: int, fragments: bool, interactions: int, n_labels: int, n_rows: int) -> float:
+    with mock.patch("src.components.visualizer.FRAGMENT_RERUNS", fragments):
+        at = AppTest.from_function(dashboard_app, args=(turns, n_labels, n_rows), default_timeout=600)
+        at.run()
+        assert not at.exception, at.exception
+
+        fragment_id = None
+        if fragments:
+            # Bloques de la última respuesta: KPI_ROW (sin fragmento), CHART, TABLE
+            storage = at._fragment_storage
+            ordered = sorted(storage._registration_sequence_by_id, key=storage._registration_sequence_by_id.get)
+            fragment_id = ordered[-2]
+
+        options = last_chart_sort(at, turns).options
+        timings = []
+        for i in range(interactions):
+            last_chart_sort(at, turns).set_value(options[1 + i % (len(options) - 1)])
+            start = time.perf_counter()
+            if fragments:
+                run_fragment(at, fragment_id)
+            else:
+                at.run()
+            timings.append((time.perf_counter() - start) * 1000)
+            assert not at.exception, at.exception
+            if fragments:
+                # Solo se re-ejecutó el bloque: un gráfico, ninguna tabla del historial
+                assert len(at.get("plotly_chart")) == 1 and not at.dataframe, "el fragmento no quedó aislado"
+                at.run()  # Vuelve a tener el árbol completo para la próxima interacción
+        return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--interactions", type=int, default=3)
+    parser.add_argument("--labels", type=int, default=60)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'turnos':>7} | {'rerun completo (ms)':>20} | {'fragmento (ms)':>15} | speedup")
+    for turns in args.turns:
+        full = measure(turns, False, args.interactions, args.labels, args.rows)
+        fragment = measure(turns, True, args.interactions, args.labels, args.rows)
+        print(f"{turns:>7} | {full:>20.1f} | {fragment:>15.1f} | {full / fragment:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
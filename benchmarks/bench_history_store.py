@@ -0,0 +1,74 @@
+# benchmarks/bench_history_store.py
+"""
+Memoria retenida por el historial de una sesión: lista sin límite vs `HistoryStore`
+(presupuesto + spill a disco), y latencia de recarga de un turno archivado.
+
+Uso:
+    python -m benchmarks.bench_history_store --turns 20 --labels 200 --rows 2000 --budget-mb 8
+"""
+
+import argparse
+import gc
+import json
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.stub_backend import sample_visual_package
+from src.schemas import parse_visual_blocks
+from src.utils.history_store import HistoryStore
+
+
+def _session(history, raw_turns):
+    for idx, package in enumerate(raw_turns):
+        history.append({"role": "user", "content": f"Consulta {idx}"})
+        history.append({"role": "assistant", "content": parse_visual_blocks(package["content"]),
+                        "summary": package["summary"]})
+    return history
+
+
+def _retained(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, retained
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--labels", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--budget-mb", type=float, default=8.0)
+    parser.add_argument("--hot-turns", type=int, default=6)
+    args = parser.parse_args()
+
+    raw = json.dumps(sample_visual_package(args.labels, args.rows))
+
+    def turns():
+        return [json.loads(raw) for _ in range(args.turns)]
+
+    _, list_bytes = _retained(lambda: _session([], turns()))
+
+    spill_dir = tempfile.mkdtemp()
+    store, store_bytes = _retained(lambda: _session(
+        HistoryStore(budget_mb=args.budget_mb, hot_turns=args.hot_turns, spill_dir=spill_dir), turns()))
+    stats = store.stats()
+
+    start = time.perf_counter()
+    store[1]  # turno más antiguo (archivado)
+    rehydrate_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{args.turns} turnos ({args.labels} labels, {args.rows} filas por tabla)")
+    print(f"  Lista sin límite        {list_bytes / 2**20:7.1f} MB")
+    print(f"  HistoryStore ({args.budget_mb:g} MB)   {store_bytes / 2**20:7.1f} MB   "
+          f"archivados={stats['spilled_turns']}  disco={stats['disk_bytes'] / 2**20:.1f} MB  "
+          f"estimado en memoria={stats['hot_bytes'] / 2**20:.1f} MB")
+    print(f"  Recarga de un turno archivado: {rehydrate_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
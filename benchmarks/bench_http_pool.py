@@ -0,0 +1,61 @@
+# benchmarks/bench_http_pool.py
+"""
+Compara la latencia por turno de chat: `requests.post` sin pool vs `HttpTransport` (Keep-Alive).
+
+Uso:
+    python -m benchmarks.bench_http_pool --turns 50 --handshake-ms 40
+"""
+
+import argparse
+import statistics
+import time
+
+import requests
+
+from benchmarks.stub_backend import start_stub_server
+from src.services.http_session import HttpTransport
+
+
+def _measure(call, turns: int) -> list:
+    timings = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        response = call()
+        response.json()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(name: str, timings: list):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{name:<28} p50={statistics.median(timings):7.2f} ms  p95={p95:7.2f} ms  total={sum(timings):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--handshake-ms", type=float, default=40.0,
+                        help="Costo simulado de conexión nueva (RTT + TLS)")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(handshake_ms=args.handshake_ms)
+    url = f"{base_url}/chat"
+    payload = {"message": "Curva de rotación mensual 2025", "session_id": "session-bench", "context_profile": "admin"}
+
+    try:
+        bare = _measure(lambda: requests.post(url, json=payload), args.turns)
+        transport = HttpTransport()
+        pooled = _measure(lambda: transport.post(url, json=payload), args.turns)
+        transport.close()
+    finally:
+        server.shutdown()
+
+    print(f"Turnos: {args.turns} | Handshake simulado: {args.handshake_ms} ms")
+    _report("requests.post (sin pool)", bare)
+    _report("HttpTransport (keep-alive)", pooled)
+    print(f"Speedup p50: {statistics.median(bare) / statistics.median(pooled):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/bench_metric_format.py
+"""
+Formateo de etiquetas y tooltips de gráficos: punto a punto (`format_metric_value` + `+=`)
+vs por lotes (`format_metric_values` + joins), con verificación de equivalencia previa.
+
+Uso:
+    python -m benchmarks.bench_metric_format --points 2000
+"""
+
+import argparse
+import random
+import time
+
+from src.components.visualizer import Visualizer
+
+FORMATS = [
+    None,
+    {"unit_type": "percentage", "symbol": "%", "decimals": 2},
+    {"unit_type": "currency", "symbol": "S/", "decimals": 2},
+    {"unit_type": "count", "decimals": 0},
+    {"unit_type": "count", "symbol": None, "decimals": 3},
+    {"unit_type": "number", "symbol": "", "decimals": 1},
+]
+
+
+def legacy_tooltips(base, ds_list, num_points):
+    """Ensamblado previo: un `format_metric_value` y un `+=` por punto y por serie."""
+    tooltips = base.copy()
+    for ds in ds_list:
+        for i, val in enumerate(ds.get("data", [])):
+            if i < num_points:
+                tooltips[i] += f"<br><b>{ds.get('label', 'Métrica')}:</b> {Visualizer.format_metric_value(val, ds.get('format'))}"
+    return tooltips
+
+
+def random_series(rng: random.Random, n: int) -> list:
+    return [rng.choice([None, float("nan"), rng.randint(-10**6, 10**6), rng.uniform(-1e4, 1e4), True])
+            for _ in range(n)]
+
+
+def check_equivalence(cases: int, seed: int = 3) -> int:
+    rng = random.Random(seed)
+    for _ in range(cases):
+        values = random_series(rng, rng.randint(0, 30))
+        fmt = rng.choice(FORMATS)
+        expected = [Visualizer.format_metric_value(v, fmt) for v in values]
+        assert Visualizer.format_metric_values(values, fmt) == expected, (values, fmt)
+
+        n = rng.randint(0, 30)
+        ds_list = [{"label": f"T{k}", "data": random_series(rng, rng.randint(0, 35)), "format": rng.choice(FORMATS)}
+                   for k in range(rng.randint(0, 3))]
+        base = [f"b{i}" for i in range(n)]
+        assert Visualizer._join_tooltips(base, ds_list) == legacy_tooltips(base, ds_list, n)
+    return cases
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=2000)
+    parser.add_argument("--series", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Equivalencia: {check_equivalence(2000)} casos aleatorios OK")
+
+    rng = random.Random(1)
+    fmt = FORMATS[1]
+    datasets = [{"label": f"S{k}", "data": [rng.uniform(0, 100) for _ in range(args.points)], "format": fmt}
+                for k in range(args.series)]
+    base = [""] * args.points
+
+    legacy_text = _time(lambda: [[Visualizer.format_metric_value(v, fmt) for v in ds["data"]] for ds in datasets], args.repeat)
+    batch_text = _time(lambda: [Visualizer.format_metric_values(ds["data"], fmt) for ds in datasets], args.repeat)
+    legacy_tt = _time(lambda: legacy_tooltips(base, datasets, args.points), args.repeat)
+    batch_tt = _time(lambda: Visualizer._join_tooltips(base, datasets), args.repeat)
+
+    print(f"Etiquetas  {args.series}x{args.points}: punto a punto={legacy_text:7.2f} ms  lote={batch_text:6.2f} ms  "
+          f"speedup={legacy_text / batch_text:4.1f}x")
+    print(f"Tooltips   {args.series}x{args.points}: punto a punto={legacy_tt:7.2f} ms  lote={batch_tt:6.2f} ms  "
+          f"speedup={legacy_tt / batch_tt:4.1f}x")
+    print("Además el formateo ocurre una vez por estado de filtros (no por vista: Línea, Barras, ...).")
+
+
+if __name__ == "__main__":
+    main()
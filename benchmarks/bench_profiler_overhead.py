@@ -0,0 +1,57 @@
+# benchmarks/bench_profiler_overhead.py
+"""
+Costo por llamada del profiler de render: deshabilitado (`profiled` devuelve la función
+original, `profile_span` un nullcontext compartido) vs habilitado (perf_counter + deque).
+
+El flag se lee al importar; aquí se compara construyendo ambos casos explícitamente.
+
+Uso:
+    python -m benchmarks.bench_profiler_overhead --calls 200000
+"""
+
+import argparse
+import time
+from unittest import mock
+
+import src.utils.profiler as profiler_module
+from src.utils.profiler import Profiler
+
+
+def noop():
+    return None
+
+
+def per_call_ns(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    results = {"sin profiler": per_call_ns(noop, args.calls)}
+    for enabled in (False, True):
+        with mock.patch.object(profiler_module, "PROFILER_ENABLED", enabled), \
+                mock.patch.object(profiler_module, "_PROFILER", Profiler()):
+            decorated = profiler_module.profiled("bench.noop")(noop)
+            assert (decorated is noop) == (not enabled)
+
+            def spanned():
+                with profiler_module.profile_span("bench.span"):
+                    noop()
+
+            state = "habilitado" if enabled else "deshabilitado"
+            results[f"@profiled {state}"] = per_call_ns(decorated, args.calls)
+            results[f"profile_span {state}"] = per_call_ns(spanned, args.calls)
+
+    base = results["sin profiler"]
+    for name, ns in results.items():
+        print(f"{name:28s}: {ns:8.0f} ns/llamada (+{ns - base:6.0f} ns)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/bench_render_cache.py
+"""
+Tiempo de rerun vs largo del historial, con y sin RenderCache.
+
+Ejecuta el loop de historial de `render_dashboard` headless (Streamlit AppTest) con N
+turnos de asistente sintéticos y mide el rerun "en caliente" (sin interacción nueva).
+
+Uso:
+    python -m benchmarks.bench_render_cache --turns 1 5 10 20
+"""
+
+import argparse
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+import src.components.render_cache as render_cache
+
+
+def history_app(turns: int, n_labels: int, n_rows: int):
+    """Script AppTest: historial sintético renderizado con el mismo loop del dashboard."""
+    import streamlit as st
+    from benchmarks.stub_backend import sample_visual_package
+    from src.components.visualizer import Visualizer
+
+    if "messages" not in st.session_state:
+        package = sample_visual_package(n_labels=n_labels, n_rows=n_rows)
+        st.session_state.messages = []
+        for turn in range(turns):
+            st.session_state.messages.append({"role": "user", "content": f"Pregunta {turn}"})
+            st.session_state.messages.append({"role": "assistant", "content": list(package["content"]),
+                                              "summary": package["summary"]})
+
+    for idx, msg in enumerate(st.session_state.messages):
+        if msg["role"] == "assistant":
+            with st.chat_message("assistant"):
+                Visualizer.render(msg["content"], key_prefix=f"msg_{idx}")
+
+
+def measure(turns: int, enabled: bool, reruns: int, n_labels: int, n_rows: int) -> float:
+    render_cache.RENDER_CACHE_ENABLED = enabled
+    at = AppTest.from_function(history_app, args=(turns, n_labels, n_rows), default_timeout=600)
+    at.run()  # Primer render (llena el cache)
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    assert not at.exception, at.exception
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--reruns", type=int, default=3)
+    parser.add_argument("--labels", type=int, default=60)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'turnos':>7} | {'sin cache (ms)':>15} | {'con cache (ms)':>15} | speedup")
+    for turns in args.turns:
+        cold = measure(turns, False, args.reruns, args.labels, args.rows)
+        warm = measure(turns, True, args.reruns, args.labels, args.rows)
+        print(f"{turns:>7} | {cold:>15.1f} | {warm:>15.1f} | {cold / warm:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# benchmarks/bench_streamed_decode.py
+"""
+Decodificación de la respuesta de /chat: cuerpo completo (`response.content` -> `response.text`
+-> `json.loads` -> `parse_visual_blocks`) vs `StreamingPackageDecoder` sobre los chunks.
+
+El paquete sintético (varias tablas grandes + gráficos) se genera en chunks de `--chunk-kb`,
+bloque a bloque, como llegaría por la red: el camino incremental nunca tiene el cuerpo entero.
+Mide tiempo (incluye generar el JSON sintético, igual en ambos caminos), pico de memoria Python
+(tracemalloc) y memoria retenida al terminar, y verifica que ambos caminos produzcan los mismos
+bloques (tipo, fingerprint y contenido). Lo retenido incluye `last_api_response` (Debugger
+activo): en el camino completo es el dict crudo, en el incremental comparte los bloques tipados.
+
+Uso:
+    python -m benchmarks.bench_streamed_decode --tables 4 --rows 25000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+import warnings
+from typing import Any, Dict, Iterator, List
+
+from benchmarks.synthetic import chart_block, kpi_row_block, table_block
+from src.schemas import parse_visual_blocks
+from src.services.package_decoder import StreamingPackageDecoder
+
+
+def build_package(tables: int, rows: int) -> Dict[str, Any]:
+    content: List[Dict[str, Any]] = [kpi_row_block(4)]
+    for i in range(tables):
+        content.append(table_block(rows))
+        content.append(chart_block(500 + i, 3))
+    return {"response_type": "visual_package", "summary": "Paquete sintético", "content": content,
+            "telemetry": {"duration_ms": 1234.5, "model_turns": 3}}
+
+
+def iter_body(package: Dict[str, Any], chunk_kb: int) -> Iterator[bytes]:
+    """Cuerpo JSON del paquete en chunks de `chunk_kb` KB, codificando un bloque a la vez."""
+    head = {k: v for k, v in package.items() if k != "content"}
+    pending = bytearray(json.dumps(head, ensure_ascii=False)[:-1].encode() + b', "content": [')
+    size = chunk_kb * 1024
+    for i, block in enumerate(package["content"]):
+        if i:
+            pending += b", "
+        pending += json.dumps(block, ensure_ascii=False).encode()
+        while len(pending) >= size:
+            yield bytes(pending[:size])
+            del pending[:size]
+    pending += b"]}"
+    yield bytes(pending)
+
+
+def decode_full(chunks: Iterator[bytes]) -> Dict[str, Any]:
+    body = b"".join(chunks)           # response.content
+    text = body.decode("utf-8")       # response.text
+    res_json = json.loads(text)       # response.json()
+    content = parse_visual_blocks(res_json["content"])
+    # last_api_response (dict crudo) + historial (modelos tipados)
+    return {"last_api_response": res_json, "content": content}
+
+
+def decode_streamed(chunks: Iterator[bytes]) -> Dict[str, Any]:
+    res_json = StreamingPackageDecoder().decode(chunks)
+    return {"last_api_response": res_json, "content": res_json["content"]}
+
+
+def measure(decode, package: Dict[str, Any], chunk_kb: int, repeat: int) -> Dict[str, Any]:
+    """Tiempo: mejor de `repeat` corridas sin tracemalloc. Memoria: una corrida aparte con tracemalloc."""
+    times = []
+    for _ in range(repeat):
+        chunks = iter_body(package, chunk_kb)
+        start = time.perf_counter()
+        decode(chunks)
+        times.append((time.perf_counter() - start) * 1000)
+
+    chunks = iter_body(package, chunk_kb)
+    tracemalloc.start()
+    result = decode(chunks)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"result": result, "ms": min(times), "peak_mb": peak / 2**20, "retained_mb": retained / 2**20}
+
+
+def check_equivalent(full: List[Any], streamed: List[Any]) -> None:
+    assert len(full) == len(streamed)
+    for a, b in zip(full, streamed):
+        assert type(a) is type(b), (type(a), type(b))
+        assert a.fingerprint == b.fingerprint
+        assert a.model_dump() == b.model_dump()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tables", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=25000)
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    package = build_package(args.tables, args.rows)
+    body_mb = sum(len(c) for c in iter_body(package, args.chunk_kb)) / 2**20
+    block_mb = len(json.dumps(package["content"][1], ensure_ascii=False).encode()) / 2**20
+    print(f"Paquete: {len(package['content'])} bloques, {body_mb:.1f} MB de JSON "
+          f"(tabla más grande {block_mb:.1f} MB), chunks de {args.chunk_kb} KB")
+
+    # Calentamiento (imports, adaptadores Pydantic)
+    decode_streamed(iter_body(build_package(1, 100), args.chunk_kb))
+
+    full = measure(decode_full, package, args.chunk_kb, args.repeat)
+    streamed = measure(decode_streamed, package, args.chunk_kb, args.repeat)
+    check_equivalent(full["result"]["content"], streamed["result"]["content"])
+
+    for name, r in (("cuerpo completo", full), ("incremental", streamed)):
+        print(f"{name:16s}: {r['ms']:8.0f} ms | pico {r['peak_mb']:7.1f} MB | retenido {r['retained_mb']:7.1f} MB | "
+              f"pico sobre lo retenido {r['peak_mb'] - r['retained_mb']:6.1f} MB")
+    print(f"Pico: {full['peak_mb'] / streamed['peak_mb']:.1f}x menor | "
+          f"tiempo: {full['ms'] / streamed['ms']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
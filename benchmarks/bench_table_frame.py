@@ -0,0 +1,111 @@
+# benchmarks/bench_table_frame.py
+"""
+TABLE grandes: construcción del DataFrame y filtrado.
+
+- Construcción: `table_frame` con ARROW_TABLES=false (pd.DataFrame desde filas, dtypes
+  numpy/object) vs Arrow (transposición única a columnas, vistas [pyarrow] sin copia).
+  Mide tiempo, memoria del frame (memory_usage deep) y pico Python (tracemalloc) al construirlo.
+- Filtrado: 2 filtros de facetas + búsqueda y una página de 100 filas, encadenando
+  `df[df[col].isin(...)]` (copia por paso, como antes) vs una máscara combinada + `take` de la página.
+
+Uso:
+    python -m benchmarks.bench_table_frame --rows 10000 100000 200000
+"""
+
+import argparse
+import time
+import tracemalloc
+import warnings
+from typing import Callable, Tuple
+
+import numpy as np
+import pandas as pd
+
+import src.utils.columnar as columnar
+from benchmarks.synthetic import table_block
+from src.utils.table_index import build_search_index, search_mask
+
+PAGE = 100
+FILTERS = {"UO2": ["División 1", "División 3", "División 7"], "Motivo": ["RENUNCIA", "DESPIDO"]}
+TERM = "persona 1"
+
+
+def best_ms(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def build(payload, arrow: bool) -> pd.DataFrame:
+    columnar.ARROW_TABLES = arrow
+    try:
+        return columnar.table_frame(payload)
+    finally:
+        columnar.ARROW_TABLES = True
+
+
+def python_peak_mb(fn: Callable[[], object]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def filter_copies(df: pd.DataFrame, index: pd.Series) -> Tuple[int, pd.DataFrame]:
+    for col, values in FILTERS.items():
+        df = df[df[col].isin(values)]
+    df = df[search_mask(index, TERM)[df.index.to_numpy()]]
+    return len(df), df.iloc[:PAGE]
+
+
+def filter_mask(df: pd.DataFrame, index: pd.Series) -> Tuple[int, pd.DataFrame]:
+    mask = search_mask(index, TERM)
+    for col, values in FILTERS.items():
+        mask = mask & df[col].isin(values).to_numpy(dtype=bool)
+    rows = np.flatnonzero(mask)
+    return len(rows), df.take(rows[:PAGE])
+
+
+def run(n_rows: int, repeat: int) -> None:
+    payload = table_block(n_rows)["payload"]
+    print(f"\n=== {n_rows} filas ===")
+    frames = {}
+    for name, arrow in (("pandas (filas)", False), ("arrow", True)):
+        ms = best_ms(lambda: build(payload, arrow), repeat)
+        peak = python_peak_mb(lambda: build(payload, arrow))
+        df = frames[name] = build(payload, arrow)
+        mem = df.memory_usage(index=True, deep=True).sum() / 2**20
+        print(f"construcción {name:15s}: {ms:8.1f} ms | frame {mem:7.1f} MB | pico Python {peak:7.1f} MB")
+
+    old, new = frames["pandas (filas)"], frames["arrow"]
+    for col in old.columns:
+        assert old[col].astype(object).tolist() == new[col].astype(object).tolist(), col
+
+    index_old, index_new = build_search_index(old), build_search_index(new)
+    count_old, page_old = filter_copies(old, index_old)
+    count_new, page_new = filter_mask(new, index_new)
+    assert count_old == count_new and page_old.index.tolist() == page_new.index.tolist()
+    ms_copies = best_ms(lambda: filter_copies(old, index_old), repeat)
+    ms_mask = best_ms(lambda: filter_mask(new, index_new), repeat)
+    print(f"filtros + búsqueda ({count_new} filas): copias encadenadas {ms_copies:6.1f} ms | "
+          f"máscara + página {ms_mask:6.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 200000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    for n_rows in args.rows:
+        run(n_rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+# benchmarks/bench_visualizer_suite.py
+"""
+Suite de benchmarks del motor de render (`Visualizer.render`), headless con Streamlit AppTest.
+
+Por cada bloque sintético (KPI_ROW, CHART, TABLE, data_series, talent_matrix) de tamaño
+creciente mide:
+- `cold_ms`: primer render (validación + columnar + figura/DataFrame + serialización).
+- `warm_ms`: mediana de los reruns siguientes (render cache caliente).
+- `peak_kb`: pico de memoria Python (tracemalloc) durante el primer `Visualizer.render`.
+- `output_kb`: tamaño serializado de los elementos enviados al navegador (protobuf).
+
+Los resultados se guardan como baseline JSON y se pueden comparar contra otra corrida:
+una métrica empeora si supera `--tolerance` relativo Y el piso absoluto de esa métrica
+(evita falsos positivos en casos de pocos ms). Con regresiones el proceso sale con código 1.
+
+Uso:
+    python -m benchmarks.bench_visualizer_suite --suite quick --save benchmarks/baselines/visualizer_quick.json
+    python -m benchmarks.bench_visualizer_suite --suite quick --compare benchmarks/baselines/visualizer_quick.json
+    python -m benchmarks.bench_visualizer_suite --suite full --only TABLE
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic import chart_block, data_series_block, kpi_row_block, table_block, talent_matrix_block
+
+# (id, tipo, constructor) por suite
+Case = Tuple[str, str, Callable[[], Dict[str, Any]]]
+
+QUICK: List[Case] = [
+    ("kpi_row_4", "KPI_ROW", lambda: kpi_row_block(4)),
+    ("chart_10x2", "CHART", lambda: chart_block(10, 2)),
+    ("chart_1000x2", "CHART", lambda: chart_block(1000, 2)),
+    ("table_1k", "TABLE", lambda: table_block(1_000)),
+    ("table_10k", "TABLE", lambda: table_block(10_000)),
+    ("data_series_120", "data_series", lambda: data_series_block(120)),
+    ("talent_matrix", "talent_matrix", lambda: talent_matrix_block()),
+]
+
+FULL: List[Case] = [
+    ("kpi_row_4", "KPI_ROW", lambda: kpi_row_block(4)),
+    ("kpi_row_16", "KPI_ROW", lambda: kpi_row_block(16)),
+    ("chart_10x2", "CHART", lambda: chart_block(10, 2)),
+    ("chart_100x2", "CHART", lambda: chart_block(100, 2)),
+    ("chart_1000x2", "CHART", lambda: chart_block(1000, 2)),
+    ("chart_1000x8", "CHART", lambda: chart_block(1000, 8)),
+    ("chart_5000x2", "CHART", lambda: chart_block(5000, 2)),
+    ("chart_5000x8", "CHART", lambda: chart_block(5000, 8)),
+    ("chart_pie_10", "CHART", lambda: chart_block(10, 1, subtype="PIE")),
+    ("table_1k", "TABLE", lambda: table_block(1_000)),
+    ("table_10k", "TABLE", lambda: table_block(10_000)),
+    ("table_50k", "TABLE", lambda: table_block(50_000)),
+    ("table_200k", "TABLE", lambda: table_block(200_000)),
+    ("data_series_12", "data_series", lambda: data_series_block(12)),
+    ("data_series_120", "data_series", lambda: data_series_block(120)),
+    ("data_series_1200", "data_series", lambda: data_series_block(1200)),
+    ("talent_matrix", "talent_matrix", lambda: talent_matrix_block()),
+]
+
+SUITES = {"quick": QUICK, "full": FULL}
+
+# Pisos absolutos por métrica: diferencias menores no cuentan como regresión
+FLOORS = {"cold_ms": 20.0, "warm_ms": 10.0, "peak_kb": 512.0, "output_kb": 16.0}
+
+
+def render_app(blocks):
+    """Script AppTest: un paquete visual dibujado por el motor (+ pico de memoria del render)."""
+    import tracemalloc
+    import streamlit as st
+    from src.components.visualizer import Visualizer
+
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+    Visualizer.render(blocks, key_prefix="bench")
+    if tracing:
+        st.session_state.bench_peak_bytes = tracemalloc.get_traced_memory()[1] - before
+
+
+def output_bytes(node) -> int:
+    """Suma del protobuf serializado de cada elemento del árbol (lo que viaja al navegador)."""
+    total = 0
+    proto = getattr(node, "proto", None)
+    if proto is not None and hasattr(proto, "ByteSize"):
+        total += proto.ByteSize()
+    for child in (getattr(node, "children", None) or {}).values():
+        total += output_bytes(child)
+    return total
+
+
+def new_app(blocks) -> AppTest:
+    return AppTest.from_function(render_app, args=(blocks,), default_timeout=600)
+
+
+def peak_kb(blocks) -> float:
+    """Pico de memoria Python durante el primer `Visualizer.render` (AppTest nuevo)."""
+    at = new_app(blocks)
+    tracemalloc.start()
+    try:
+        at.run()
+    finally:
+        tracemalloc.stop()
+    return at.session_state.bench_peak_bytes / 1024
+
+
+def measure_case(block: Dict[str, Any], reruns: int) -> Dict[str, float]:
+    at = new_app([block])
+    start = time.perf_counter()
+    at.run()
+    cold_ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    errors = [e.value for e in at.error]
+    if errors:
+        raise RuntimeError(errors[0])
+
+    warm = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        warm.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "cold_ms": round(cold_ms, 2),
+        "warm_ms": round(statistics.median(warm), 2),
+        "peak_kb": round(peak_kb([block]), 1),
+        "output_kb": round(output_bytes(at._tree) / 1024, 1),
+    }
+
+
+def run_suite(cases: List[Case], reruns: int) -> Dict[str, Dict[str, Any]]:
+    # Calentamiento: imports, plantillas Plotly y primer AppTest de cada tipo fuera de las mediciones
+    new_app([kpi_row_block(2), chart_block(5, 1), chart_block(5, 1, subtype="PIE"), table_block(20),
+             data_series_block(5), talent_matrix_block(20)]).run()
+
+    results = {}
+    for case_id, block_type, build in cases:
+        block = build()
+        metrics = measure_case(block, reruns)
+        results[case_id] = {"type": block_type, **metrics}
+        print(f"{case_id:18s} {block_type:13s} cold {metrics['cold_ms']:9.1f} ms | warm {metrics['warm_ms']:8.1f} ms | "
+              f"peak {metrics['peak_kb']:9.0f} KB | output {metrics['output_kb']:8.1f} KB", flush=True)
+    return results
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "streamlit": streamlit.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regresiones de `results` frente al baseline (ver FLOORS y `tolerance`)."""
+    regressions = []
+    base_results = baseline.get("results", {})
+    print(f"\nComparación contra baseline ({baseline.get('created_at', '?')}, tolerancia {tolerance:.0%})")
+    for case_id, metrics in results.items():
+        base = base_results.get(case_id)
+        if base is None:
+            print(f"  {case_id:18s} (nuevo, sin baseline)")
+            continue
+        parts = []
+        for metric, floor in FLOORS.items():
+            old, new = base.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            ratio = new / old if old else float("inf") if new else 1.0
+            flag = ""
+            if new - old > floor and ratio > 1 + tolerance:
+                flag = " ❌"
+                regressions.append(f"{case_id}.{metric}: {old} -> {new} ({ratio:.2f}x)")
+            parts.append(f"{metric} {ratio:5.2f}x{flag}")
+        print(f"  {case_id:18s} " + " | ".join(parts))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick")
+    parser.add_argument("--only", nargs="+", help="Tipos de bloque a medir (ej. CHART TABLE)")
+    parser.add_argument("--reruns", type=int, default=3)
+    parser.add_argument("--save", help="Guardar resultados como baseline JSON")
+    parser.add_argument("--compare", help="Baseline JSON contra el cual comparar")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Empeoramiento relativo tolerado")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    cases = [case for case in SUITES[args.suite] if not args.only or case[1] in args.only]
+    results = run_suite(cases, args.reruns)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"suite": args.suite, "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "environment": environment(), "results": results}, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Baseline guardado en {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ Regresiones:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("\n✅ Sin regresiones")
+
+
+if __name__ == "__main__":
+    main()
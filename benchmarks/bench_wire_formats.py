@@ -0,0 +1,156 @@
+# benchmarks/bench_wire_formats.py
+"""
+Tamaño en el cable y costo de decodificación de paquetes representativos de /chat según el
+formato negociado (ver src/services/wire_format.py):
+
+- JSON con TABLE como filas-dict (contrato actual), filas-lista, `columns` o `arrow` (base64).
+- MessagePack con TABLE como `columns` o `arrow` (bytes), si `msgpack` está instalado.
+- Cada uno sin comprimir, gzip y brotli (si `brotli` está instalado).
+
+La decodificación es la del cliente: descompresión + JSON incremental (`StreamingPackageDecoder`)
+o MessagePack + validación, hasta tener los bloques tipados con su DataFrame/columnar.
+Verifica que todas las formas produzcan el mismo DataFrame.
+
+Uso:
+    python -m benchmarks.bench_wire_formats --rows 10000 50000
+"""
+
+import argparse
+import base64
+import copy
+import gzip
+import io
+import json
+import time
+import warnings
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.synthetic import chart_block, kpi_row_block, table_block
+from src.schemas import parse_visual_blocks
+from src.services.package_decoder import StreamingPackageDecoder
+from src.services.wire_format import _msgpack
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CHUNK = 64 * 1024
+
+
+def build_package(rows: int) -> Dict[str, Any]:
+    """KPIs + una tabla de `rows` filas + dos gráficos medianos (forma habitual de un listado)."""
+    return {"response_type": "visual_package", "summary": "Paquete representativo",
+            "content": [kpi_row_block(4), table_block(rows), chart_block(120, 3), chart_block(24, 2, subtype="BAR")],
+            "telemetry": {"duration_ms": 2100.0, "model_turns": 2}}
+
+
+def arrow_ipc(headers: List[str], columns: List[List[Any]]) -> bytes:
+    table = pa.table({str(i): col for i, col in enumerate(columns)}).rename_columns(headers)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def with_table_form(package: Dict[str, Any], form: str, as_text: bool) -> Dict[str, Any]:
+    """Copia del paquete con los TABLE en la forma dada (rows_dict | rows_list | columns | arrow)."""
+    package = copy.deepcopy(package)
+    for block in package["content"]:
+        if block["type"] != "TABLE" or form == "rows_dict":
+            continue
+        payload = block["payload"]
+        headers = payload["headers"]
+        rows = [[row[h] for h in headers] for row in payload["rows"]]
+        if form == "rows_list":
+            payload["rows"] = rows
+            continue
+        columns = [list(col) for col in zip(*rows)]
+        del payload["rows"]
+        if form == "columns":
+            payload["columns"] = columns
+        else:
+            data = arrow_ipc(headers, columns)
+            payload["arrow"] = base64.b64encode(data).decode() if as_text else data
+    return package
+
+
+def compressors() -> Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]]:
+    result = {"identity": (lambda b: b, lambda b: b),
+              "gzip": (lambda b: gzip.compress(b, compresslevel=6), gzip.decompress)}
+    if brotli is not None:
+        result["br"] = (lambda b: brotli.compress(b, quality=5), brotli.decompress)
+    return result
+
+
+def decode_json(body: bytes) -> List[Any]:
+    chunks = (body[i:i + CHUNK] for i in range(0, len(body), CHUNK))
+    return StreamingPackageDecoder().decode(chunks)["content"]
+
+
+def decode_msgpack(body: bytes) -> List[Any]:
+    return parse_visual_blocks(_msgpack().unpackb(body, raw=False)["content"])
+
+
+def best_ms(fn: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def table_frame_of(blocks: List[Any]) -> Optional[pd.DataFrame]:
+    return next((b.columnar for b in blocks if getattr(b, "type", None) == "TABLE"), None)
+
+
+def run(rows: int, repeat: int) -> None:
+    package = build_package(rows)
+    msgpack = _msgpack()
+    variants = [("json", form, lambda p: json.dumps(p, ensure_ascii=False).encode(), decode_json, True)
+                for form in ("rows_dict", "rows_list", "columns", "arrow")]
+    if msgpack is not None:
+        variants += [("msgpack", form, msgpack.packb, decode_msgpack, False) for form in ("columns", "arrow")]
+
+    print(f"\n=== Tabla de {rows} filas (+ KPIs y 2 gráficos) ===")
+    print(f"{'formato':9s} {'TABLE':10s} {'compresión':10s} {'KB':>9s} {'vs base':>8s} {'decode ms':>10s}")
+    reference = None
+    base_kb = None
+    for fmt, form, encode, decode, as_text in variants:
+        body = encode(with_table_form(package, form, as_text))
+        for name, (compress, decompress) in compressors().items():
+            wire = compress(body)
+            blocks = decode(decompress(wire))
+            frame = table_frame_of(blocks)
+            if reference is None:
+                reference = frame
+            else:
+                pd.testing.assert_frame_equal(reference, frame)
+            kb = len(wire) / 1024
+            base_kb = base_kb or kb
+            ms = best_ms(lambda: decode(decompress(wire)), repeat)
+            print(f"{fmt:9s} {form:10s} {name:10s} {kb:9.1f} {kb / base_kb:7.2f}x {ms:10.1f}")
+    if msgpack is None:
+        print("(msgpack no instalado: se omiten las variantes MessagePack)")
+    if brotli is None:
+        print("(brotli no instalado: se omite br)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    decode_json(json.dumps(build_package(50)).encode())  # Calentamiento
+    for rows in args.rows:
+        run(rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# benchmarks/stub_backend.py
+"""
+Backend stub local (HTTP/1.1 con Keep-Alive) que imita los endpoints del backend FastAPI.
+
+Se usa para benchmarks y pruebas manuales del frontend sin depender de Cloud Run.
+También expone los endpoints SSE (`/chat/stream`, `/api/reports/executive/stream`)
+con `event_delay_ms` entre eventos para simular la corrida del agente.
+`handshake_ms` simula el costo de establecer una conexión nueva (RTT + TLS en Cloud Run):
+se paga una sola vez por conexión TCP, igual que en producción.
+`raw_sse` reemplaza los eventos de ambos endpoints SSE por un cuerpo literal, enviado en
+chunks de `sse_chunk_bytes` (tests del framing: CRLF, comentarios, eventos cortados).
+
+Uso:
+    python -m benchmarks.stub_backend --port 8000 --handshake-ms 40
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_COUNTS_LOCK = threading.Lock()
+
+
+def sample_visual_package(n_labels: int = 12, n_rows: int = 50) -> dict:
+    """Paquete visual representativo: KPI_ROW + CHART + TABLE."""
+    labels = [f"2025-{m:02d}" if n_labels <= 12 else f"UO-{m:04d}" for m in range(1, n_labels + 1)]
+    return {
+        "response_type": "visual_package",
+        "summary": "La rotación total 2025 se mantiene estable respecto a 2024.",
+        "content": [
+            {
+                "type": "KPI_ROW",
+                "payload": [
+                    {"label": "Rotación Total", "value": 37.21, "is_percentage": True, "status": "WARNING"},
+                    {"label": "Ceses", "value": 1130, "status": "NEUTRAL"},
+                ],
+            },
+            {
+                "type": "CHART",
+                "subtype": "LINE",
+                "payload": {
+                    "labels": labels,
+                    "datasets": [
+                        {"label": "Rotación Total", "data": [round(2.5 + (i % 7) * 0.31, 2) for i in range(n_labels)],
+                         "format": {"unit_type": "percentage", "symbol": "%", "decimals": 2}},
+                        {"label": "Voluntaria", "data": [round(1.5 + (i % 5) * 0.27, 2) for i in range(n_labels)],
+                         "format": {"unit_type": "percentage", "symbol": "%", "decimals": 2}},
+                    ],
+                    "tooltip_datasets": [
+                        {"label": "Ceses", "data": [40 + i % 13 for i in range(n_labels)],
+                         "format": {"unit_type": "count", "decimals": 0}},
+                    ],
+                },
+                "metadata": {"title": "Evolución mensual de la rotación"},
+            },
+            {
+                "type": "TABLE",
+                "payload": {
+                    "headers": ["Colaborador", "UO2", "Motivo", "Antigüedad"],
+                    "rows": [
+                        {"Colaborador": f"Persona {i}", "UO2": f"División {i % 8}",
+                         "Motivo": ["RENUNCIA", "PERIODO DE PRUEBA", "DESPIDO"][i % 3], "Antigüedad": round(i * 0.37, 2)}
+                        for i in range(n_rows)
+                    ],
+                },
+                "metadata": {"title": "Listado de Bajas Recientes"},
+            },
+        ],
+        "telemetry": {"model_turns": 2, "tools_executed": ["query_cube"], "api_invocations_est": 3},
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-Alive
+    disable_nagle_algorithm = True  # Evita el delayed-ACK de 40 ms en conexiones reutilizadas
+    handshake_ms = 0.0
+    response_delay_ms = 0.0
+    event_delay_ms = 0.0
+    package = None
+    raw_sse = None        # bytes: cuerpo SSE literal en lugar de los eventos generados
+    sse_chunk_bytes = 0   # Tamaño de chunk para raw_sse (0 = un solo chunk)
+    request_counts = None  # {path: n}, compartido por todas las conexiones del servidor
+
+    def setup(self):
+        # Costo por conexión nueva (no por petición)
+        if self.handshake_ms:
+            time.sleep(self.handshake_ms / 1000)
+        super().setup()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, obj, status: int = 200):
+        body = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_sse(self, events):
+        """Envía eventos SSE con Transfer-Encoding chunked (un chunk por evento)."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event_name, data in events:
+            if self.event_delay_ms:
+                time.sleep(self.event_delay_ms / 1000)
+            frame = f"event: {event_name}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(frame):X}\r\n".encode("ascii") + frame + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send_raw_sse(self, body: bytes):
+        """Envía `body` tal cual, partido en chunks de `sse_chunk_bytes` (los cortes caen en cualquier byte)."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        size = self.sse_chunk_bytes or len(body) or 1
+        for start in range(0, len(body), size):
+            chunk = body[start:start + size]
+            self.wfile.write(f"{len(chunk):X}\r\n".encode("ascii") + chunk + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chat_stream_events(self):
+        package = self.package or sample_visual_package()
+        blocks = package.get("content", [])
+        yield "status", {"message": "Consultando el cubo semántico...", "progress": 5}
+        for idx, block in enumerate(blocks, start=1):
+            yield "block", {"block": block, "progress": int(5 + 90 * idx / max(len(blocks), 1))}
+        envelope = {k: v for k, v in package.items() if k != "content"}
+        yield "done", envelope
+
+    def _executive_report_events(self):
+        sections = ["header", "headline", "kpis", "trend", "detail"]
+        blocks = (self.package or sample_visual_package()).get("content", [])
+        for idx, section_id in enumerate(sections):
+            section_blocks = [blocks[idx - 2]] if 2 <= idx < 2 + len(blocks) else [
+                {"type": "text", "variant": "h3", "payload": f"Sección {section_id}"}
+            ]
+            yield "message", {"section_id": section_id, "blocks": section_blocks,
+                              "progress": int(100 * (idx + 1) / len(sections))}
+
+    def do_POST(self):
+        self._read_body()
+        if self.request_counts is not None:
+            with _COUNTS_LOCK:
+                self.request_counts[self.path] = self.request_counts.get(self.path, 0) + 1
+        if self.response_delay_ms:
+            time.sleep(self.response_delay_ms / 1000)
+
+        if self.path == "/token":
+            self._send_json({
+                "access_token": "stub-token",
+                "token_type": "bearer",
+                "user": {"username": "admin", "role": "admin", "name": "Admin Stub"},
+            })
+        elif self.path == "/chat":
+            self._send_json(self.package or sample_visual_package())
+        elif self.path in ("/chat/stream", "/api/reports/executive/stream") and self.raw_sse is not None:
+            self._send_raw_sse(self.raw_sse)
+        elif self.path == "/chat/stream":
+            self._send_sse(self._chat_stream_events())
+        elif self.path == "/api/reports/executive/stream":
+            self._send_sse(self._executive_report_events())
+        elif self.path == "/api/session/reset":
+            self._send_json({"status": "ok"})
+        else:
+            self._send_json({"detail": "Not Found"}, status=404)
+
+
+def start_stub_server(port: int = 0, handshake_ms: float = 0.0, response_delay_ms: float = 0.0,
+                      package: dict = None, event_delay_ms: float = 0.0, raw_sse: bytes = None,
+                      sse_chunk_bytes: int = 0):
+    """
+    Levanta el stub en un hilo daemon.
+
+    Returns:
+        (server, base_url). Llamar `server.shutdown()` al terminar.
+        `server.request_counts` cuenta las peticiones recibidas por path.
+    """
+    request_counts = {}
+    handler = type("ConfiguredStubHandler", (StubHandler,), {
+        "handshake_ms": handshake_ms,
+        "response_delay_ms": response_delay_ms,
+        "event_delay_ms": event_delay_ms,
+        "package": package,
+        "raw_sse": raw_sse,
+        "sse_chunk_bytes": sse_chunk_bytes,
+        "request_counts": request_counts,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.request_counts = request_counts
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backend stub para desarrollo y benchmarks.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    parser.add_argument("--delay-ms", type=float, default=0.0)
+    parser.add_argument("--event-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.port, args.handshake_ms, args.delay_ms,
+                                    event_delay_ms=args.event_delay_ms)
+    print(f"🧪 Stub backend escuchando en {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,73 @@
+# benchmarks/synthetic.py
+"""
+Bloques visuales sintéticos (contrato del backend) de tamaño configurable para benchmarks.
+
+Determinísticos: el mismo tamaño produce siempre el mismo payload (comparables entre corridas).
+"""
+
+from typing import Any, Dict, List
+
+MOTIVOS = ["RENUNCIA", "PERIODO DE PRUEBA", "DESPIDO", "JUBILACIÓN", "FIN DE CONTRATO"]
+
+
+def kpi_row_block(n_indicators: int = 4) -> Dict[str, Any]:
+    return {
+        "type": "KPI_ROW",
+        "payload": [
+            {"label": f"Indicador {i}", "value": round(10 + i * 3.7, 2), "is_percentage": i % 2 == 0,
+             "status": ["WARNING", "NEUTRAL", "SUCCESS", "CRITICAL"][i % 4], "delta": f"{(i % 5) - 2:+d}%"}
+            for i in range(n_indicators)
+        ],
+    }
+
+
+def chart_block(n_labels: int = 12, n_datasets: int = 2, subtype: str = "LINE") -> Dict[str, Any]:
+    labels = [f"UO-{i:05d}" for i in range(n_labels)]
+    datasets = [
+        {"label": f"Serie {d}", "data": [round(1.5 + ((i * (d + 3)) % 97) * 0.11, 2) for i in range(n_labels)],
+         "format": {"unit_type": "percentage", "symbol": "%", "decimals": 2}}
+        for d in range(n_datasets)
+    ]
+    return {
+        "type": "CHART",
+        "subtype": subtype,
+        "payload": {
+            "labels": labels,
+            "datasets": datasets,
+            "tooltip_datasets": [
+                {"label": "Ceses", "data": [40 + i % 13 for i in range(n_labels)], "format": {"unit_type": "count", "decimals": 0}},
+            ],
+        },
+        "metadata": {"title": f"Gráfico {n_labels} labels x {n_datasets} series"},
+    }
+
+
+def table_block(n_rows: int = 1000, as_dicts: bool = True) -> Dict[str, Any]:
+    headers = ["Colaborador", "UO2", "Motivo", "Antigüedad", "Edad", "Sueldo"]
+
+    def row(i: int) -> List[Any]:
+        return [f"Persona {i}", f"División {i % 12}", MOTIVOS[i % len(MOTIVOS)], round((i * 37 % 400) / 10, 1),
+                20 + i % 45, 1500 + (i * 7919) % 12000]
+
+    rows = [dict(zip(headers, row(i))) if as_dicts else row(i) for i in range(n_rows)]
+    return {"type": "TABLE", "payload": {"headers": headers, "rows": rows},
+            "metadata": {"title": f"Listado {n_rows} filas"}}
+
+
+def data_series_block(n_points: int = 12, n_series: int = 3) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {"months": [f"P{i:04d}" for i in range(n_points)]}
+    for s in range(n_series):
+        payload[f"rotacion_{s}"] = [round(2 + ((i + s) % 11) * 0.23, 2) for i in range(n_points)]
+    return {"type": "data_series", "payload": payload, "metadata": {"title": f"Serie {n_points} puntos"}}
+
+
+def talent_matrix_block(n_people: int = 500) -> Dict[str, Any]:
+    counts: Dict[tuple, int] = {}
+    for i in range(n_people):
+        key = (1 + i % 3, 1 + (i * 7) % 3)
+        counts[key] = counts.get(key, 0) + 1
+    return {
+        "type": "talent_matrix",
+        "payload": {"title": "Matriz 9-Box", "data": [{"performance": p, "potential": q, "count": c}
+                                                     for (p, q), c in sorted(counts.items())]},
+    }
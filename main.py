@@ -12,8 +12,14 @@ st.set_page_config(
 )
 
 from src.styles import apply_custom_css
+from src.utils.profiler import profile_span
 
 def main():
+    # Tiempo total del rerun (profiler de render, no-op si está apagado)
+    with profile_span("rerun"):
+        _run_app()
+
+def _run_app():
     # 0. Aplicar Estilos Premium
     apply_custom_css()
 
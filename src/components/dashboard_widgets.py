@@ -26,7 +26,7 @@ def render_welcome_header(user, api_client):
         st.write("")
         if st.button("🗑️ Reiniciar", help="Borrar memoria del agente y limpiar chat", width='stretch'):
              if api_client.reset_session(user):
-                 st.session_state.messages = []
+                 st.session_state.messages.clear()
                  st.session_state.last_api_response = None
                  st.toast("Memoria del agente borrada.", icon="🧹")
                  st.rerun()
@@ -0,0 +1,64 @@
+# src/components/executive_report_stream.py
+import streamlit as st
+from typing import Any, Dict, List, Optional
+from src.services.api_client import ApiClient
+from src.security.models import UserProfile
+from src.components.visualizer import Visualizer
+
+
+class ExecutiveReportStreamer:
+    """
+    Renderiza el Reporte Ejecutivo sección por sección a medida que llega vía SSE.
+
+    Cada sección (`{"section_id", "blocks", "progress"}`) se dibuja con el Visualizer
+    apenas se recibe, mientras una barra de progreso refleja el avance reportado por el backend.
+    """
+
+    @staticmethod
+    def render(period: str, user: UserProfile, uo2_filter: Optional[str] = None,
+               key_prefix: str = "exec_report", api_client: Optional[ApiClient] = None) -> List[Dict[str, Any]]:
+        """
+        Consume el stream del reporte y lo renderiza incrementalmente.
+
+        Args:
+            period: Periodo del reporte ("2025" o "2025-01").
+            user: Usuario autenticado (token y rol).
+            uo2_filter: División opcional para acotar el reporte.
+            key_prefix: Namespace de widgets para los bloques renderizados.
+            api_client: Cliente a usar (por defecto uno nuevo sobre el pool compartido).
+
+        Returns:
+            Lista de todos los bloques recibidos (para guardarlos en el historial si se desea).
+        """
+        api_client = api_client or ApiClient()
+        all_blocks: List[Dict[str, Any]] = []
+
+        progress_bar = st.progress(0, text=f"📡 Generando reporte ejecutivo {period}...")
+        sections_container = st.container()
+
+        for section in api_client.stream_executive_report(period, user, uo2_filter=uo2_filter):
+            if section.get("event") == "error":
+                progress_bar.empty()
+                st.error(section.get("message", "Error generando el reporte."))
+                return all_blocks
+
+            section_id = section.get("section_id", f"section_{len(all_blocks)}")
+            blocks = section.get("blocks") or []
+            progress = ExecutiveReportStreamer._clamp_progress(section.get("progress"))
+
+            progress_bar.progress(progress, text=f"⏳ Sección **{section_id}** ({progress}%)")
+
+            if blocks:
+                with sections_container:
+                    Visualizer.render(blocks, key_prefix=f"{key_prefix}_{section_id}")
+                all_blocks.extend(blocks)
+
+        progress_bar.progress(100, text="✅ Reporte ejecutivo completo")
+        return all_blocks
+
+    @staticmethod
+    def _clamp_progress(value: Any) -> int:
+        try:
+            return max(0, min(100, int(value)))
+        except (TypeError, ValueError):
+            return 0
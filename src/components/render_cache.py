@@ -0,0 +1,84 @@
+# src/components/render_cache.py
+import streamlit as st
+from typing import Any, Callable, Hashable
+from src.config import RENDER_CACHE_ENABLED, RENDER_CACHE_MAX_ENTRIES, RENDER_CACHE_MAX_MB
+from src.utils.lru_cache import LRUCache, approx_sizeof
+
+
+def estimate_figure_bytes(fig: Any) -> int:
+    """Tamaño aproximado de una figura Plotly según la cantidad de puntos de sus trazas."""
+    points = 0
+    for trace in getattr(fig, "data", ()):
+        for attr in ("x", "y", "z", "text", "customdata", "labels", "values"):
+            values = getattr(trace, attr, None)
+            if values is not None and hasattr(values, "__len__"):
+                points += len(values)
+    return 4096 + points * 64
+
+
+def _sizeof_entry(value: Any) -> int:
+    if hasattr(value, "to_plotly_json"):
+        return estimate_figure_bytes(value)
+    return approx_sizeof(value)
+
+
+class RenderCache:
+    """
+    Cache de renderizado por sesión para el historial de chat.
+
+    - `memo`: resultados derivados de un objeto fuente (validación, hash, dict del payload).
+      La entrada solo es válida si la fuente es el MISMO objeto (identidad), así un
+      historial reiniciado nunca recibe datos de mensajes anteriores. Como la entrada mantiene
+      viva la fuente, su tamaño se suma al de la entrada (RENDER_CACHE_MAX_MB la acota).
+    - `get_or_build`: figuras y datos preparados, indexados por bloque + estado de widgets
+      (filtros, orden). Solo se recalcula el bloque cuyo estado cambió.
+    """
+
+    def __init__(self, max_items: int = RENDER_CACHE_MAX_ENTRIES, max_mb: float = RENDER_CACHE_MAX_MB):
+        self.entries = LRUCache(max_items=max_items, max_bytes=int(max_mb * 1024 * 1024), sizeof=_sizeof_entry)
+
+    def memo(self, namespace: str, source: Any, compute: Callable[[], Any]) -> Any:
+        key = ("memo", namespace, id(source))
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] is source:
+            return entry[1]
+        value = compute()
+        # La entrada retiene la fuente (para la comprobación de identidad): cuenta en el tope de memoria
+        self.entries.put(key, (source, value), size=_sizeof_entry(value) + approx_sizeof(source))
+        return value
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        return self.entries.get_or_compute(key, builder)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        return self.entries.stats()
+
+
+class _NullRenderCache(RenderCache):
+    """Cache deshabilitado: siempre recalcula (útil para benchmarks y debugging)."""
+
+    def __init__(self):
+        super().__init__(max_items=0, max_mb=0)
+
+    def memo(self, namespace, source, compute):
+        return compute()
+
+    def get_or_build(self, key, builder):
+        return builder()
+
+
+def get_render_cache() -> RenderCache:
+    """Cache de renderizado de la sesión actual (se crea bajo demanda en session_state)."""
+    if not RENDER_CACHE_ENABLED:
+        return _NULL_CACHE
+    cache = st.session_state.get("render_cache")
+    if cache is None:
+        cache = RenderCache()
+        st.session_state.render_cache = cache
+    return cache
+
+
+_NULL_CACHE = _NullRenderCache()
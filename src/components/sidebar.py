@@ -1,7 +1,9 @@
 import streamlit as st
 import os
 from src.state import logout
+from src.utils.profiler import profiled
 
+@profiled("render_sidebar")
 def render_sidebar():
     """Renderiza el sidebar con el menú de navegación y botón de logout."""
     with st.sidebar:
@@ -98,7 +100,7 @@ def render_sidebar():
         # --- ACTIONS FOOTER ---
         # Botón para limpiar historial
         if st.button("🗑️ Limpiar Historial", width='stretch', type="secondary", help="Borra la conversación actual para iniciar de cero."):
-            st.session_state.messages = []
+            st.session_state.messages.clear()
             st.session_state.messages.append({
                 "role": "assistant", 
                 "content": "¡Hola de nuevo! Historial limpio. ¿En qué puedo ayudarte ahora?"
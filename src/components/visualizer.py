@@ -1,10 +1,25 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from typing import Union, Optional, List, Dict, Any
-from src.schemas import VisualBlock, KPICard
+from typing import Union, Optional, List, Dict, Any, Callable
+from src.schemas import VisualBlock, KPICard, parse_visual_block
 from src.utils.chart_styles import ChartColors, ChartLayouts
+from src.components.render_cache import get_render_cache
+from src.config import LAZY_CHART_VIEWS, TABLE_PAGE_SIZES, TABLE_DEFAULT_PAGE_SIZE, FRAGMENT_RERUNS
+from src.utils.table_index import build_facet_index, build_search_index, search_mask
+from src.utils.exporters import EXPORT_FORMATS, available_formats, lazy_export
+from src.utils.dataset_transform import transform_chart_datasets
+from src.utils.columnar import ColumnarChart, table_frame, display_values, has_table_data
+from src.utils.fingerprint import content_fingerprint
+from src.utils.profiler import profiled, instrument_methods
+
+# Separador para el formateo por lotes (nunca aparece en un número formateado)
+_FORMAT_SEP = "\x1f"
+
+# st.plotly_chart medido por el profiler (serialización de la figura + envío al navegador)
+_plotly_chart = profiled("st.plotly_chart")(st.plotly_chart)
 
 class Visualizer:
     """
@@ -22,7 +37,7 @@ class Visualizer:
         Main entry point. Renders a list of visual blocks with Error Boundaries.
         
         Args:
-            content: List of visual blocks (dictionaries or Pydantic models).
+            content: List of visual blocks (VisualBlock models or raw dictionaries).
             key_prefix: Unique string to namespace widgets and keys.
         """
         if not content:
@@ -31,10 +46,12 @@ class Visualizer:
         for idx, raw_block in enumerate(content):
             # --- 1. Contract Layer (Validation) ---
             try:
-                # Validate the block structure using Pydantic
-                # If raw_block is already a dict, we validate it.
-                if isinstance(raw_block, dict):
-                   block = VisualBlock(**raw_block)
+                # Blocks are normally validated once at ingest (parse_visual_blocks) and arrive as models.
+                # Raw dicts (streaming, examples, invalid-at-ingest) are validated here, once per session.
+                if isinstance(raw_block, VisualBlock):
+                   block = raw_block
+                elif isinstance(raw_block, dict):
+                   block = get_render_cache().memo("block", raw_block, lambda: parse_visual_block(raw_block))
                 else:
                    # Fallback or skip if malformed
                    continue
@@ -49,14 +66,23 @@ class Visualizer:
             # --- 2. Block Rendering (With Error Boundary) ---
             # Priority: 1. Backend ID, 2. Index-based Key
             block_key = block.id if block.id else f"{key_prefix}_{idx}"
-            
-            try:
-                Visualizer._render_block(block, block_key)
-            except Exception as e:
-                # --- 3. Error Boundary (Fallback) ---
-                st.error(f"⚠️ Error visualizando bloque '{block.type}': {e}")
-                # Log full trace for devs
-                # st.caption(traceback.format_exc())
+
+            if FRAGMENT_RERUNS and block.type in _INTERACTIVE_BLOCKS:
+                # Filtros/orden/búsqueda del bloque re-ejecutan solo este fragmento
+                _render_block_fragment(block, block_key)
+            else:
+                Visualizer._render_block_guarded(block, block_key)
+
+    @staticmethod
+    def _render_block_guarded(block: VisualBlock, block_key: str):
+        """`_render_block` dentro del Error Boundary (también en reruns de fragmento)."""
+        try:
+            Visualizer._render_block(block, block_key)
+        except Exception as e:
+            # --- 3. Error Boundary (Fallback) ---
+            st.error(f"⚠️ Error visualizando bloque '{block.type}': {e}")
+            # Log full trace for devs
+            # st.caption(traceback.format_exc())
 
     @staticmethod
     def _render_block(block: VisualBlock, block_key: str):
@@ -80,12 +106,14 @@ class Visualizer:
             Visualizer._render_kpis_v2(payload)
 
         elif b_type == "CHART":
-            # Payload is ChartPayload dict with labels/datasets
-            Visualizer._render_chart_v2(payload, block.subtype, metadata, block_key)
+            # Payload is ChartPayload dict with labels/datasets (+ columnar copy built at ingest)
+            Visualizer._render_chart_v2(payload, block.subtype, metadata, block_key, columnar=getattr(block, "columnar", None),
+                                        fingerprint=block.fingerprint)
 
         elif b_type == "TABLE":
-            # Payload is TablePayload dict with headers/rows
-            Visualizer._render_table_v2(payload, metadata, block_key)
+            # Payload is TablePayload dict with headers/rows (+ DataFrame built at ingest)
+            Visualizer._render_table_v2(payload, metadata, block_key, frame=getattr(block, "columnar", None),
+                                        fingerprint=block.fingerprint)
             
         # --- V1: Legacy Handover ---
         elif b_type == "kpi_row":
@@ -94,15 +122,15 @@ class Visualizer:
                 
         elif b_type == "plot":
             if isinstance(payload, dict):
-                 Visualizer._render_plot_block(payload, metadata, block_key) 
+                 Visualizer._render_plot_block(payload, metadata, block_key, fingerprint=block.fingerprint)
                 
         elif b_type == "table":
              if isinstance(payload, list): # Legacy is list of dicts
-                Visualizer._render_table(payload, key_prefix=block_key)
+                Visualizer._render_table(payload, key_prefix=block_key, fingerprint=block.fingerprint)
             
         elif b_type == "data_series":
              if isinstance(payload, dict):
-                Visualizer._render_interactive_series(payload, metadata, key_prefix=block_key)
+                Visualizer._render_interactive_series(payload, metadata, key_prefix=block_key, fingerprint=block.fingerprint)
             
         elif b_type == "debug_sql":
             from src.config import SHOW_DEBUG_UI
@@ -131,7 +159,7 @@ class Visualizer:
              # Render Plotly JSON directly
              try:
                  fig = go.Figure(payload)
-                 st.plotly_chart(fig, width='stretch', key=block_key)
+                 _plotly_chart(fig, width='stretch', key=block_key)
              except Exception as e:
                  st.error(f"Error renderizando Plotly: {e}")
 
@@ -256,6 +284,66 @@ class Visualizer:
                 return f"{symbol}{rounded}"  # "S/1,250.00"
         
         return rounded  # "462" (count without symbol)
+
+    @staticmethod
+    def format_metric_values(values: list, fmt: Optional[dict] = None) -> List[str]:
+        """
+        Batch version of `format_metric_value` for a whole series (same output, element by element).
+
+        The series is formatted in ONE printf pass: a single template repeated per value,
+        applied with `%` over the tuple of values and split back (C-level, no per-point call).
+        """
+        if hasattr(fmt, "dict"): fmt = fmt.dict()
+        if not fmt:
+            decimals, prefix, suffix = 2, "", "%"
+        else:
+            decimals = fmt.get("decimals", 2)
+            symbol = fmt.get("symbol")
+            unit_type = fmt.get("unit_type", "percentage")
+            prefix, suffix = "", ""
+            if symbol:
+                if unit_type == "percentage":
+                    suffix = symbol
+                else:
+                    prefix = symbol
+
+        if isinstance(values, np.ndarray) and values.dtype.kind == "f":
+            # Columnar series: NaN = missing
+            present = ~np.isnan(values)
+            present_values = tuple(values[present].tolist())
+        else:
+            present = [v is not None and not (isinstance(v, float) and v != v) for v in values]
+            present_values = tuple(v for v, ok in zip(values, present) if ok)
+        if not present_values:
+            return [""] * len(values)
+
+        template = f"{prefix.replace('%', '%%')}%.{int(decimals)}f{suffix.replace('%', '%%')}"
+        try:
+            formatted = (_FORMAT_SEP.join([template] * len(present_values)) % present_values).split(_FORMAT_SEP)
+        except TypeError:
+            # Valores no numéricos: mismo resultado (o error) que el formateo punto a punto
+            return [Visualizer.format_metric_value(v, fmt) for v in values]
+
+        if len(present_values) == len(values):
+            return formatted
+        it = iter(formatted)
+        return [next(it) if ok else "" for ok in present]
+
+    @staticmethod
+    def _tooltip_column(ds: Dict[str, Any], num_points: int) -> List[str]:
+        """HTML tooltip fragment per point for one (tooltip/related) dataset, padded to num_points."""
+        label = ds.get("label", "Métrica")
+        formatted = Visualizer.format_metric_values(ds.get("data", [])[:num_points], ds.get("format"))
+        head = f"<br><b>{label}:</b> "
+        return [head + v for v in formatted] + [""] * (num_points - len(formatted))
+
+    @staticmethod
+    def _join_tooltips(base: List[str], ds_list: List[Dict[str, Any]]) -> List[str]:
+        """Appends the tooltip columns of `ds_list` to `base` with one join per point."""
+        if not ds_list:
+            return list(base)
+        columns = [Visualizer._tooltip_column(ds, len(base)) for ds in ds_list]
+        return ["".join(row) for row in zip(base, *columns)]
     
     @staticmethod
     def _aggregate_small_slices(labels: list, values: list, threshold_percent: float = 0.02) -> tuple:
@@ -296,7 +384,9 @@ class Visualizer:
         final_colors = []
         final_tooltips = []
         
-        total = sum([x for x in values if x is not None]) or 1
+        # None / NaN (columnar series) count as 0
+        values = [0 if v is None or v != v else v for v in values]
+        total = sum(values) or 1
         threshold_percent = 0.02
         other_sum = 0
         
@@ -366,7 +456,7 @@ class Visualizer:
             size_values = ds_secondary.get("data", [])
             size_label = ds_secondary.get("label")
             # Normalize size for visual sanity approx
-            max_val = max([v for v in size_values if v is not None] or [1])
+            max_val = max([v for v in size_values if v is not None and v == v] or [1])
             size_ref = 2.0 * max_val / (40**2) # Heuristic for plotly 'sizeref'
         
         # Clean data for plotting
@@ -382,7 +472,7 @@ class Visualizer:
                 val_y = y_values[i]
                 val_s = size_values[i] if i < len(size_values) else 0
                 
-                if val_y is not None:
+                if val_y is not None and val_y == val_y:  # skip None / NaN
                     plot_x.append(label)
                     plot_y.append(val_y)
                     # Ensure positive size
@@ -422,31 +512,142 @@ class Visualizer:
         return fig
 
     @staticmethod
-    def _render_chart_v2(payload: Dict[str, Any], subtype: str, metadata: Dict[str, Any], key_prefix: str):
+    def _payload_hash(payload: Any) -> str:
+        """
+        Hash corto y determinista de un payload suelto (memoizado por sesión mientras el objeto viva).
+        Los bloques validados traen su `fingerprint` calculado al ingresar: usar ese.
+        """
+        return get_render_cache().memo("payload_hash", payload, lambda: content_fingerprint(payload))
+
+    @staticmethod
+    def _prepare_chart_data(columnar: ColumnarChart, selected_labels: List[str], sort_option: str) -> Dict[str, Any]:
+        """
+        Aplica filtro y orden a labels + datasets (incluye tooltip y related_datasets)
+        y construye los strings HTML de tooltip global.
+
+        Returns:
+            Dict con 'labels', 'datasets', 'tooltip_datasets', 'tooltip_strings' y, por dataset,
+            'series_text' (etiquetas formateadas) y 'series_tooltips' (tooltip global + related).
+        """
+        # Filtro + orden: una sola permutación de índices (NumPy) aplicada a todas las series
+        transformed = transform_chart_datasets(
+            columnar.labels,
+            columnar.datasets,
+            columnar.tooltip_datasets,
+            selected_labels,
+            sort_option
+        )
+        filtered_labels = transformed["labels"]
+        filtered_datasets = transformed["datasets"]
+        filtered_tooltip_datasets = transformed["tooltip_datasets"]
+
+        # --- PREPARE TOOLTIP STRINGS / TEXT LABELS ---
+        # Formatted once per dataset here and shared by every view (Line, Bar, Pie, Bubble)
+        tooltip_strings = Visualizer._join_tooltips([""] * len(filtered_labels), filtered_tooltip_datasets)
+
+        return {
+            "labels": filtered_labels,
+            "datasets": filtered_datasets,
+            "tooltip_datasets": filtered_tooltip_datasets,
+            "tooltip_strings": tooltip_strings,
+            "series_text": [Visualizer.format_metric_values(ds.get("data", []), ds.get("format")) for ds in filtered_datasets],
+            "series_tooltips": [Visualizer._join_tooltips(tooltip_strings, ds.get("related_datasets") or []) for ds in filtered_datasets],
+        }
+
+    @staticmethod
+    def _create_cartesian_chart(chart_type: str, labels: list, datasets: list, tooltip_strings: list, metadata: dict, colors: list,
+                                series_text: Optional[list] = None, series_tooltips: Optional[list] = None) -> go.Figure:
+        """
+        Builds the LINE or BAR figure of a V2 chart (one trace per dataset, per-series tooltips).
+
+        `series_text` / `series_tooltips` are the pre-formatted labels from `_prepare_chart_data`;
+        when missing they are formatted here.
+        """
+        fig = go.Figure()
+
+        for idx, ds in enumerate(datasets):
+            ds_label = ds.get("label", f"Serie {idx+1}")
+            ds_data = ds.get("data", [])
+            color = ds.get("color") or ds.get("backgroundColor") or ds.get("borderColor") or colors[idx % len(colors)]
+            ds_format = ds.get("format"); 
+            if hasattr(ds_format, "dict"): ds_format = ds_format.dict()
+            val_suffix = "%" if ds_format and ds_format.get("unit_type") == "percentage" else ""
+
+            # --- SERIES-SPECIFIC TOOLTIPS ---
+            # If the dataset has related_datasets, the series tooltip = global ones + related values
+            if series_tooltips is not None:
+                current_series_tooltips = series_tooltips[idx]
+            else:
+                current_series_tooltips = Visualizer._join_tooltips(tooltip_strings, ds.get("related_datasets") or [])
+            text_labels = series_text[idx] if series_text is not None else Visualizer.format_metric_values(ds_data, ds_format)
+
+            if chart_type == "BAR":
+                fig.add_trace(go.Bar(
+                    x=labels,
+                    y=ds_data,
+                    name=ds_label,
+                    marker_color=color,
+                    customdata=current_series_tooltips,
+                    text=text_labels,
+                    textposition="auto",
+                    hovertemplate=f"<b>{ds_label}</b><br>Dimensión: %{{x}}<br>Valor: %{{y}}{val_suffix}%{{customdata}}<extra></extra>"
+                ))
+            else: # LINE
+                fig.add_trace(go.Scatter(
+                    x=labels,
+                    y=ds_data,
+                    mode='lines+markers+text',
+                    name=ds_label,
+                    line=dict(color=color, width=3),
+                    marker=dict(size=8),
+                    customdata=current_series_tooltips,
+                    text=text_labels,
+                    textposition="top center",
+                    hovertemplate=f"<b>{ds_label}</b><br>Dimensión: %{{x}}<br>Valor: %{{y}}{val_suffix}%{{customdata}}<extra></extra>"
+                ))
+        
+        layout = ChartLayouts.get_cartesian_layout(
+            title=metadata.get("title", ""),
+            x_label="Dimension",
+            y_label=metadata.get("y_axis_label", "Valor"),
+            show_legend=metadata.get("show_legend", True)
+        )
+        fig.update_layout(layout)
+        return fig
+
+    @staticmethod
+    def _render_chart_v2(payload: Dict[str, Any], subtype: str, metadata: Dict[str, Any], key_prefix: str,
+                         columnar: Optional[ColumnarChart] = None, fingerprint: Optional[str] = None):
         """
         Renders standardized charts (Pie, Line, Bar) based on the V2 Payload Schema.
+
+        Filtered/sorted data and every figure are memoized in the session RenderCache,
+        keyed by block + widget state, so untouched history blocks skip recomputation.
         
         Args:
             payload: Dict containing 'labels' (List[str]) and 'datasets' (List[Dict]).
             subtype: 'PIE', 'LINE', or 'BAR'.
             metadata: Configuration for titles, legends, etc.
             key_prefix: Unique key namespace.
+            columnar: Array-backed payload built at ingest (built here, once, if missing).
+            fingerprint: Content key computed at ingest (`VisualBlock.fingerprint`).
         """
-        # Payload: { labels: [], datasets: [{label, data, ...}] }
-        if hasattr(payload, "dict"): payload = payload.dict() # Handle Pydantic
-        
-        labels = payload.get("labels", [])
-        datasets = payload.get("datasets", [])
-        tooltip_datasets = payload.get("tooltip_datasets") or []
+        cache = get_render_cache()
+
+        # --- FILTERING LOGIC ---
+        data_hash = fingerprint or Visualizer._payload_hash(payload)
+
+        # Payload: { labels: [], datasets: [{label, data, ...}] } as arrays (no per-render conversion)
+        if columnar is None:
+            columnar = cache.memo("columnar_chart", payload, lambda: ColumnarChart.from_payload(payload))
+
+        labels = columnar.label_list
+        datasets = columnar.datasets
         
         if not datasets:
             st.warning("⚠️ Gráfico sin datos.")
             return
 
-        # --- FILTERING LOGIC ---
-        import hashlib
-        data_hash = hashlib.md5(str(payload).encode()).hexdigest()[:8]
-        
         selected_labels = st.multiselect(
             "🔍 Filtrar Dimensión:",
             options=labels,
@@ -458,257 +659,135 @@ class Visualizer:
             st.warning("⚠️ Selecciona al menos un elemento.")
             return
 
-        # Apply Filter
-        # 1. Identify indices based on original labels to maintain Data <-> Label alignment
-        indices = [i for i, label in enumerate(labels) if label in selected_labels]
-        
-        # 2. Reconstruct labels from indices (Safe method)
-        filtered_labels = [labels[i] for i in indices]
-        
-        # Function to filter a list of datasets (handling nested related_datasets)
-        def filter_ds_list(ds_list, idxs):
-            filtered = []
-            for ds in ds_list:
-                new_ds = ds.copy()
-                source_data = ds.get("data", [])
-                new_ds["data"] = [source_data[i] for i in idxs if i < len(source_data)]
-                
-                # Recursively filter related_datasets if they exist
-                if ds.get("related_datasets"):
-                    new_ds["related_datasets"] = filter_ds_list(ds["related_datasets"], idxs)
-                    
-                filtered.append(new_ds)
-            return filtered
-
-        filtered_datasets = filter_ds_list(datasets, indices)
-        filtered_tooltip_datasets = filter_ds_list(tooltip_datasets, indices)
-
         # --- SORTING LOGIC ---
-        # Only show if we have data to sort
-        if filtered_datasets:
-            col_sort, _ = st.columns([2, 5])
-            with col_sort:
-                sort_option = st.selectbox(
-                    "⇅ Ordenar Gráfico:",
-                    options=["Predeterminado", "Ascendente", "Descendente"],
-                    index=0,
-                    key=f"sort_{key_prefix}_{data_hash}",
-                    help="Reordena las barras y líneas según el valor de la primera métrica."
-                )
+        col_sort, _ = st.columns([2, 5])
+        with col_sort:
+            sort_option = st.selectbox(
+                "⇅ Ordenar Gráfico:",
+                options=["Predeterminado", "Ascendente", "Descendente"],
+                index=0,
+                key=f"sort_{key_prefix}_{data_hash}",
+                help="Reordena las barras y líneas según el valor de la primera métrica."
+            )
 
-            if sort_option != "Predeterminado":
-                # Primary Metric (Standard: First Dataset)
-                primary_data = filtered_datasets[0]["data"]
-                
-                # Zipping safely: Labels | Main Datasets... | Tooltip Datasets...
-                # Structure: [ (label, val_m1, val_m2..., val_t1, val_t2...), ... ]
-                
-                num_main = len(filtered_datasets)
-                num_tool = len(filtered_tooltip_datasets)
-                
-                all_series_data = [d["data"] for d in filtered_datasets] + [d["data"] for d in filtered_tooltip_datasets]
-                combined_data = list(zip(filtered_labels, *all_series_data))
-                
-                # Sort Key: Value of first dataset (index 1 of tuple)
-                def get_sort_key(row):
-                    val = row[1]
-                    if val is None: return 0 if sort_option == "Ascendente" else -float('inf') 
-                    return val
-
-                combined_data.sort(
-                    key=get_sort_key, 
-                    reverse=(sort_option == "Descendente")
-                )
-                
-                # Unzip and reassign
-                if combined_data:
-                    unzipped = list(zip(*combined_data))
-                    filtered_labels = list(unzipped[0])
-                    
-                    # Distribute back to main datasets (including their related_datasets)
-                    for idx, ds in enumerate(filtered_datasets):
-                        ds["data"] = list(unzipped[idx+1])
-                        # Handle sorting for related_datasets if they exist
-                        if ds.get("related_datasets"):
-                            # This is complex because related_datasets are nested. 
-                            # We need to apply the SAME sorting to them.
-                            # For simplicity in this logic, we'll re-filter them using the new order of labels
-                            indices_new = [labels.index(l) for l in filtered_labels]
-                            ds["related_datasets"] = filter_ds_list(payload.get("datasets", [])[idx].get("related_datasets", []), indices_new)
-                    
-                    # Distribute back to tooltip datasets
-                    for idx, ds in enumerate(filtered_tooltip_datasets):
-                        ds["data"] = list(unzipped[num_main + idx + 1])
-
-        # --- PREPARE TOOLTIP STRINGS ---
-        # Generate a list of HTML strings to append to the hover tooltip
-        # Length = len(filtered_labels)
-        
-        num_points = len(filtered_labels)
-        tooltip_strings = [""] * num_points
-        
-        if filtered_tooltip_datasets:
-             for tds in filtered_tooltip_datasets:
-                 t_label = tds.get("label", "Métrica")
-                 t_data = tds.get("data", [])
-                 t_fmt = tds.get("format") 
-                 if hasattr(t_fmt, "dict"): t_fmt = t_fmt.dict()
-                 
-                 for i, val in enumerate(t_data):
-                     if i < num_points:
-                         val_fmt = Visualizer.format_metric_value(val, t_fmt)
-                         tooltip_strings[i] += f"<br><b>{t_label}:</b> {val_fmt}"
+        # --- PREPARED DATA (Cached by widget state) ---
+        view_key = (key_prefix, data_hash, tuple(selected_labels), sort_option)
+        prepared = cache.get_or_build(
+            ("chart_v2_data",) + view_key,
+            lambda: Visualizer._prepare_chart_data(columnar, selected_labels, sort_option)
+        )
+        filtered_labels = prepared["labels"]
+        filtered_datasets = prepared["datasets"]
+        tooltip_strings = prepared["tooltip_strings"]
 
+        COLORS = ChartColors.get_colors()
+        fig_key = view_key + (tuple(COLORS),)
+
+        # --- VIEW RENDERERS (each one builds its figure only when invoked) ---
+        def render_cartesian(chart_type_target):
+            fig = cache.get_or_build(("chart_v2_fig", chart_type_target) + fig_key, lambda: Visualizer._create_cartesian_chart(
+                chart_type_target, filtered_labels, filtered_datasets, tooltip_strings, metadata, COLORS,
+                series_text=prepared["series_text"], series_tooltips=prepared["series_tooltips"]
+            ))
+            _plotly_chart(fig, width='stretch', key=f"{key_prefix}_{chart_type_target}_{data_hash}")
+
+        def render_pie(cache_tag, chart_key, show_caption):
+            if not filtered_datasets:
+                st.info("No data for Chart")
+                return
+            ds = filtered_datasets[0]
+            if show_caption and len(filtered_datasets) > 1:
+                st.caption(f"ℹ️ Visualizando solo la primera serie: {ds.get('label')}")
+                
+            colors = ds.get("backgroundColor")
+            fig = cache.get_or_build(("chart_v2_fig", cache_tag) + fig_key, lambda: Visualizer._create_pie_chart(
+                labels=filtered_labels,
+                values=ds["data"],
+                metadata=metadata,
+                tooltip_strings=tooltip_strings,
+                colors=colors if isinstance(colors, list) else COLORS
+            ))
+            _plotly_chart(fig, width='stretch', key=chart_key)
+
+        def render_bubble():
+            if not filtered_datasets:
+                 st.info("No data for Bubble Chart")
+                 return
+            fig = cache.get_or_build(("chart_v2_fig", "BUBBLE") + fig_key, lambda: Visualizer._create_bubble_chart(
+                datasets=filtered_datasets,
+                labels=filtered_labels,
+                metadata=metadata,
+                tooltip_strings=tooltip_strings
+            ))
+            _plotly_chart(fig, width='stretch', key=f"{key_prefix}_bubble_{data_hash}")
+
+        def render_table():
+            def build_table():
+                # Reconstruct Table from Labes + Datasets (Filtered)
+                table_dict = {"Eje": filtered_labels}
+                for ds in filtered_datasets:
+                    ds_label = ds.get("label", "Serie")
+                    table_dict[ds_label] = display_values(ds.get("data", []))
+                return pd.DataFrame(table_dict)
+
+            df_table = cache.get_or_build(("chart_v2_table",) + view_key, build_table)
+            st.dataframe(df_table, width='stretch', hide_index=True)
+            
+            # Download Button (built on click only)
+            Visualizer._render_export(
+                lambda: df_table,
+                cache_key=("chart_v2",) + view_key,
+                file_stem=f"reporte_{key_prefix}",
+                key=f"dl_{key_prefix}_{data_hash}"
+            )
 
         if subtype and subtype.upper() == "PIE":
-            # ... [Existing Pie Logic] ...
-             # --- PIE CHART MODE (Legacy/Explicit) ---
-            tab_list = ["🍩 Gráfico de Torta", "📋 Tabla"]
-            tabs = st.tabs(tab_list)
-            
-            with tabs[0]:
-                if not filtered_datasets:
-                    st.info("No data for Pie Chart")
-                else:
-                    ds = filtered_datasets[0]
-                    fig = Visualizer._create_pie_chart(
-                        labels=filtered_labels,
-                        values=ds["data"],
-                        metadata=metadata,
-                        tooltip_strings=tooltip_strings,
-                        colors=ds.get("backgroundColor")
-                    )
-                    st.plotly_chart(fig, width='stretch', key=f"{key_prefix}_pie_{data_hash}")
-                    
+            # --- PIE CHART MODE (Legacy/Explicit) ---
+            views = {
+                "🍩 Gráfico de Torta": lambda: render_pie("PIE", f"{key_prefix}_pie_{data_hash}", show_caption=False),
+                "📋 Tabla": render_table,
+            }
         else:
             # --- DEFAULT MODE (LINE / BAR / PIE / BUBBLE / TABLE) ---
-            tab_list = ["📈 Línea", "📊 Barras", "🍩 Torta", "🫧 Burbujas", "📋 Tabla"]
-            tabs = st.tabs(tab_list)
-            
-            COLORS = ChartColors.get_colors()
-            
-            # --- TABS 1 & 2: Line/Bar ---
-            for tab_idx, chart_type_target in enumerate(["LINE", "BAR"]):
-                with tabs[tab_idx]:
-                    fig = go.Figure()
-                    for idx, ds in enumerate(filtered_datasets):
-                        ds_label = ds.get("label", f"Serie {idx+1}")
-                        ds_data = ds.get("data", [])
-                        color = ds.get("color") or ds.get("backgroundColor") or ds.get("borderColor") or COLORS[idx % len(COLORS)]
-                        ds_format = ds.get("format"); 
-                        if hasattr(ds_format, "dict"): ds_format = ds_format.dict()
-                        val_suffix = "%" if ds_format and ds_format.get("unit_type") == "percentage" else ""
-
-                        # --- SERIES-SPECIFIC TOOLTIPS ---
-                        # If the dataset has related_datasets, we build a specific tooltip for this series
-                        current_series_tooltips = tooltip_strings.copy() # Start with global ones
-                        
-                        if ds.get("related_datasets"):
-                             for rds in ds["related_datasets"]:
-                                 r_label = rds.get("label", "Métrica")
-                                 r_data = rds.get("data", [])
-                                 r_fmt = rds.get("format")
-                                 if hasattr(r_fmt, "dict"): r_fmt = r_fmt.dict()
-                                 
-                                 for i, val in enumerate(r_data):
-                                     if i < num_points:
-                                         val_fmt = Visualizer.format_metric_value(val, r_fmt)
-                                         current_series_tooltips[i] += f"<br><b>{r_label}:</b> {val_fmt}"
-
-                        if chart_type_target == "BAR":
-                            fig.add_trace(go.Bar(
-                                x=filtered_labels,
-                                y=ds_data,
-                                name=ds_label,
-                                marker_color=color,
-                                customdata=current_series_tooltips,
-                                text=[Visualizer.format_metric_value(v, ds_format) for v in ds_data],
-                                textposition="auto",
-                                hovertemplate=f"<b>{ds_label}</b><br>Dimensión: %{{x}}<br>Valor: %{{y}}{val_suffix}%{{customdata}}<extra></extra>"
-                            ))
-                        else: # LINE
-                            fig.add_trace(go.Scatter(
-                                x=filtered_labels,
-                                y=ds_data,
-                                mode='lines+markers+text',
-                                name=ds_label,
-                                line=dict(color=color, width=3),
-                                marker=dict(size=8),
-                                customdata=current_series_tooltips,
-                                text=[Visualizer.format_metric_value(v, ds_format) for v in ds_data],
-                                textposition="top center",
-                                hovertemplate=f"<b>{ds_label}</b><br>Dimensión: %{{x}}<br>Valor: %{{y}}{val_suffix}%{{customdata}}<extra></extra>"
-                            ))
-                    
-                    layout = ChartLayouts.get_cartesian_layout(
-                        title=metadata.get("title", ""),
-                        x_label="Dimension",
-                        y_label=metadata.get("y_axis_label", "Valor"),
-                        show_legend=metadata.get("show_legend", True)
-                    )
-                    fig.update_layout(layout)
-                    st.plotly_chart(fig, width='stretch', key=f"{key_prefix}_{chart_type_target}_{data_hash}")
-
-            # --- TAB 3: Donut ---
-            with tabs[2]:
-                if not filtered_datasets:
-                    st.info("No data for Chart")
-                else:
-                    ds = filtered_datasets[0]
-                    if len(filtered_datasets) > 1:
-                        st.caption(f"ℹ️ Visualizando solo la primera serie: {ds.get('label')}")
-                        
-                    fig = Visualizer._create_pie_chart(
-                        labels=filtered_labels,
-                        values=ds["data"],
-                        metadata=metadata,
-                        tooltip_strings=tooltip_strings,
-                        colors=ds.get("backgroundColor")
-                    )
-                    st.plotly_chart(fig, width='stretch', key=f"{key_prefix}_pie_tab_{data_hash}")
+            views = {
+                "📈 Línea": lambda: render_cartesian("LINE"),
+                "📊 Barras": lambda: render_cartesian("BAR"),
+                "🍩 Torta": lambda: render_pie("DONUT", f"{key_prefix}_pie_tab_{data_hash}", show_caption=True),
+                "🫧 Burbujas": render_bubble,
+                "📋 Tabla": render_table,
+            }
 
-            # --- TAB 4: Bubble ---
-            with tabs[3]:
-                if not filtered_datasets:
-                     st.info("No data for Bubble Chart")
-                else:
-                     fig = Visualizer._create_bubble_chart(
-                         datasets=filtered_datasets,
-                         labels=filtered_labels,
-                         metadata=metadata,
-                         tooltip_strings=tooltip_strings
-                     )
-                     st.plotly_chart(fig, width='stretch', key=f"{key_prefix}_bubble_{data_hash}")
+        Visualizer._render_views(views, key=f"view_{key_prefix}_{data_hash}")
 
+    @staticmethod
+    def _render_views(views: Dict[str, Callable[[], None]], key: str):
+        """
+        Renders alternative views of the same data (chart types, table).
 
-        # --- TABLE TAB (Shared Logic) ---
-        # The table tab index depends on the mode
-        # PIE mode: [Pie, Table] -> Table is index 1
-        # Default mode: [Line, Bar, Donut, Bubble, Table] -> Table is index 4
-        table_tab_index = 1 if (subtype and subtype.upper() == "PIE") else 4
-        
-        with tabs[table_tab_index]:
-            # Reconstruct Table from Labes + Datasets (Filtered)
-            table_dict = {"Eje": filtered_labels}
-            for ds in filtered_datasets:
-                ds_label = ds.get("label", "Serie")
-                table_dict[ds_label] = ds.get("data", [])
-            
-            df_table = pd.DataFrame(table_dict)
-            st.dataframe(df_table, width='stretch', hide_index=True)
-            
-            # Download Button
-            csv = df_table.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="📥 Descargar CSV",
-                data=csv,
-                file_name=f"reporte_{key_prefix}.csv",
-                mime='text/csv',
-                key=f"dl_{key_prefix}_{data_hash}"
+        Lazy mode (LAZY_CHART_VIEWS): a segmented control stored in session state picks
+        the view and ONLY that renderer runs. Otherwise every view is rendered eagerly in st.tabs.
+        """
+        labels = list(views.keys())
+
+        if LAZY_CHART_VIEWS:
+            selected = st.segmented_control(
+                "Vista",
+                options=labels,
+                default=labels[0],
+                key=key,
+                label_visibility="collapsed"
             )
+            # Deselecting the active segment returns None: fall back to the default view
+            views.get(selected, views[labels[0]])()
+        else:
+            tabs = st.tabs(labels)
+            for tab, render_view in zip(tabs, views.values()):
+                with tab:
+                    render_view()
 
     @staticmethod
-    def _render_table_v2(payload: Dict[str, Any], metadata: Dict[str, Any], key_prefix: str):
+    def _render_table_v2(payload: Dict[str, Any], metadata: Dict[str, Any], key_prefix: str,
+                         frame: Optional[pd.DataFrame] = None, fingerprint: Optional[str] = None):
         """
         Renders a rich interactive table with client-side filtering and search.
         
@@ -716,44 +795,31 @@ class Visualizer:
             payload: Dict containing 'headers' (List[str]) and 'rows' (List[List]).
             metadata: Configuration for title and column formats.
             key_prefix: Unique namespace.
+            frame: DataFrame built at ingest (`table_frame`); built here, once, if missing.
+            fingerprint: Content key computed at ingest (`VisualBlock.fingerprint`).
         """
-        # Payload: { headers: [], rows: [] }
-        if hasattr(payload, "dict"): payload = payload.dict()
-        
-        headers = payload.get("headers", [])
-        rows = payload.get("rows", [])
+        cache = get_render_cache()
+        data_hash = fingerprint or Visualizer._payload_hash(payload)
+
+        # Payload: { headers: [], rows: [] } (o columns / arrow, ver table_frame)
+        headers = payload.headers if hasattr(payload, "dict") else payload.get("headers", [])
         
-        if not headers or not rows:
+        # Ingested blocks keep their data only in `frame` (the payload rows are released)
+        has_data = len(frame) > 0 if frame is not None else has_table_data(payload)
+        if not headers or not has_data:
             st.warning("⚠️ Tabla sin datos.")
             return
         
-        # --- NORMALIZATION LAYER ---
-        # Handle cases where columns are defined with accessors (Section 6 format)
-        if isinstance(headers, list) and len(headers) > 0 and isinstance(headers[0], dict):
-            # Format: [{accessor, header}, ...]
-            normalized_headers = [h.get("header", h.get("accessor", "Col")) for h in headers]
-            accessors = [h.get("accessor") for h in headers]
-            
-            # Reconstruct rows if they are dicts based on accessors
-            if isinstance(rows, list) and len(rows) > 0 and isinstance(rows[0], dict):
-                normalized_rows = []
-                for row_dict in rows:
-                    normalized_rows.append([row_dict.get(acc, "") for acc in accessors])
-                rows = normalized_rows
-            headers = normalized_headers
-
-        # Create DataFrame
-        # Safety: If rows are list of dicts, pd.DataFrame handles it directly with columns=headers
-        try:
-            if isinstance(rows, list) and len(rows) > 0 and isinstance(rows[0], dict):
-                df_original = pd.DataFrame(rows, columns=headers)
-            else:
-                df_original = pd.DataFrame(rows, columns=headers)
-        except Exception as e:
-            st.error(f"Error parsing table data: {e}")
-            return
-
-        df = df_original.copy()  # Working copy for filters
+        # Columnar DataFrame (normalized headers, categorical label columns). Never mutated:
+        # filters and search always produce new frames.
+        if frame is None:
+            try:
+                frame = cache.memo("table_frame", payload, lambda: table_frame(payload))
+            except Exception as e:
+                st.error(f"Error parsing table data: {e}")
+                return
+        df_original = frame
+        headers = list(df_original.columns)
         
         # --- TITLE (from metadata or can be passed from summary) ---
         title = metadata.get("title", "")
@@ -761,13 +827,18 @@ class Visualizer:
             st.markdown(f"#### {title}")
         
         # --- FILTERS IN EXPANDER ---
+        # Filters and search combine into one boolean mask over df_original: no intermediate
+        # frames; only the visible page (or the export, on click) is materialized.
+        active_filters = {}
+        mask = None
         with st.expander("🔍 **Filtros Avanzados**", expanded=False):
-            # Detect categorical columns (string types with reasonable unique values)
-            filter_cols = []
-            for col in headers:
-                unique_vals = df_original[col].dropna().unique()
-                if len(unique_vals) < 50 and df_original[col].dtype == 'object':
-                    filter_cols.append(col)
+            # Categorical columns (string types with reasonable unique values): cardinality,
+            # sorted options and per-value row bitmaps are indexed once per payload
+            facet_index = cache.get_or_build(
+                ("facet_index", key_prefix, data_hash),
+                lambda: build_facet_index(df_original)
+            )
+            filter_cols = list(facet_index.facets)
             
             if filter_cols:
                 st.caption("Selecciona valores para filtrar. Deja vacío para ver todos.")
@@ -775,17 +846,15 @@ class Visualizer:
                 # Create multiselect filters in columns (up to 3 per row for better layout)
                 cols_per_row = min(3, len(filter_cols))
                 
-                active_filters = {}
                 for row_idx in range(0, len(filter_cols), cols_per_row):
                     filter_row = filter_cols[row_idx:row_idx + cols_per_row]
                     cols = st.columns(len(filter_row))
                     
                     for idx, col_name in enumerate(filter_row):
                         with cols[idx]:
-                            unique_values = sorted(df_original[col_name].dropna().unique().tolist())
                             selected = st.multiselect(
                                 f"{col_name}",
-                                options=unique_values,
+                                options=facet_index.facets[col_name].values,
                                 default=[],  # EMPTY BY DEFAULT
                                 key=f"filter_{key_prefix}_{col_name}",
                                 placeholder="Todos"
@@ -793,9 +862,8 @@ class Visualizer:
                             if selected:  # Only apply if user selected something
                                 active_filters[col_name] = selected
                 
-                # Apply all active filters
-                for col_name, selected_values in active_filters.items():
-                    df = df[df[col_name].isin(selected_values)]
+                # Apply all active filters (bitmap intersection)
+                mask = facet_index.mask(active_filters)
             
             # --- SEARCH BAR (Global text search) ---
             st.markdown("---")
@@ -806,42 +874,120 @@ class Visualizer:
             )
             
             if search_term:
-                mask = df.astype(str).apply(
-                    lambda row: row.str.contains(search_term, case=False, na=False).any(), 
-                    axis=1
+                # Single vectorized match over a per-table index (built once per payload)
+                search_index = cache.get_or_build(
+                    ("search_index", key_prefix, data_hash),
+                    lambda: build_search_index(df_original)
                 )
-                df = df[mask]
+                term_mask = search_mask(search_index, search_term)
+                mask = term_mask if mask is None else mask & term_mask
+        
+        visible_rows = None if mask is None else np.flatnonzero(mask)
         
         # --- STATS ---
         total_records = len(df_original)
-        filtered_records = len(df)
+        filtered_records = total_records if visible_rows is None else len(visible_rows)
         
         if filtered_records < total_records:
             st.info(f"📊 Mostrando **{filtered_records}** de **{total_records}** registros (filtrado activo)")
         else:
             st.caption(f"📊 **{total_records}** registros totales")
         
-        # --- FORMAT NUMERIC COLUMNS TO 2 DECIMALS ---
-        # Apply formatting to numeric columns (likely rotation rates)
-        for col in df.columns:
-            if df[col].dtype in ['float64', 'float32']:
-                # Format to 2 decimals for display
-                df[col] = df[col].apply(lambda x: f"{x:.2f}" if pd.notna(x) else x)
+        # --- RENDER TABLE (Paginated: only the visible slice is formatted and sent) ---
+        Visualizer._render_paginated_dataframe(df_original, key=f"table_{key_prefix}", height=400, format_floats=True,
+                                               rows=visible_rows)
         
-        # --- RENDER TABLE ---
-        st.dataframe(df, width='stretch', hide_index=True, height=400)
-        
-        # --- DOWNLOAD BUTTON ---
-        csv = df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="📥 Descargar datos filtrados (CSV)",
-            data=csv,
-            file_name=f"{key_prefix}_export.csv",
-            mime='text/csv',
+        # --- DOWNLOAD BUTTON (built on click, memoized by payload + active filters) ---
+        filter_state = tuple(sorted((col, tuple(vals)) for col, vals in active_filters.items())) + (search_term,)
+        Visualizer._render_export(
+            lambda: df_original if visible_rows is None else df_original.take(visible_rows),
+            cache_key=("table_v2", key_prefix, data_hash, filter_state),
+            file_stem=f"{key_prefix}_export",
             key=f"dl_table_{key_prefix}",
+            label_suffix=" datos filtrados"
+        )
+
+    @staticmethod
+    def _render_export(df_provider: Callable[[], pd.DataFrame], cache_key: tuple, file_stem: str, key: str, label_suffix: str = ""):
+        """
+        Format selector + download button. The file is encoded only when the user clicks
+        (callable `data`, no rerun) and memoized per (cache_key, format) in the session export cache.
+        """
+        formats = available_formats()
+        fmt = st.selectbox(
+            "Formato de descarga",
+            options=formats,
+            key=f"{key}_fmt",
+            label_visibility="collapsed"
+        )
+        extension, mime, label = EXPORT_FORMATS[fmt]
+        st.download_button(
+            label=f"{label}{label_suffix}",
+            data=lazy_export(df_provider, fmt, cache_key),
+            file_name=f"{file_stem}.{extension}",
+            mime=mime,
+            key=key,
+            on_click="ignore",
             width='stretch'
         )
 
+    @staticmethod
+    def _format_float_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """Formats float columns to 2 decimals for display (vectorized, returns a new frame)."""
+        float_cols = [col for col in df.columns if pd.api.types.is_float_dtype(df[col].dtype)]
+        if not float_cols:
+            return df
+        df = df.copy()
+        for col in float_cols:
+            values = df[col]
+            df[col] = values.round(2).map("{:.2f}".format, na_action="ignore").where(values.notna(), None)
+        return df
+
+    @staticmethod
+    def _render_paginated_dataframe(df: pd.DataFrame, key: str, height: Union[int, str] = "auto",
+                                    column_config: Optional[dict] = None, format_floats: bool = False,
+                                    rows: Optional[np.ndarray] = None):
+        """
+        Renders a DataFrame one page at a time.
+
+        Page size and page cursor live in session state (`{key}_page_size`, `{key}_page`).
+        Filtering/search happen upstream on the full data (`rows`: positions of the rows that
+        pass them, None = all); only the visible slice is formatted and serialized to the browser.
+        """
+        total_rows = len(df) if rows is None else len(rows)
+        size_key = f"{key}_page_size"
+        page_key = f"{key}_page"
+
+        if size_key not in st.session_state:
+            st.session_state[size_key] = TABLE_DEFAULT_PAGE_SIZE
+        page_size = st.session_state[size_key]
+        total_pages = max(1, -(-total_rows // page_size))
+
+        # Clamp the cursor BEFORE the widget exists (filters may have shrunk the data)
+        if st.session_state.get(page_key, 1) > total_pages:
+            st.session_state[page_key] = total_pages
+
+        c_info = None
+        if total_rows > min(TABLE_PAGE_SIZES):
+            c_size, c_page, c_info = st.columns([1, 1, 3])
+            with c_size:
+                st.selectbox("Filas por página", options=TABLE_PAGE_SIZES, key=size_key)
+            with c_page:
+                st.number_input("Página", min_value=1, max_value=total_pages, step=1, key=page_key)
+
+        page = min(st.session_state.get(page_key, 1), total_pages)
+        start = (page - 1) * page_size
+        page_df = df.iloc[start:start + page_size] if rows is None else df.take(rows[start:start + page_size])
+
+        if format_floats:
+            page_df = Visualizer._format_float_columns(page_df)
+
+        st.dataframe(page_df, width='stretch', hide_index=True, height=height, column_config=column_config)
+
+        if total_pages > 1:
+            with c_info if c_info is not None else st.container():
+                st.caption(f"Filas {start + 1}–{start + len(page_df)} de {total_rows} · Página {page} de {total_pages}")
+
     @staticmethod
     def _detect_x_axis(data: Dict[str, Any]) -> Optional[str]:
         """Helper to find the likely x-axis key."""
@@ -865,7 +1011,7 @@ class Visualizer:
         return [k for k in data.keys() if k not in [x_key, 'headcount', 'ceses', 'renuncias', 'involuntarios', 'anio', 'year', 'periodo']]
 
     @staticmethod
-    def _create_line_chart(data: Dict[str, Any], metadata: Dict[str, Any]) -> go.Figure:
+    def _create_line_chart(data: Dict[str, Any], metadata: Dict[str, Any], colors: Optional[List[str]] = None) -> go.Figure:
         """
         Generates a Plotly Line Chart from normalized data.
         
@@ -877,6 +1023,7 @@ class Visualizer:
         Args:
             data: Standardized data dictionary.
             metadata: Chart configuration (titles, labels).
+            colors: Color sequence (defaults to the session palette).
             
         Returns:
             go.Figure: The configured Plotly figure.
@@ -900,7 +1047,7 @@ class Visualizer:
                  group_col = candidates[0] # Take first candidate like 'anio'
 
         # Paleta de colores RIMAC y complementarios
-        COLORS = ChartColors.get_colors()
+        COLORS = colors or ChartColors.get_colors()
         
         if group_col:
             # --- Grouped Line Chart ---
@@ -969,13 +1116,14 @@ class Visualizer:
         return fig
 
     @staticmethod
-    def _create_bar_chart(data: Dict[str, Any], metadata: Dict[str, Any]) -> go.Figure:
+    def _create_bar_chart(data: Dict[str, Any], metadata: Dict[str, Any], colors: Optional[List[str]] = None) -> go.Figure:
         """
         Generates a Plotly Bar Chart (Grouped or Stacked).
         
         Args:
             data: Standardized data dictionary.
             metadata: Chart configuration.
+            colors: Color sequence (defaults to the session palette).
             
         Returns:
             go.Figure: The configured Plotly figure.
@@ -993,7 +1141,7 @@ class Visualizer:
             candidates = [k for k in data.keys() if k != x_key and k not in keys]
             if candidates: group_col = candidates[0]
 
-        COLORS = ChartColors.get_colors()
+        COLORS = colors or ChartColors.get_colors()
         
         if group_col:
             # --- Grouped Bar Chart ---
@@ -1061,6 +1209,7 @@ class Visualizer:
         """
         figures = []
         for block in content:
+            if isinstance(block, VisualBlock): block = block.dict()
             if block.get("type") == "data_series":
                 payload = block.get("payload", {})
                 metadata = block.get("metadata", {})
@@ -1132,7 +1281,8 @@ class Visualizer:
         return normalized
 
     @staticmethod
-    def _render_interactive_series(data: Dict[str, Any], metadata: Dict[str, Any], key_prefix: str = ""):
+    def _render_interactive_series(data: Dict[str, Any], metadata: Dict[str, Any], key_prefix: str = "",
+                                   fingerprint: Optional[str] = None):
         """
         Renders a multi-tab view (Line, Bar, Table) for a dataset.
         Includes automatic X-axis detection and dynamic filtering.
@@ -1143,9 +1293,12 @@ class Visualizer:
         # --- X-Axis Detection ---
         x_key = Visualizer._detect_x_axis(data)
         
+        cache = get_render_cache()
+
         # Fallback: Try Wide Format Normalization
         if not x_key:
-            normalized = Visualizer._normalize_wide_data(data)
+            source = data
+            normalized = cache.memo("wide_data", source, lambda: Visualizer._normalize_wide_data(source))
             if normalized:
                 data = normalized
                 x_key = "Periodo" # We created this key
@@ -1172,8 +1325,7 @@ class Visualizer:
             elif len(current_list) > target_len:
                 data[k] = current_list[:target_len]
         
-        import hashlib
-        data_hash = hashlib.md5(str(data).encode()).hexdigest()[:8]
+        data_hash = fingerprint or Visualizer._payload_hash(data)
         
         selected_items = st.multiselect(
             f"📅 Filtrar {x_key.capitalize()}:",
@@ -1194,40 +1346,49 @@ class Visualizer:
              st.warning("⚠️ Selecciona al menos un elemento para visualizar.")
              return
 
-        tab1, tab2, tab3 = st.tabs(["📈 Gráfico de Línea", "📊 Gráfico de Barras", "📋 Tabla Detallada"])
-        
-        with tab1:
-            fig = Visualizer._create_line_chart(filtered_data, metadata)
-            st.plotly_chart(fig, width='stretch', key=f"line_{data_hash}_{key_prefix}")
-        
-        with tab2:
-            fig = Visualizer._create_bar_chart(filtered_data, metadata)
-            st.plotly_chart(fig, width='stretch', key=f"bar_{data_hash}_{key_prefix}")
-        
-        with tab3:
-            # Construcción dinámica del DataFrame para la tabla
-            table_dict = {x_key.capitalize(): filtered_data[x_key]}
-            for k in all_keys:
-                # Formatear el nombre de la columna
-                col_name = k.replace('_', ' ').title()
-                if any(x in k.lower() for x in ['rotacion', 'tasa', 'porcentaje']):
-                    col_name += ' (%)'
-                table_dict[col_name] = filtered_data[k]
-                
-            df_table = pd.DataFrame(table_dict)
-            
-            csv = df_table.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="📥 Descargar CSV",
-                data=csv,
-                file_name=f"reporte_{x_key}_{metadata.get('year', '')}.csv",
-                mime="text/csv",
+        view_key = (key_prefix, data_hash, tuple(selected_items))
+        colors = ChartColors.get_colors()
+        fig_key = view_key + (tuple(colors),)
+
+        def render_line():
+            fig = cache.get_or_build(("series_fig", "LINE") + fig_key,
+                                     lambda: Visualizer._create_line_chart(filtered_data, metadata, colors))
+            _plotly_chart(fig, width='stretch', key=f"line_{data_hash}_{key_prefix}")
+        
+        def render_bar():
+            fig = cache.get_or_build(("series_fig", "BAR") + fig_key,
+                                     lambda: Visualizer._create_bar_chart(filtered_data, metadata, colors))
+            _plotly_chart(fig, width='stretch', key=f"bar_{data_hash}_{key_prefix}")
+        
+        def render_table():
+            def build_table():
+                # Construcción dinámica del DataFrame para la tabla
+                table_dict = {x_key.capitalize(): filtered_data[x_key]}
+                for k in all_keys:
+                    # Formatear el nombre de la columna
+                    col_name = k.replace('_', ' ').title()
+                    if any(x in k.lower() for x in ['rotacion', 'tasa', 'porcentaje']):
+                        col_name += ' (%)'
+                    table_dict[col_name] = filtered_data[k]
+                return pd.DataFrame(table_dict)
+
+            df_table = cache.get_or_build(("series_table",) + view_key, build_table)
+            Visualizer._render_export(
+                lambda: df_table,
+                cache_key=("series",) + view_key,
+                file_stem=f"reporte_{x_key}_{metadata.get('year', '')}",
                 key=f"dl_series_{data_hash}_{key_prefix}"
             )
             
             st.dataframe(df_table, width='stretch', hide_index=True)
             st.caption(f"Mostrando {len(df_table)} elementos seleccionados.")
 
+        Visualizer._render_views({
+            "📈 Gráfico de Línea": render_line,
+            "📊 Gráfico de Barras": render_bar,
+            "📋 Tabla Detallada": render_table,
+        }, key=f"view_{data_hash}_{key_prefix}")
+
     @staticmethod
     def _render_kpis(kpis: list):
         if not kpis:
@@ -1263,7 +1424,8 @@ class Visualizer:
                 )
 
     @staticmethod
-    def _render_plot_block(payload: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None, key_prefix: str = ""):
+    def _render_plot_block(payload: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None, key_prefix: str = "",
+                           fingerprint: Optional[str] = None):
         """
         Legacy/Simplified renderer for direct plot payloads.
         Supports automatic chart switching (Bar/Line/Pie/Area).
@@ -1284,9 +1446,8 @@ class Visualizer:
 
         # Prepare DataFrame for easier manipulation
         try:
-            # Deterministic hash for keys
-            import hashlib
-            data_hash = hashlib.md5(str(data).encode()).hexdigest()[:8]
+            # Deterministic hash for keys (computed at ingest for validated blocks)
+            data_hash = fingerprint or Visualizer._payload_hash(data)
             
             df = None
             if "x" in data and "y" in data:
@@ -1389,7 +1550,7 @@ class Visualizer:
                                       f"{y_label}: %{{y}}<br><extra></extra>"
                     )
 
-                st.plotly_chart(fig, width='stretch', key=f"plot_{data_hash}_{key_prefix}")
+                _plotly_chart(fig, width='stretch', key=f"plot_{data_hash}_{key_prefix}")
 
         except Exception as e:
             st.error(f"Error renderizando gráfico mejorado: {e}")
@@ -1432,13 +1593,14 @@ class Visualizer:
         return rounded  # "462" (count without symbol)
     
     @staticmethod
-    def _render_table(data: list, key_prefix: str = ""):
+    def _render_table(data: list, key_prefix: str = "", fingerprint: Optional[str] = None):
         if data:
-            df = pd.DataFrame(data)
+            cache = get_render_cache()
+            # DataFrame construido una vez por payload (no en cada rerun); nunca se muta
+            df = cache.memo("legacy_table_frame", data, lambda: pd.DataFrame(data))
             # FIX: Usar un hash determinista del contenido para mantener el estado de los filtros entre reruns.
             # COMBINED FIX: Añadir key_prefix para unicidad global (fix StreamlitDuplicateElementKey)
-            import hashlib
-            data_hash = hashlib.md5(str(data).encode()).hexdigest()[:8]
+            data_hash = fingerprint or Visualizer._payload_hash(data)
             unique_suffix = f"{data_hash}_{key_prefix}"
             
             # --- 1. Controles de Interacción (Client-Side) ---
@@ -1448,13 +1610,11 @@ class Visualizer:
                 search = st.text_input("🔍 Filtrar resultados en tabla:", placeholder="Escribe para buscar (ej. 'Jefe', 'Finanzas')...", key=f"search_{unique_suffix}")
             
             with col2:
-                # Botón de Descarga
-                csv = df.to_csv(index=False).encode('utf-8')
-                st.download_button(
-                    label="📥 Descargar CSV",
-                    data=csv,
-                    file_name="reporte_adk.csv",
-                    mime="text/csv",
+                # Botón de Descarga (tabla completa, generada solo al hacer click)
+                Visualizer._render_export(
+                    lambda: df,
+                    cache_key=("table", unique_suffix),
+                    file_stem="reporte_adk",
                     key=f"dl_table_{unique_suffix}"
                 )
 
@@ -1466,49 +1626,99 @@ class Visualizer:
                 # Detectar columnas categóricas para filtrar
                 # Prioridad: columnas de texto con menos de 50 valores únicos
                 # AJUSTE: Incluir números con baja cardinalidad (ej. mapeo_talento 1-9)
-                potential_filters = [
-                    col for col in df.columns 
-                    if (df[col].dtype == 'object' or pd.api.types.is_numeric_dtype(df[col])) 
-                    and df[col].nunique() < 50
-                ]
+                # Cardinalidad, opciones ordenadas y bitmaps por valor: una vez por tabla
+                facet_index = cache.get_or_build(
+                    ("facet_index", unique_suffix),
+                    lambda: build_facet_index(df, include_numeric=True)
+                )
                 
                 # Crear widgets de filtro
-                for idx, col in enumerate(potential_filters):
+                for idx, (col, facet) in enumerate(facet_index.facets.items()):
                     with cols_filter[idx % 3]:
-                        options = sorted(df[col].dropna().unique().tolist())
                         filters[col] = st.multiselect(
                             f"{col.replace('_', ' ').title()}", 
-                            options, 
+                            facet.values, 
                             key=f"filter_{col}_{unique_suffix}"
                         )
 
-            # --- 3. Lógica de Filtrado Combinada ---
-            df_display = df.copy()
-
-            # A. Aplicar Filtros de Columna
-            for col, selected_values in filters.items():
-                if selected_values:
-                    df_display = df_display[df_display[col].isin(selected_values)]
+            # --- 3. Lógica de Filtrado Combinada (máscara sobre df, sin copias intermedias) ---
+            # A. Aplicar Filtros de Columna (intersección de bitmaps)
+            mask = facet_index.mask(filters)
 
-            # B. Aplicar Buscador Genérico
+            # B. Aplicar Buscador Genérico (índice vectorizado, construido una vez por tabla)
             if search:
-                mask = df_display.apply(lambda x: x.astype(str).str.contains(search, case=False).any(), axis=1)
-                df_display = df_display[mask]
+                search_index = cache.get_or_build(
+                    ("search_index", unique_suffix),
+                    lambda: build_search_index(df)
+                )
+                term_mask = search_mask(search_index, search)
+                mask = term_mask if mask is None else mask & term_mask
 
             # --- 3. Renderizado con Configuración ---
             # Detectar columnas de fecha para formatearlas bonito
             column_config = {}
-            for col in df_display.columns:
+            for col in df.columns:
                 if "fecha" in col.lower() or "date" in col.lower():
                     column_config[col] = st.column_config.DateColumn(col, format="DD/MM/YYYY")
 
-            st.dataframe(
-                df_display, 
-                width='stretch', 
-                hide_index=True,
-                column_config=column_config
+            Visualizer._render_paginated_dataframe(
+                df,
+                key=f"table_{unique_suffix}",
+                column_config=column_config,
+                rows=None if mask is None else np.flatnonzero(mask)
             )
 
+    @staticmethod
+    def _create_talent_matrix_chart(grid: List[List[int]], primary_color: str) -> go.Figure:
+        """
+        Builds the 9-Box heatmap (Performance vs Potential) from a 3x3 grid of counts.
+
+        Args:
+            grid: Counts indexed [potential][performance], 0=Bajo .. 2=Alto (bottom-up).
+            primary_color: Color for the highest count.
+        """
+        # Grid definition
+        labels_perf = ["Bajo", "Medio", "Alto"]
+        labels_pot = ["Bajo", "Medio", "Alto"] # Note: Indices 0=Bajo, 1=Medio, 2=Alto
+
+        # Annotations (counts)
+        annotations = []
+        for y_idx, row in enumerate(grid):
+            for x_idx, val in enumerate(row):
+                annotations.append(dict(
+                    x=labels_perf[x_idx],
+                    y=labels_pot[y_idx],
+                    text=f"<b>{val}</b>",
+                    showarrow=False,
+                    font=dict(color="white" if val > 0 else "black", size=24)
+                ))
+
+        # Heatmap
+        fig = go.Figure(data=go.Heatmap(
+            z=grid,
+            x=labels_perf,
+            y=labels_pot,
+            colorscale=[
+                [0, "#F8F9FA"],          # Empty
+                [1.0, primary_color] # Primary Color (Dynamic)
+            ],
+            showscale=False,
+            hovertemplate="Desempeño: %{x}<br>Potencial: %{y}<br>Colaboradores: %{z}<extra></extra>"
+        ))
+        
+        fig.update_layout(
+            annotations=annotations,
+            xaxis_title="Desempeño (Performance)",
+            yaxis_title="Potencial (Potential)",
+            height=500,
+            width=500,
+            margin=dict(l=40, r=20, t=40, b=40),
+            xaxis=dict(tickfont=dict(size=14)),
+            yaxis=dict(tickfont=dict(size=14), scaleanchor="x", scaleratio=1),
+            template="plotly_white"
+        )
+        return fig
+
     @staticmethod
     def _render_talent_matrix(payload: dict, key_prefix: str = ""):
         """
@@ -1523,10 +1733,6 @@ class Visualizer:
         title = payload.get("title", "Matriz de Talento (9-Box)")
         st.subheader(f"📊 {title}")
         
-        # Grid definition
-        labels_perf = ["Bajo", "Medio", "Alto"]
-        labels_pot = ["Bajo", "Medio", "Alto"] # Note: Indices 0=Bajo, 1=Medio, 2=Alto
-        
         # Initialize 3x3 grid (y=potential, x=performance)
         # We want y-axis (Potential) to go from 1 (Bottom) to 3 (Top)
         grid = [[0 for _ in range(3)] for _ in range(3)]
@@ -1560,44 +1766,13 @@ class Visualizer:
             # If the backend sends pot3 as first row, we must reverse for Plotly if we use y=[Bajo, Medio, Alto]
             grid = raw_matrix[::-1] if len(raw_matrix) == 3 else raw_matrix
 
-        # Annotations (counts)
-        annotations = []
-        for y_idx, row in enumerate(grid):
-            for x_idx, val in enumerate(row):
-                annotations.append(dict(
-                    x=labels_perf[x_idx],
-                    y=labels_pot[y_idx],
-                    text=f"<b>{val}</b>",
-                    showarrow=False,
-                    font=dict(color="white" if val > 0 else "black", size=24)
-                ))
-
-        # Heatmap
-        fig = go.Figure(data=go.Heatmap(
-            z=grid,
-            x=labels_perf,
-            y=labels_pot,
-            colorscale=[
-                [0, "#F8F9FA"],          # Empty
-                [1.0, ChartColors.get_colors()[0]] # Primary Color (Dynamic)
-            ],
-            showscale=False,
-            hovertemplate="Desempeño: %{x}<br>Potencial: %{y}<br>Colaboradores: %{z}<extra></extra>"
-        ))
-        
-        fig.update_layout(
-            annotations=annotations,
-            xaxis_title="Desempeño (Performance)",
-            yaxis_title="Potencial (Potential)",
-            height=500,
-            width=500,
-            margin=dict(l=40, r=20, t=40, b=40),
-            xaxis=dict(tickfont=dict(size=14)),
-            yaxis=dict(tickfont=dict(size=14), scaleanchor="x", scaleratio=1),
-            template="plotly_white"
+        # Heatmap (pure data -> figure, cached by grid + palette)
+        primary_color = ChartColors.get_colors()[0]
+        fig = get_render_cache().get_or_build(
+            ("talent_matrix_fig", key_prefix, tuple(map(tuple, grid)), primary_color),
+            lambda: Visualizer._create_talent_matrix_chart(grid, primary_color)
         )
-        
-        st.plotly_chart(fig, width="stretch", key=f"9box_{key_prefix}")
+        _plotly_chart(fig, width="stretch", key=f"9box_{key_prefix}")
         
         with st.expander("📚 ¿Cómo leer el Mapeo de Talento?"):
             st.markdown("""
@@ -1606,3 +1781,20 @@ class Visualizer:
             - **Caja 7/8:** "Talento Emergente". Alto potencial con desempeño sólido.
             - **Caja 1 (Bajo/Bajo):** "Bajo desempeño". Requiere plan de acción o revisión de rol.
             """)
+
+
+# Profiler: cada renderer y constructor de figuras (no-op si PROFILER_ENABLED está apagado)
+instrument_methods(Visualizer, ("render", "_render_", "_create_"))
+
+# Bloques con widgets propios (filtros, orden, búsqueda, vistas, paginación)
+_INTERACTIVE_BLOCKS = frozenset({"CHART", "TABLE", "plot", "table", "data_series"})
+
+
+@st.fragment
+def _render_block_fragment(block: VisualBlock, block_key: str):
+    """
+    Un bloque como fragmento aislado: interactuar con sus widgets re-ejecuta solo este
+    bloque, no el CSS, el sidebar ni el resto del historial. El bloque validado queda
+    guardado en el fragmento hasta el próximo rerun completo.
+    """
+    Visualizer._render_block_guarded(block, block_key)
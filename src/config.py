@@ -25,3 +25,111 @@ else:
 
 # Constante global para controlar visibilidad de debug (Inversa a IS_PROD)
 SHOW_DEBUG_UI = not IS_PROD
+
+# --- Transporte HTTP (Pool compartido con Keep-Alive) ---
+# Límites del pool por host y timeouts (segundos). El read timeout es amplio porque
+# una corrida del agente (LLM + BigQuery) puede tardar varios minutos.
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # Hosts distintos cacheados
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))          # Conexiones vivas por host
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "300"))
+# Reintentos con backoff exponencial (solo llamadas idempotentes)
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+
+# --- Decodificación incremental de /chat ---
+# El cuerpo JSON se decodifica a medida que llega: cada bloque de `content` se valida y pasa a
+# su representación tipada/columnar apenas se completa, sin armar el texto ni el dict completos.
+STREAMED_JSON_DECODE = os.getenv("STREAMED_JSON_DECODE", "true").lower() in ("1", "true", "yes")
+STREAMED_JSON_CHUNK_KB = int(os.getenv("STREAMED_JSON_CHUNK_KB", "64"))
+# Negociación del formato: MessagePack y tablas en Arrow IPC si las librerías están instaladas;
+# JSON (y tablas como filas) sigue siendo el respaldo. La compresión (gzip, br) la negocian
+# requests/httpx por su cuenta, como antes.
+BINARY_PAYLOADS = os.getenv("BINARY_PAYLOADS", "true").lower() in ("1", "true", "yes")
+
+# --- Streaming de respuestas (SSE) ---
+# Si está activo, el chat consume /chat/stream y dibuja cada bloque apenas llega.
+CHAT_STREAMING = os.getenv("CHAT_STREAMING", "false").lower() in ("1", "true", "yes")
+
+# --- Cache de Renderizado (historial de chat) ---
+# Figuras Plotly y datos preparados por bloque, por sesión, con LRU y tope de memoria.
+RENDER_CACHE_ENABLED = os.getenv("RENDER_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RENDER_CACHE_MAX_ENTRIES = int(os.getenv("RENDER_CACHE_MAX_ENTRIES", "512"))
+RENDER_CACHE_MAX_MB = float(os.getenv("RENDER_CACHE_MAX_MB", "64"))
+
+# --- Vistas de gráficos perezosas ---
+# Solo se construye la vista seleccionada (Línea por defecto) en lugar de todas las pestañas.
+LAZY_CHART_VIEWS = os.getenv("LAZY_CHART_VIEWS", "true").lower() in ("1", "true", "yes")
+
+# --- Reruns por fragmento ---
+# Cada bloque interactivo (gráficos, tablas, series) es un st.fragment: cambiar sus filtros,
+# orden o búsqueda re-ejecuta solo ese bloque en lugar de toda la app.
+FRAGMENT_RERUNS = os.getenv("FRAGMENT_RERUNS", "true").lower() in ("1", "true", "yes")
+
+# --- Profiler de render (frontend) ---
+# Mide CSS, sidebar, renderers del Visualizer, validación, construcción de figuras y
+# st.plotly_chart (p50/p95 en el panel Debugger, exportable a JSON). Apagado no agrega costo.
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILER_MAX_SAMPLES = int(os.getenv("PROFILER_MAX_SAMPLES", "1000"))  # Últimas N muestras por sección
+
+# --- Latencia por turno de chat ---
+# Tramos red / agente / frontend de cada turno (conexión, TTFB, descarga, decode, validación,
+# render) en un ring buffer por sesión; el Debugger muestra p50/p95.
+LATENCY_RING_SIZE = int(os.getenv("LATENCY_RING_SIZE", "50"))
+
+# --- Tablas sobre Arrow ---
+# Los TABLE se construyen columna a columna en Arrow y se exponen como vistas pandas sin copia
+# (dtypes [pyarrow]); filtros y búsqueda combinan máscaras y solo se materializa la página visible.
+ARROW_TABLES = os.getenv("ARROW_TABLES", "true").lower() in ("1", "true", "yes")
+
+# --- Paginación de tablas ---
+# Solo la página visible se formatea y se envía al navegador. El tamaño por defecto siempre
+# figura entre las opciones del selector (se agrega si falta).
+TABLE_DEFAULT_PAGE_SIZE = max(1, int(os.getenv("TABLE_DEFAULT_PAGE_SIZE", "100")))
+TABLE_PAGE_SIZES = sorted(
+    {int(x) for x in os.getenv("TABLE_PAGE_SIZES", "25,50,100,250,500").split(",") if x.strip() and int(x) > 0}
+    | {TABLE_DEFAULT_PAGE_SIZE}
+)
+
+# --- Exportaciones (CSV / Parquet / Excel) ---
+# Se generan solo al hacer click y se memorizan por (payload, filtros activos, formato).
+EXPORT_CACHE_MAX_ENTRIES = int(os.getenv("EXPORT_CACHE_MAX_ENTRIES", "16"))
+EXPORT_CACHE_MAX_MB = float(os.getenv("EXPORT_CACHE_MAX_MB", "128"))
+EXPORT_CSV_CHUNK_ROWS = int(os.getenv("EXPORT_CSV_CHUNK_ROWS", "20000"))
+
+# --- Cliente Asíncrono (httpx) ---
+# Prompts predefinidos (tarjetas y sugerencias) se envían por el cliente async, que fusiona
+# peticiones idénticas en vuelo (prompt, rol) en una sola llamada al backend.
+ASYNC_TRANSPORT = os.getenv("ASYNC_TRANSPORT", "true").lower() in ("1", "true", "yes")
+# Pre-carga concurrente de las respuestas a los prompts predefinidos al abrir el dashboard.
+PREFETCH_CANNED_PROMPTS = os.getenv("PREFETCH_CANNED_PROMPTS", "false").lower() in ("1", "true", "yes")
+
+# --- Cache de respuestas (prompts predefinidos) ---
+# Compartido por todo el proceso. Clave: (prompt normalizado, rol, periodo de datos): la
+# respuesta que obtuvo un usuario se sirve a TODOS los de su rol. Si el backend filtra datos
+# por usuario (token), activar RESPONSE_CACHE_PER_USER para que la clave use el usuario.
+# DATA_PERIOD identifica la carga de datos vigente; vacío = el mes en curso, calculado al
+# armar cada clave (al cambiar de mes las respuestas anteriores dejan de usarse sin reiniciar).
+# RESPONSE_CACHE_DIR vacío = solo memoria.
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_TTL_S = float(os.getenv("RESPONSE_CACHE_TTL_S", str(6 * 3600)))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+RESPONSE_CACHE_MAX_MB = float(os.getenv("RESPONSE_CACHE_MAX_MB", "64"))
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR", "")
+RESPONSE_CACHE_PER_USER = os.getenv("RESPONSE_CACHE_PER_USER", "false").lower() in ("1", "true", "yes")
+DATA_PERIOD = os.getenv("DATA_PERIOD", "")
+
+# --- Historial de chat con presupuesto de memoria ---
+# Los últimos HISTORY_HOT_TURNS mensajes quedan siempre en memoria; cuando el historial de la
+# sesión supera HISTORY_MEMORY_BUDGET_MB, los paquetes visuales más antiguos se comprimen a
+# disco (SQLite en HISTORY_SPILL_DIR, por defecto el directorio temporal) y se recargan al verlos.
+HISTORY_MEMORY_BUDGET_MB = float(os.getenv("HISTORY_MEMORY_BUDGET_MB", "32"))
+HISTORY_HOT_TURNS = int(os.getenv("HISTORY_HOT_TURNS", "6"))
+HISTORY_SPILL_DIR = os.getenv("HISTORY_SPILL_DIR", "")
+HISTORY_REHYDRATED_TURNS = int(os.getenv("HISTORY_REHYDRATED_TURNS", "4"))
+
+# --- Historial compacto ---
+# Solo las últimas HISTORY_LIVE_TURNS respuestas visuales se dibujan completas; las anteriores
+# se muestran como tarjetas (resumen + títulos) que se expanden bajo demanda.
+HISTORY_COMPACT = os.getenv("HISTORY_COMPACT", "true").lower() in ("1", "true", "yes")
+HISTORY_LIVE_TURNS = int(os.getenv("HISTORY_LIVE_TURNS", "2"))
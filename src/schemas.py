@@ -1,5 +1,9 @@
-from typing import List, Optional, Union, Any, Dict
-from pydantic import BaseModel, Field, validator
+from abc import abstractmethod
+from typing import List, Optional, Union, Any, Dict, Literal, Annotated
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, validator, Discriminator, Tag, TypeAdapter, ValidationError
+from src.utils.columnar import ColumnarChart, table_frame, table_rows
+from src.utils.fingerprint import content_fingerprint
+from src.utils.profiler import profile_span
 
 # --- Legacy KPI Card Contract (v2025) ---
 class KPICard(BaseModel):
@@ -39,8 +43,14 @@ class ChartPayload(BaseModel):
     tooltip_datasets: Optional[List[Dataset]] = None
 
 class TablePayload(BaseModel):
+    model_config = ConfigDict(ser_json_bytes="base64")
+
     headers: List[str]
-    rows: List[Union[List[Any], Dict[str, Any]]]
+    rows: List[Union[List[Any], Dict[str, Any]]] = []
+    # Compact forms negotiated via X-Payload-Encodings (see src/services/wire_format.py):
+    # whole columns instead of row dicts, or an Arrow IPC stream (bytes in MessagePack, base64 in JSON)
+    columns: Optional[List[List[Any]]] = None
+    arrow: Optional[Union[bytes, str]] = None
 
 # --- Block Types ---
 class TextBlockPayload(BaseModel):
@@ -76,6 +86,22 @@ class VisualBlock(BaseModel):
     variant: Optional[str] = "standard"
     severity: Optional[str] = "info" # For TEXT blocks
 
+    _fingerprint: Optional[str] = PrivateAttr(default=None)
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Stable content key of the payload (widget keys, render-cache and export-cache keys).
+        Computed once at ingest and kept with the block (also across history spill/rehydrate).
+        """
+        if self._fingerprint is None:
+            self._fingerprint = content_fingerprint(self.payload)
+        return self._fingerprint
+
+    def dump_json(self) -> Dict[str, Any]:
+        """JSON-ready dict of the block (debugging / raw JSON views)."""
+        return self.model_dump(mode="json")
+
     @validator('type')
     def known_type(cls, v):
         # V2 Types: KPI_ROW, CHART, TABLE
@@ -88,8 +114,150 @@ class VisualBlock(BaseModel):
             return v 
         return v
 
+# --- Typed Blocks (Discriminated by `type`) ---
+# Each known V2 type validates ONLY against its own payload model instead of walking
+# the wide VisualBlock.payload Union. The raw dict fallback keeps the old leniency
+# for payloads that do not match the contract (renderers already handle dicts).
+class _ColumnarBlock(VisualBlock):
+    """
+    Block with an array-backed form of its payload (see src/utils/columnar.py), built once
+    at ingest and shared by every renderer/exporter. None if the payload cannot be converted.
+
+    Once built, the columnar form REPLACES the row/list data of the payload (only the light
+    fields stay, e.g. headers and labels): the block never holds the data twice. The
+    fingerprint is computed from the full payload before it is released.
+    """
+    _columnar: Any = PrivateAttr(default=None)
+    _columnar_built: bool = PrivateAttr(default=False)
+
+    @abstractmethod
+    def _build_columnar(self) -> Any:
+        """Array-backed form of `self.payload`."""
+
+    @abstractmethod
+    def _release_payload_data(self) -> None:
+        """Drops the row/list data of `self.payload` (now held by the columnar form)."""
+
+    @abstractmethod
+    def _payload_from_columnar(self) -> Dict[str, Any]:
+        """Contract payload rebuilt from the columnar form (debugging / raw JSON views)."""
+
+    @property
+    def columnar(self) -> Any:
+        if not self._columnar_built:
+            self.fingerprint
+            try:
+                with profile_span("schemas.build_columnar"):
+                    self._columnar = self._build_columnar()
+            except Exception:
+                # The renderer rebuilds it and surfaces the error inside its boundary
+                self._columnar = None
+            if self._columnar is not None:
+                self._release_payload_data()
+            self._columnar_built = True
+        return self._columnar
+
+    def dump_json(self) -> Dict[str, Any]:
+        """JSON-ready dict with the full payload (rebuilt if it was released)."""
+        dump = self.model_dump(mode="json")
+        if self.columnar is not None:
+            dump["payload"] = {**dump["payload"], **self._payload_from_columnar()}
+        return dump
+
+class ChartBlock(_ColumnarBlock):
+    type: Literal["CHART"]
+    payload: Annotated[Union[ChartPayload, Dict[str, Any]], Field(union_mode="left_to_right")]
+
+    def _build_columnar(self) -> ColumnarChart:
+        return ColumnarChart.from_payload(self.payload)
+
+    def _release_payload_data(self) -> None:
+        if isinstance(self.payload, ChartPayload):
+            self.payload.datasets = []
+            self.payload.tooltip_datasets = None
+        else:
+            self.payload = {**self.payload, "datasets": [], "tooltip_datasets": None}
+
+    def _payload_from_columnar(self) -> Dict[str, Any]:
+        return self.columnar.to_payload()
+
+class TableBlock(_ColumnarBlock):
+    type: Literal["TABLE"]
+    payload: Annotated[Union[TablePayload, Dict[str, Any]], Field(union_mode="left_to_right")]
+
+    def _build_columnar(self):
+        return table_frame(self.payload)
+
+    def _release_payload_data(self) -> None:
+        if isinstance(self.payload, TablePayload):
+            self.payload.rows = []
+            self.payload.columns = None
+            self.payload.arrow = None
+        else:
+            self.payload = {**self.payload, "rows": [], "columns": None, "arrow": None}
+
+    def _payload_from_columnar(self) -> Dict[str, Any]:
+        return {"rows": table_rows(self.columnar), "columns": None, "arrow": None}
+
+class KpiRowBlock(VisualBlock):
+    type: Literal["KPI_ROW"]
+    payload: Annotated[Union[List[IndicatorInternal], List[Any]], Field(union_mode="left_to_right")]
+
+class LegacyKpiRowBlock(VisualBlock):
+    type: Literal["kpi_row"]
+    payload: Annotated[Union[List[KPICard], List[Any]], Field(union_mode="left_to_right")]
+
+_TYPED_BLOCKS = {"CHART", "TABLE", "KPI_ROW", "kpi_row"}
+
+def _block_tag(value: Any) -> str:
+    """Discriminator: the block `type` for typed blocks, 'generic' for everything else."""
+    b_type = value.get("type") if isinstance(value, dict) else getattr(value, "type", None)
+    return b_type if b_type in _TYPED_BLOCKS else "generic"
+
+AnyVisualBlock = Annotated[
+    Union[
+        Annotated[ChartBlock, Tag("CHART")],
+        Annotated[TableBlock, Tag("TABLE")],
+        Annotated[KpiRowBlock, Tag("KPI_ROW")],
+        Annotated[LegacyKpiRowBlock, Tag("kpi_row")],
+        Annotated[VisualBlock, Tag("generic")],
+    ],
+    Discriminator(_block_tag),
+]
+
+_BLOCK_ADAPTER = TypeAdapter(AnyVisualBlock)
+
+def parse_visual_block(raw_block: Union[Dict[str, Any], VisualBlock]) -> VisualBlock:
+    """
+    Validates a single raw block into its typed model (no-op for already validated blocks).
+    CHART/TABLE blocks also get their columnar payload built here, once; every block gets
+    its content fingerprint.
+    """
+    if isinstance(raw_block, VisualBlock):
+        return raw_block
+    with profile_span("schemas.validate_block"):
+        block = _BLOCK_ADAPTER.validate_python(raw_block)
+    block.fingerprint
+    if isinstance(block, _ColumnarBlock):
+        block.columnar
+    return block
+
+def parse_visual_block_or_raw(raw_block: Any) -> Any:
+    """
+    parse_visual_block, but invalid blocks are kept raw so the Visualizer can still surface
+    the contract violation (dev mode) without dropping the rest of the package.
+    """
+    try:
+        return parse_visual_block(raw_block)
+    except ValidationError:
+        return raw_block
+
+def parse_visual_blocks(raw_blocks: List[Any]) -> List[Any]:
+    """Validates a whole visual package content once, at ingest (see parse_visual_block_or_raw)."""
+    return [parse_visual_block_or_raw(raw_block) for raw_block in raw_blocks or []]
+
 # --- Main Package ---
 class VisualDataPackage(BaseModel):
     response_type: str = "visual_package"
     summary: Optional[str] = None
-    content: List[VisualBlock]
+    content: List[AnyVisualBlock]
@@ -1,11 +1,124 @@
 # adk-frontend/src/services/api_client.py
 
+import codecs
+import json
+import re
+import time
+import httpx
 import requests
 import streamlit as st
-from src.config import BACKEND_URL
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from src.config import (
+    BACKEND_URL, ASYNC_TRANSPORT, RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_PER_USER, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT,
+    STREAMED_JSON_DECODE, STREAMED_JSON_CHUNK_KB,
+)
 from src.security.models import UserProfile
+from src.services.http_session import HttpTransport, get_http_transport
+from src.services.async_client import AsyncApiClient, get_async_client
+from src.services.package_decoder import StreamingPackageDecoder
+from src.services.wire_format import decode_msgpack, is_msgpack, negotiation_headers
+from src.services.response_cache import get_response_cache, response_cache_key
+from src.services.turn_latency import TurnTrace, begin_turn
+from src.views.dashboard_content import CANNED_PROMPTS, get_canned_prompts
+
+_SSE_LINE_END = re.compile(r"\r\n|\r|\n")
+
+
+def iter_sse_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Líneas de un cuerpo text/event-stream a partir de sus chunks (UTF-8).
+
+    Fin de línea CRLF, LF o CR, como pide la especificación, aunque un CRLF quede partido
+    entre dos chunks (`iter_lines` de requests lo vería como dos fines de línea).
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    partial = []          # Trozos de la línea en curso (sin concatenar en cada chunk)
+    pending_cr = False    # CR al final del chunk anterior: puede ser la mitad de un CRLF
+
+    def split(text: str) -> Iterator[str]:
+        nonlocal partial, pending_cr
+        if pending_cr:
+            text = "\r" + text
+        pending_cr = text.endswith("\r")
+        if pending_cr:
+            text = text[:-1]
+        parts = _SSE_LINE_END.split(text)
+        partial.append(parts[0])
+        if len(parts) > 1:
+            yield "".join(partial)
+            yield from parts[1:-1]
+            partial = [parts[-1]]
+
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield from split(text)
+    yield from split(decoder.decode(b"", final=True))
+    rest = "".join(partial)
+    if pending_cr or rest:
+        yield rest
+
+
+def iter_sse_events(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Parser mínimo de Server-Sent Events (text/event-stream).
+
+    Agrupa las líneas `event:` / `data:` hasta la línea en blanco que cierra el evento.
+    Las líneas `data:` consecutivas se unen con salto de línea; los comentarios (`:`) se ignoran.
+
+    Yields:
+        (event_name, data_str). event_name es "message" si el backend no lo especifica.
+    """
+    for event_name, data, _ in _iter_sse_frames(lines):
+        yield event_name, data
+
+
+def _iter_sse_frames(lines: Iterable[str]) -> Iterator[Tuple[str, str, bool]]:
+    """Como `iter_sse_events`, indicando si el evento llegó cerrado (False: el stream terminó antes)."""
+    event_name = "message"
+    data_lines = []
+
+    for line in lines:
+        if line is None:
+            continue
+        line = line.rstrip("\r")
+
+        if not line:
+            if data_lines:
+                yield event_name, "\n".join(data_lines), True
+            event_name = "message"
+            data_lines = []
+            continue
+
+        if line.startswith(":"):
+            continue
+
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+
+        if field == "event":
+            event_name = value or "message"
+        elif field == "data":
+            data_lines.append(value)
+
+    # Flush final si el stream se cierra sin línea en blanco
+    if data_lines:
+        yield event_name, "\n".join(data_lines), False
 
 class ApiClient:
+    def __init__(self, transport: HttpTransport = None, async_client: AsyncApiClient = None):
+        # Pool Keep-Alive compartido por proceso (st.cache_resource): instanciar ApiClient es barato
+        self.transport = transport or get_http_transport()
+        self._async_client = async_client
+
+    @property
+    def async_client(self) -> AsyncApiClient:
+        # Se crea bajo demanda: solo los prompts predefinidos usan el cliente async
+        if self._async_client is None:
+            self._async_client = get_async_client()
+        return self._async_client
+
     def login(self, username, password):
         """
         Obtiene el token JWT del backend
@@ -45,7 +158,7 @@ class ApiClient:
         
         try:
             print(f"🔑 DEBUG LOGIN: Attempting login to {url} with user '{username}'")
-            response = requests.post(url, data=data)
+            response = self.transport.post(url, idempotent=True, data=data)
             print(f"🔑 DEBUG LOGIN: Status Code: {response.status_code}")
             
             if response.status_code != 200:
@@ -57,6 +170,9 @@ class ApiClient:
         except requests.exceptions.ConnectionError:
             print(f"❌ DEBUG LOGIN: Error de Conexión: No se encuentra el Backend en {BACKEND_URL}")
             return None
+        except requests.exceptions.Timeout:
+            print(f"❌ DEBUG LOGIN: Timeout esperando al Backend en {BACKEND_URL}")
+            return None
         except requests.exceptions.HTTPError as e:
             print(f"❌ DEBUG LOGIN: Error HTTP: {e}")
             return None
@@ -77,31 +193,78 @@ class ApiClient:
         
         # --- TELEMETRY: Capture Request Context (Context Copier) ---
         st.session_state.last_request_payload = payload
+        # Tramos de latencia del turno (el id viaja como X-Request-ID para cruzarlo con el backend)
+        trace = begin_turn(message)
         
+        canned = message in CANNED_PROMPTS
         headers = {
             "Authorization": f"Bearer {user.token}", 
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            "X-Request-ID": trace.turn_id,
+            # MessagePack/Arrow si están disponibles (los prompts predefinidos se cachean como JSON)
+            **negotiation_headers(binary=not canned),
         }
 
         # --- DEBUG: TOKEN VISIBILITY ---
         # print(f"🔑 DEBUG: Headers being sent to {url}:")
         # -------------------------------
 
+        if canned:
+            # Prompts predefinidos: cache compartido y cliente async con coalescing
+            cached = self._get_cached_response(message, user)
+            if cached is not None:
+                trace.source = "cache"
+                trace.attach_response(cached)
+                return cached
+            if ASYNC_TRANSPORT:
+                trace.source = "async"
+                with trace.span("wait"):
+                    res_json = self._send_canned_chat(message, user)
+                trace.attach_response(res_json)
+                return self._cache_response(message, user, res_json)
+
+        response = None
         try:
-            # Enviamos la petición POST
-            response = requests.post(url, json=payload, headers=headers)
+            # Enviamos la petición POST (stream=True: vuelve con los headers y el cuerpo se mide aparte)
+            self.transport.take_connect_ms()
+            sent_at = time.perf_counter()
+            response = self.transport.post(url, json=payload, headers=headers, stream=True)
+            headers_at = time.perf_counter()
             
             # Si el backend responde 401/403/500, lanzamos error aquí
             response.raise_for_status() 
             
-            # Retornamos la respuesta en JSON
-            res_json = response.json()
+            # Retornamos la respuesta (MessagePack si se negoció, si no JSON)
+            if is_msgpack(response.headers.get("Content-Type")):
+                response.content  # Descarga completa del cuerpo
+                self._record_transfer(trace, sent_at, headers_at)
+                with trace.span("decode"):
+                    res_json = decode_msgpack(response.content)
+            elif STREAMED_JSON_DECODE and not canned:
+                # Bloque a bloque mientras llega el cuerpo: `content` ya viene validado (modelos tipados).
+                # Los prompts predefinidos no: su respuesta cruda se guarda en el cache de respuestas.
+                decoder = StreamingPackageDecoder()
+                res_json = decoder.decode(response.iter_content(chunk_size=STREAMED_JSON_CHUNK_KB * 1024))
+                self._record_transfer(trace, sent_at, headers_at, download_ms=decoder.download_ms)
+                trace.record("decode", decoder.decode_ms)
+                trace.record("validate", decoder.validate_ms)
+            else:
+                response.content  # Descarga completa del cuerpo
+                self._record_transfer(trace, sent_at, headers_at)
+                with trace.span("decode"):
+                    res_json = response.json()
+            trace.attach_response(res_json, response)
             st.session_state.last_api_response = res_json
+            if canned:
+                self._cache_response(message, user, res_json)
             return res_json
             
         except requests.exceptions.ConnectionError:
             st.error("❌ Error de Conexión: No se encuentra el Backend.")
             return None
+        except requests.exceptions.Timeout:
+            st.error("⏱️ El Backend no respondió a tiempo. Intenta nuevamente.")
+            return None
         except requests.exceptions.HTTPError as e:
             st.error(f"❌ El Backend rechazó la conexión: {e}")
             try:
@@ -109,6 +272,264 @@ class ApiClient:
             except:
                 pass
             return None
+        except (json.JSONDecodeError, requests.exceptions.ChunkedEncodingError):
+            # Cuerpo cortado o inválido (ej. el backend cerró la conexión a mitad de la respuesta)
+            st.error("❌ La respuesta del Backend llegó incompleta o no es JSON válido.")
+            return None
+        finally:
+            # stream=True: si la decodificación falla a mitad del cuerpo, la conexión vuelve al pool igual
+            if response is not None:
+                response.close()
+
+    def _record_transfer(self, trace: TurnTrace, sent_at: float, headers_at: float,
+                         download_ms: Optional[float] = None) -> None:
+        """
+        Tramos de red del turno: conexión (pool), TTFB (sin la conexión) y descarga del cuerpo
+        (`download_ms` si la descarga se intercaló con la decodificación).
+        """
+        connect_ms = self.transport.take_connect_ms()
+        trace.record("connect", connect_ms)
+        trace.record("ttfb", max((headers_at - sent_at) * 1000 - connect_ms, 0.0))
+        if download_ms is None:
+            download_ms = (time.perf_counter() - headers_at) * 1000
+        trace.record("download", download_ms)
+
+    def _get_cached_response(self, message: str, user: UserProfile) -> Optional[Dict[str, Any]]:
+        """Respuesta cacheada de un prompt predefinido (o None). Marca `last_response_cached`."""
+        cached = get_response_cache().get(response_cache_key(message, user)) if RESPONSE_CACHE_ENABLED else None
+        st.session_state.last_response_cached = cached is not None
+        if cached is not None:
+            st.session_state.last_api_response = cached
+        return cached
+
+    def _cache_response(self, message: str, user: UserProfile, res_json: Optional[Dict[str, Any]]):
+        if RESPONSE_CACHE_ENABLED and isinstance(res_json, dict):
+            get_response_cache().put(response_cache_key(message, user), res_json)
+        return res_json
+
+    def _send_canned_chat(self, message: str, user: UserProfile):
+        """
+        Envía un prompt predefinido por el cliente async.
+
+        Si hay una pre-carga en curso o terminada para este prompt se reutiliza; si el mismo
+        usuario ya lo pidió (ej. doble click), la llamada en vuelo se comparte.
+        """
+        future = st.session_state.get("prefetch_futures", {}).pop(message, None)
+
+        try:
+            if future is None:
+                future = self.async_client.submit(self.async_client.chat(message, user))
+            res_json = future.result(timeout=HTTP_CONNECT_TIMEOUT + HTTP_READ_TIMEOUT)
+            st.session_state.last_api_response = res_json
+            return res_json
+
+        except httpx.ConnectError:
+            st.error("❌ Error de Conexión: No se encuentra el Backend.")
+            return None
+        except (httpx.TimeoutException, TimeoutError):
+            st.error("⏱️ El Backend no respondió a tiempo. Intenta nuevamente.")
+            return None
+        except httpx.HTTPStatusError as e:
+            st.error(f"❌ El Backend rechazó la conexión: {e}")
+            try:
+                st.write(e.response.json())
+            except:
+                pass
+            return None
+        except httpx.HTTPError as e:
+            st.error(f"❌ Error de comunicación con el Backend: {e}")
+            return None
+
+    def prefetch_canned_prompts(self, user: UserProfile):
+        """
+        Lanza en segundo plano (sin bloquear el render) todos los prompts predefinidos
+        visibles para el rol del usuario. Los futures quedan en `prefetch_futures`.
+        """
+        # Sesión neutral por rol (se comparte entre sus usuarios), salvo con cache por usuario
+        session_id = f"prefetch-{user.username}" if RESPONSE_CACHE_PER_USER else f"prefetch-{user.role}"
+        cache = get_response_cache() if RESPONSE_CACHE_ENABLED else None
+        st.session_state.prefetch_futures = {
+            prompt: self.async_client.submit(self.async_client.chat(prompt, user, session_id=session_id))
+            for prompt in get_canned_prompts(user.role)
+            if cache is None or cache.get(response_cache_key(prompt, user)) is None
+        }
+
+    def stream_chat(self, message: str, user: UserProfile) -> Iterator[Dict[str, Any]]:
+        """
+        Versión streaming de `send_chat` vía SSE (`POST /chat/stream`).
+
+        Eventos normalizados que emite el generador:
+            {"event": "status", "message": str, "progress": Optional[int]}
+            {"event": "block", "block": dict, "progress": Optional[int]}
+            {"event": "done", "response": dict}   # Paquete completo (content = todos los bloques)
+            {"event": "error", "message": str}
+
+        El paquete final se guarda en `last_api_response` igual que en `send_chat`.
+        """
+        url = f"{BACKEND_URL}/chat/stream"
+
+        payload = {
+            "message": message,
+            "session_id": f"session-{user.username}",
+            "context_profile": user.role
+        }
+        st.session_state.last_request_payload = payload
+        trace = begin_turn(message, source="stream")
+
+        # Prompt predefinido ya cacheado: se entrega completo sin abrir el stream
+        canned = message in CANNED_PROMPTS
+        if canned:
+            cached = self._get_cached_response(message, user)
+            if cached is not None:
+                trace.source = "cache"
+                trace.attach_response(cached)
+                yield {"event": "done", "response": cached}
+                return
+
+        headers = {
+            "Authorization": f"Bearer {user.token}",
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+            "X-Request-ID": trace.turn_id
+        }
+
+        blocks = []
+        envelope = {}
+        live_render_ms = 0.0  # Tiempo del consumidor dibujando bloques en vivo (frontend, no agente)
+
+        try:
+            self.transport.take_connect_ms()
+            sent_at = time.perf_counter()
+            response = self.transport.post(url, json=payload, headers=headers, stream=True)
+            headers_at = time.perf_counter()
+            connect_ms = self.transport.take_connect_ms()
+            trace.record("connect", connect_ms)
+            trace.record("ttfb", max((headers_at - sent_at) * 1000 - connect_ms, 0.0))
+            with response:
+                response.raise_for_status()
+                trace.backend_request_id = response.headers.get("X-Request-ID")
+                for event in self._iter_stream_events(response):
+                    if event["event"] == "block":
+                        blocks.append(event["block"])
+                    elif event["event"] == "done":
+                        envelope = event["data"]
+                        continue
+                    paused_at = time.perf_counter()
+                    yield event
+                    live_render_ms += (time.perf_counter() - paused_at) * 1000
+                    if event["event"] == "error":
+                        return  # Sin paquete "done": el turno no se guarda ni se cachea a medias
+            trace.record("stream", (time.perf_counter() - headers_at) * 1000 - live_render_ms)
+            trace.record("render", live_render_ms)  # El render del historial tras el rerun no vuelve a sumarse
+
+        except requests.exceptions.ConnectionError:
+            yield {"event": "error", "message": "❌ Error de Conexión: No se encuentra el Backend."}
+            return
+        except requests.exceptions.Timeout:
+            yield {"event": "error", "message": "⏱️ El Backend no respondió a tiempo. Intenta nuevamente."}
+            return
+        except requests.exceptions.HTTPError as e:
+            yield {"event": "error", "message": f"❌ El Backend rechazó la conexión: {e}"}
+            return
+
+        # Ensamblar el paquete final con el mismo contrato que /chat
+        res_json = {k: v for k, v in envelope.items() if k not in ("content", "blocks")}
+        res_json.setdefault("response_type", "visual_package")
+        res_json["content"] = blocks
+        trace.attach_response(res_json)
+
+        st.session_state.last_api_response = res_json
+        if canned:
+            self._cache_response(message, user, res_json)
+        yield {"event": "done", "response": res_json}
+
+    def stream_executive_report(self, period: str, user: UserProfile, uo2_filter: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Consume el reporte ejecutivo por secciones vía SSE (`POST /api/reports/executive/stream`).
+
+        Cada sección llega como `{"section_id": str, "blocks": [...], "progress": int}`.
+        Los errores se emiten como `{"event": "error", "message": str}`.
+        """
+        url = f"{BACKEND_URL}/api/reports/executive/stream"
+
+        payload = {
+            "period": period,
+            "uo2_filter": uo2_filter,
+            "session_id": f"session-{user.username}",
+            "context_profile": user.role
+        }
+        st.session_state.last_request_payload = payload
+
+        headers = {
+            "Authorization": f"Bearer {user.token}",
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream"
+        }
+
+        try:
+            response = self.transport.post(url, json=payload, headers=headers, stream=True)
+            with response:
+                response.raise_for_status()
+                for event_name, data in self._iter_json_events(response):
+                    if event_name == "error":
+                        yield {"event": "error", "message": data.get("detail") or data.get("message", "")}
+                    elif "section_id" in data:
+                        yield data
+
+        except requests.exceptions.ConnectionError:
+            yield {"event": "error", "message": "❌ Error de Conexión: No se encuentra el Backend."}
+        except requests.exceptions.Timeout:
+            yield {"event": "error", "message": "⏱️ El Backend no respondió a tiempo. Intenta nuevamente."}
+        except requests.exceptions.HTTPError as e:
+            yield {"event": "error", "message": f"❌ El Backend rechazó la conexión: {e}"}
+
+    @staticmethod
+    def _iter_json_events(response: requests.Response) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Decodifica el `data:` JSON de cada evento SSE. Datos no-JSON se envuelven en {"message": ...}.
+
+        Un último evento sin cerrar cuyo JSON está incompleto es un stream cortado a mitad de
+        evento: en su lugar se emite un evento `error`.
+        """
+        # text/event-stream es UTF-8 por especificación (requests asumiría ISO-8859-1)
+        lines = iter_sse_lines(response.iter_content(chunk_size=None))
+
+        for event_name, data_str, terminated in _iter_sse_frames(lines):
+            try:
+                data = json.loads(data_str)
+            except json.JSONDecodeError:
+                if not terminated and data_str.lstrip()[:1] in ("{", "["):
+                    yield "error", {"message": "⚠️ La respuesta del Backend se interrumpió antes de terminar."}
+                    return
+                data = {"message": data_str}
+            if not isinstance(data, dict):
+                data = {"payload": data}
+            yield event_name, data
+
+    @staticmethod
+    def _iter_stream_events(response: requests.Response) -> Iterator[Dict[str, Any]]:
+        """Traduce los eventos SSE crudos al formato normalizado de `stream_chat`."""
+        for event_name, data in ApiClient._iter_json_events(response):
+            progress = data.get("progress")
+
+            if event_name == "error":
+                yield {"event": "error", "message": data.get("detail") or data.get("message", "")}
+            elif event_name in ("done", "complete", "end"):
+                yield {"event": "done", "data": data}
+            elif event_name == "status":
+                yield {"event": "status", "message": data.get("message", ""), "progress": progress}
+            elif "block" in data:
+                yield {"event": "block", "block": data["block"], "progress": progress, "data": data}
+            elif "blocks" in data:
+                # Formato por secciones: un evento puede traer varios bloques
+                for block in data.get("blocks") or []:
+                    yield {"event": "block", "block": block, "progress": progress, "data": data}
+                if not data.get("blocks"):
+                    yield {"event": "status", "message": data.get("section_id", ""), "progress": progress, "data": data}
+            elif "type" in data:
+                yield {"event": "block", "block": data, "progress": progress, "data": data}
+            else:
+                yield {"event": "status", "message": data.get("message", ""), "progress": progress, "data": data}
 
     def reset_session(self, user: UserProfile):
         """
@@ -127,7 +548,7 @@ class ApiClient:
         }
         
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = self.transport.post(url, idempotent=True, json=payload, headers=headers)
             response.raise_for_status()
             return True
             
@@ -0,0 +1,133 @@
+# src/services/async_client.py
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Dict, Iterable, Optional, Tuple
+
+import httpx
+import streamlit as st
+
+from src.config import (
+    BACKEND_URL,
+    HTTP_POOL_MAXSIZE,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+)
+from src.security.models import UserProfile
+from src.services.wire_format import negotiation_headers
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normaliza espacios y mayúsculas para detectar prompts equivalentes."""
+    return " ".join(prompt.split()).lower()
+
+
+class AsyncApiClient:
+    """
+    Cliente asíncrono (httpx) para el endpoint /chat, con su propio event loop en un hilo daemon.
+
+    - Concurrencia: varias peticiones independientes se lanzan a la vez (`prefetch`).
+    - Coalescing: peticiones idénticas en vuelo (prompt normalizado, rol, sesión de agente)
+      comparten UNA llamada al backend; todos los solicitantes reciben el mismo resultado.
+      Un chat normal usa la sesión del usuario (`session-{username}`), así que solo se fusiona
+      con peticiones del mismo usuario; entre usuarios solo se comparten las pre-cargas, que
+      van a una sesión neutral por rol.
+
+    Los métodos `submit`/`run` permiten usarlo desde el hilo síncrono del script de Streamlit.
+    """
+
+    def __init__(self, base_url: str = BACKEND_URL, max_connections: int = HTTP_POOL_MAXSIZE):
+        self.base_url = base_url
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-api-client", daemon=True)
+        self._thread.start()
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+        self.backend_calls = 0
+        self.coalesced_calls = 0
+
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        timeout = httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+        # El cliente httpx debe crearse dentro del loop que lo va a usar
+        self._client: httpx.AsyncClient = self.run(self._create_client(limits, timeout))
+
+    async def _create_client(self, limits: httpx.Limits, timeout: httpx.Timeout) -> httpx.AsyncClient:
+        return httpx.AsyncClient(base_url=self.base_url, limits=limits, timeout=timeout)
+
+    # --- Puente sync -> async ---
+    def submit(self, coro: Awaitable) -> Future:
+        """Agenda la corrutina en el loop del cliente sin bloquear (concurrent.futures.Future)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Ejecuta la corrutina en el loop del cliente y espera su resultado."""
+        return self.submit(coro).result(timeout)
+
+    # --- API ---
+    async def chat(self, message: str, user: UserProfile, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        POST /chat con coalescing por (prompt normalizado, rol, sesión de agente).
+
+        Raises:
+            httpx.HTTPError: errores de red o HTTP (los reciben todos los solicitantes fusionados).
+        """
+        session_id = session_id or f"session-{user.username}"
+        # La sesión va en la clave: nunca se responde a un usuario con el turno (y el token) de otro
+        key = (normalize_prompt(message), user.role, session_id)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced_calls += 1
+            # shield: si un solicitante se cancela, la llamada compartida sigue viva
+            return await asyncio.shield(inflight)
+
+        task = asyncio.ensure_future(self._post_chat(message, user, session_id))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _post_chat(self, message: str, user: UserProfile, session_id: str) -> Dict[str, Any]:
+        self.backend_calls += 1
+        payload = {
+            "message": message,
+            "session_id": session_id,
+            "context_profile": user.role
+        }
+        # Solo JSON/columnas: las respuestas de este cliente terminan en el cache de respuestas
+        headers = {"Authorization": f"Bearer {user.token}", **negotiation_headers(binary=False)}
+        response = await self._client.post("/chat", json=payload, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def prefetch(self, prompts: Iterable[str], user: UserProfile) -> Dict[str, Any]:
+        """
+        Lanza concurrentemente los prompts dados. Usa una sesión de agente dedicada por rol
+        para no escribir turnos pre-cargados en la memoria conversacional del usuario; por eso
+        mismo las pre-cargas de usuarios con el mismo rol sí se fusionan entre sí.
+
+        Returns:
+            {prompt: respuesta | excepción}
+        """
+        prompts = list(dict.fromkeys(prompts))
+        session_id = f"prefetch-{user.role}"
+        results = await asyncio.gather(
+            *(self.chat(prompt, user, session_id=session_id) for prompt in prompts),
+            return_exceptions=True
+        )
+        return dict(zip(prompts, results))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "backend_calls": self.backend_calls,
+            "coalesced_calls": self.coalesced_calls,
+            "inflight": len(self._inflight),
+        }
+
+    def close(self):
+        self.run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+@st.cache_resource(show_spinner=False)
+def get_async_client() -> AsyncApiClient:
+    """Cliente async único por proceso: el coalescing aplica entre todas las sesiones."""
+    return AsyncApiClient()
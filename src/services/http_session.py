@@ -0,0 +1,153 @@
+# src/services/http_session.py
+
+import threading
+import time
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.util.retry import Retry
+from src.config import (
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_FACTOR,
+)
+
+# Estados que indican un fallo transitorio del balanceador / Cloud Run (cold start)
+RETRY_STATUSES = (502, 503, 504)
+
+# Tiempo de conexión (DNS + TCP + TLS) acumulado por hilo: el pool es compartido entre sesiones,
+# pero cada petición se atiende en el hilo del script que la hizo.
+_connect_timing = threading.local()
+
+
+class _TimedConnectionMixin:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timing.ms = getattr(_connect_timing, "ms", 0.0) + (time.perf_counter() - start) * 1000
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter cuyas conexiones nuevas registran su tiempo de conexión (ver `take_connect_ms`)."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def _is_connect_error(error: Exception) -> bool:
+    """El fallo ocurrió al conectar (DNS / TCP / TLS): la petición nunca llegó al servidor."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, ConnectTimeoutError)  # Incluye NewConnectionError (rechazada, DNS)
+
+
+class HttpTransport:
+    """
+    Transporte HTTP con pool de conexiones Keep-Alive compartido por todo el proceso.
+
+    - Reutiliza conexiones TCP/TLS hacia el backend (evita el handshake por turno).
+    - Aplica timeouts de conexión/lectura por defecto a todas las llamadas.
+    - Reintenta con backoff exponencial SOLO las llamadas marcadas como idempotentes.
+      Los errores de conexión (la petición nunca llegó al servidor) se reintentan
+      siempre. Un solo nivel de reintentos (este; el adapter no reintenta): como máximo
+      1 + HTTP_MAX_RETRIES intentos por llamada.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = HTTP_POOL_CONNECTIONS,
+        pool_maxsize: int = HTTP_POOL_MAXSIZE,
+        connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = HTTP_READ_TIMEOUT,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff_factor: float = HTTP_BACKOFF_FACTOR,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        adapter = _TimedHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=False,
+            max_retries=Retry(total=0, connect=0, read=0, status=0, raise_on_status=False),
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, url: str, idempotent: bool = False, **kwargs) -> requests.Response:
+        """
+        Ejecuta una petición sobre el pool compartido.
+
+        Args:
+            method: Verbo HTTP.
+            url: URL absoluta.
+            idempotent: Si es True, reintenta ante timeouts, errores de conexión y 502/503/504.
+                Si es False, solo ante errores al conectar.
+            **kwargs: Argumentos de `requests.Session.request` (json, data, headers...).
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        attempts = 1 + self.max_retries
+
+        for attempt in range(attempts):
+            is_last = attempt == attempts - 1
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if is_last or not (idempotent or _is_connect_error(e)):
+                    raise
+            else:
+                if is_last or not idempotent or response.status_code not in RETRY_STATUSES:
+                    return response
+                response.close()
+
+            time.sleep(self.backoff_factor * (2 ** attempt))
+
+    def post(self, url: str, idempotent: bool = False, **kwargs) -> requests.Response:
+        return self.request("POST", url, idempotent=idempotent, **kwargs)
+
+    @staticmethod
+    def take_connect_ms() -> float:
+        """ms de conexión (DNS + TCP + TLS) acumulados en este hilo desde la última llamada; reinicia."""
+        elapsed = getattr(_connect_timing, "ms", 0.0)
+        _connect_timing.ms = 0.0
+        return elapsed
+
+    def close(self):
+        self.session.close()
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_transport() -> HttpTransport:
+    """Transporte único por proceso, compartido entre todas las sesiones de Streamlit."""
+    return HttpTransport()
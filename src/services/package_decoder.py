@@ -0,0 +1,219 @@
+# src/services/package_decoder.py
+
+import json
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from src.schemas import parse_visual_block_or_raw
+
+_WHITESPACE = b" \t\r\n"
+# Dentro de un objeto/array: salta (en C) todo lo que no cambia la profundidad -texto, strings
+# completos y contenedores hoja (filas de tablas, arrays de datos)- y captura el siguiente corchete.
+# Anclado con .match: nunca empieza dentro de un string.
+_STRING = rb'"(?:[^"\\]++|\\.)*+"'
+_FLAT = rb'(?:[^"\[\]{}]++|' + _STRING + rb')*+'
+_SKIP = rb'(?:[^"\[\]{}]++|' + _STRING + rb'|[\[{]' + _FLAT + rb'[\]}])*+'
+_NEXT_BRACKET = re.compile(_SKIP + rb"([\[\]{}])", re.DOTALL)
+_SKIP_COMPLETE = re.compile(_SKIP, re.DOTALL)
+_STRING_STOP = re.compile(rb'["\\]')      # Dentro de un string: fin o escape
+_SCALAR_END = re.compile(rb"[,\]}\s]")    # Fin de número / true / false / null
+
+
+class StreamingPackageDecoder:
+    """
+    Decodifica la respuesta JSON del backend a medida que llegan los chunks del cuerpo.
+
+    Los bloques del array `content` se decodifican de a uno y pasan directo a
+    `parse_visual_block` (modelo tipado + columnar): el buffer retiene como máximo el
+    texto de un bloque y el dict crudo se descarta apenas se valida. El resto de las
+    claves del paquete (summary, telemetry, ...) son pequeñas y se decodifican enteras.
+
+    El escaneo trabaja sobre bytes UTF-8 (los caracteres estructurales de JSON son ASCII y
+    nunca aparecen dentro de una secuencia multibyte). Si la raíz no es un objeto se
+    decodifica el cuerpo completo, como `response.json()`. Igual que `json.loads`, cualquier
+    dato no-blanco después del valor raíz es un error.
+
+    Tiempos (ms) de la última decodificación: `download_ms` (esperando chunks),
+    `validate_ms` (Pydantic + columnar) y `decode_ms` (escaneo + json.loads).
+    """
+
+    def __init__(self, stream_key: str = "content",
+                 on_item: Callable[[Any], Any] = parse_visual_block_or_raw):
+        self.stream_key = stream_key
+        self.on_item = on_item
+        self.download_ms = 0.0
+        self.validate_ms = 0.0
+        self.decode_ms = 0.0
+        self.max_buffer_bytes = 0
+
+    def decode(self, chunks: Iterable[bytes]) -> Any:
+        self.download_ms = self.validate_ms = 0.0
+        self.max_buffer_bytes = 0
+        started_at = time.perf_counter()
+        self._chunks = self._timed(chunks)
+        self._buf = bytearray()
+        self._pos = 0
+        try:
+            if self._peek() != b"{"[0]:
+                while self._more():
+                    pass
+                return json.loads(self._buf)
+            result = self._decode_object()
+            if self._peek() is not None:
+                self._error("Extra data")
+            return result
+        finally:
+            self.decode_ms = (time.perf_counter() - started_at) * 1000 - self.download_ms - self.validate_ms
+            self._chunks = None
+            self._buf = bytearray()
+
+    # --- Objeto raíz ---
+
+    def _decode_object(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        self._expect(b"{")
+        if self._peek() == b"}"[0]:
+            self._pos += 1
+            return result
+        while True:
+            key = json.loads(self._scan_value())
+            if not isinstance(key, str):
+                self._error("Expecting property name enclosed in double quotes")
+            self._expect(b":")
+            if key == self.stream_key and self._peek() == b"["[0]:
+                result[key] = self._decode_items()
+            else:
+                result[key] = json.loads(self._scan_value())
+            if self._next_delimiter(b"}"):
+                return result
+
+    def _decode_items(self) -> List[Any]:
+        items = []
+        self._expect(b"[")
+        if self._peek() == b"]"[0]:
+            self._pos += 1
+            return items
+        while True:
+            raw = json.loads(self._scan_value())
+            started_at = time.perf_counter()
+            items.append(self.on_item(raw))
+            self.validate_ms += (time.perf_counter() - started_at) * 1000
+            del raw
+            if self._next_delimiter(b"]"):
+                return items
+
+    # --- Escaneo ---
+
+    def _scan_value(self) -> bytearray:
+        """Bytes del próximo valor JSON completo (descarta del buffer lo ya consumido)."""
+        first = self._peek()
+        if first is None:
+            self._error("Expecting value")  # Cuerpo cortado (ej. el backend cerró la conexión)
+        del self._buf[:self._pos]
+        self._pos = 0
+
+        if first == b'"'[0]:
+            end = self._scan_string(1)
+        elif first in b"{[":
+            end = self._scan_container()
+        else:
+            end = self._scan_scalar()
+        value = self._buf[:end]
+        self._pos = end
+        return value
+
+    def _scan_string(self, i: int) -> int:
+        """Posición siguiente a la comilla que cierra el string abierto antes de `i`."""
+        buf = self._buf
+        while True:
+            match = _STRING_STOP.search(buf, i)
+            if match is None:
+                i = len(buf)
+            elif buf[match.start()] == b'"'[0]:
+                return match.end()
+            elif match.start() + 1 < len(buf):
+                i = match.start() + 2  # Escape: el byte siguiente nunca cierra el string
+                continue
+            else:
+                i = match.start()
+            if not self._more():
+                self._error("Unterminated string")
+
+    def _scan_container(self) -> int:
+        buf = self._buf
+        depth = 1  # El corchete de apertura (en la posición 0)
+        i = 1
+        while True:
+            match = _NEXT_BRACKET.match(buf, i)
+            while match is not None:
+                i = match.end()
+                depth += 1 if buf[i - 1] in b"{[" else -1
+                if depth == 0:
+                    return i
+                match = _NEXT_BRACKET.match(buf, i)
+            # Sin más corchetes completos: se retoma después del último string cerrado
+            i = _SKIP_COMPLETE.match(buf, i).end()
+            if i < len(buf) and buf[i] == b'"'[0]:
+                # String largo partido entre chunks (ej. Arrow en base64): se sigue sin re-escanearlo
+                i = self._scan_string(i + 1)
+                continue
+            if not self._more():
+                self._error("Unterminated object or array")
+
+    def _scan_scalar(self) -> int:
+        while True:
+            match = _SCALAR_END.search(self._buf)
+            if match is not None:
+                return match.start()
+            if not self._more():
+                return len(self._buf)
+
+    def _next_delimiter(self, closing: bytes) -> bool:
+        """Consume `,` (False) o el cierre del contenedor (True)."""
+        char = self._peek()
+        self._pos += 1
+        if char == closing[0]:
+            return True
+        if char != b","[0]:
+            self._error(f"Expecting ',' or '{closing.decode()}' delimiter")
+        return False
+
+    def _expect(self, char: bytes) -> None:
+        if self._peek() != char[0]:
+            self._error(f"Expecting '{char.decode()}'")
+        self._pos += 1
+
+    def _peek(self) -> Optional[int]:
+        """Primer byte no-blanco desde la posición actual (None al final del cuerpo)."""
+        while True:
+            buf = self._buf
+            while self._pos < len(buf) and buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(buf):
+                return buf[self._pos]
+            if not self._more():
+                return None
+
+    def _more(self) -> bool:
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        self._buf += chunk
+        self.max_buffer_bytes = max(self.max_buffer_bytes, len(self._buf))
+        return True
+
+    def _timed(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        iterator = iter(chunks)
+        while True:
+            started_at = time.perf_counter()
+            chunk = next(iterator, None)
+            self.download_ms += (time.perf_counter() - started_at) * 1000
+            if chunk is None:
+                return
+            if chunk:
+                yield chunk
+
+    def _error(self, message: str) -> None:
+        snippet = bytes(self._buf[self._pos:self._pos + 80]).decode("utf-8", "replace")
+        raise json.JSONDecodeError(message, snippet, 0)
@@ -0,0 +1,185 @@
+# src/services/response_cache.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import streamlit as st
+
+from src.config import (
+    RESPONSE_CACHE_TTL_S,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_MAX_MB,
+    RESPONSE_CACHE_DIR,
+    RESPONSE_CACHE_PER_USER,
+    DATA_PERIOD,
+)
+from src.security.models import UserProfile
+from src.services.async_client import normalize_prompt
+from src.utils.lru_cache import LRUCache, approx_sizeof
+
+CacheKey = Tuple[str, str, str]
+
+
+def data_period() -> str:
+    """Periodo de datos vigente: DATA_PERIOD o, si no está fijado, el mes en curso (al momento de llamar)."""
+    return DATA_PERIOD or time.strftime("%Y-%m")
+
+
+def response_cache_key(message: str, user: UserProfile, period: Optional[str] = None) -> CacheKey:
+    """
+    Clave de cache: (prompt normalizado, alcance, periodo de datos).
+
+    El alcance es el rol (la respuesta se comparte entre los usuarios del rol) o, con
+    RESPONSE_CACHE_PER_USER, el rol y el usuario.
+    """
+    scope = f"{user.role}/{user.username}" if RESPONSE_CACHE_PER_USER else user.role
+    return (normalize_prompt(message), scope, period or data_period())
+
+
+class _DiskStore:
+    """Respaldo en SQLite (un archivo en `directory`) para sobrevivir reinicios del contenedor."""
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "response_cache.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, stored_at REAL NOT NULL, body TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _encode_key(key: CacheKey) -> str:
+        return json.dumps(key, ensure_ascii=False)
+
+    def get(self, key: CacheKey) -> Optional[Tuple[float, Dict[str, Any]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, body FROM responses WHERE key = ?", (self._encode_key(key),)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def put(self, key: CacheKey, stored_at: float, response: Dict[str, Any]) -> None:
+        body = json.dumps(response, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, stored_at, body) VALUES (?, ?, ?)",
+                (self._encode_key(key), stored_at, body)
+            )
+            self._conn.commit()
+
+    def delete(self, key: CacheKey) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (self._encode_key(key),))
+            self._conn.commit()
+
+    def purge_expired(self, oldest: float) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (oldest,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Cache de respuestas de /chat para los prompts predefinidos, compartido por todo el proceso.
+    Por defecto una respuesta se sirve a todos los usuarios del mismo rol (ver `response_cache_key`).
+
+    - Memoria: LRU con límite de entradas y de MB (ver `LRUCache`).
+    - TTL: una respuesta más antigua que `ttl_s` se descarta al leerla.
+    - Disco (opcional): SQLite en `directory`; un miss en memoria se busca ahí y se promueve.
+
+    Las respuestas se comparten entre sesiones: quien las lea NO debe mutarlas.
+    """
+
+    def __init__(self, ttl_s: float = RESPONSE_CACHE_TTL_S, max_items: int = RESPONSE_CACHE_MAX_ENTRIES,
+                 max_mb: float = RESPONSE_CACHE_MAX_MB, directory: str = RESPONSE_CACHE_DIR):
+        self.ttl_s = ttl_s
+        # Entradas: (stored_at, response); el tamaño se estima sobre la respuesta
+        self.memory = LRUCache(max_items=max_items, max_bytes=int(max_mb * 1024 * 1024),
+                               sizeof=lambda entry: approx_sizeof(entry[1]))
+        self.disk = _DiskStore(directory) if directory else None
+        self.disk_hits = 0
+        self.expired = 0
+        if self.disk is not None:
+            self.expired += self.disk.purge_expired(time.time() - self.ttl_s)
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return time.time() - stored_at <= self.ttl_s
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        entry = self.memory.get(key)
+        if entry is not None:
+            if self._is_fresh(entry[0]):
+                return entry[1]
+            self._expire(key)
+            return None
+
+        if self.disk is None:
+            return None
+        entry = self.disk.get(key)
+        if entry is None:
+            return None
+        if not self._is_fresh(entry[0]):
+            self._expire(key)
+            return None
+        self.disk_hits += 1
+        self.memory.put(key, entry)
+        return entry[1]
+
+    def put(self, key: CacheKey, response: Dict[str, Any]) -> None:
+        entry = (time.time(), response)
+        self.memory.put(key, entry)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, entry[0], response)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                # El disco es solo respaldo: un fallo no debe romper la respuesta al usuario
+                print(f"⚠️ ResponseCache: no se pudo persistir la respuesta en disco: {e}")
+
+    def _expire(self, key: CacheKey) -> None:
+        self.expired += 1
+        self.memory.pop(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        stats.update({
+            "ttl_s": self.ttl_s,
+            "expired": self.expired,
+            "disk_entries": len(self.disk) if self.disk is not None else None,
+            "disk_hits": self.disk_hits,
+        })
+        return stats
+
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache() -> ResponseCache:
+    """
+    Cache único por proceso: un prompt predefinido pedido por un analista sirve a todos los de su
+    rol, aunque el backend haya respondido con el token de ese analista (RESPONSE_CACHE_PER_USER lo evita).
+    """
+    return ResponseCache()
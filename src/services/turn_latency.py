@@ -0,0 +1,121 @@
+# src/services/turn_latency.py
+
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import streamlit as st
+
+from src.config import LATENCY_RING_SIZE
+
+# Tramo -> origen de la demora
+SPAN_GROUPS = {
+    "connect": "red",      # DNS + TCP + TLS (0 si se reutiliza una conexión del pool)
+    "ttfb": "agente",      # Envío -> primer byte: corrida del agente (LLM + BigQuery)
+    "wait": "agente",      # Cliente async / coalescing: respuesta completa sin desglose
+    "stream": "agente",    # SSE: del primer byte al evento `done` (el agente genera mientras tanto)
+    "download": "red",     # Cuerpo de la respuesta
+    "decode": "frontend",  # JSON -> dict (incremental: escaneo + json.loads por bloque)
+    "process": "frontend", # _process_response_data (sin la validación)
+    "validate": "frontend",# Pydantic + columnar + fingerprint de los bloques
+    "render": "frontend",  # Primer render del turno: en el historial, o los bloques en vivo (SSE)
+}
+GROUPS = ("red", "agente", "frontend")
+
+
+@dataclass
+class TurnTrace:
+    """
+    Tramos de latencia (ms) de UN turno de chat, de la petición al primer render.
+
+    `turn_id` viaja al backend como `X-Request-ID` para cruzarlo con sus logs; `telemetry`
+    es el bloque `telemetry` de la respuesta. Si el backend informa su propia duración
+    (`telemetry.duration_ms`), esa parte del TTFB se atribuye al agente y el resto a la red.
+    """
+    prompt: str
+    source: str = "http"  # http | async | cache | stream
+    turn_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    started_at: float = field(default_factory=time.time)
+    spans: Dict[str, float] = field(default_factory=dict)
+    telemetry: Dict[str, Any] = field(default_factory=dict)
+    backend_request_id: Optional[str] = None
+    message_idx: Optional[int] = None  # Mensaje del historial con la respuesta
+    rendered: bool = False
+
+    def attach_response(self, res_json: Any, response: Any = None) -> None:
+        """Correlación con el backend: bloque `telemetry` y su `X-Request-ID` (si lo devuelve)."""
+        if isinstance(res_json, dict) and isinstance(res_json.get("telemetry"), dict):
+            self.telemetry = res_json["telemetry"]
+        if response is not None:
+            self.backend_request_id = response.headers.get("X-Request-ID")
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + elapsed_ms
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.spans.values())
+
+    def breakdown(self) -> Dict[str, float]:
+        """ms por origen: red / agente / frontend."""
+        result = dict.fromkeys(GROUPS, 0.0)
+        for name, ms in self.spans.items():
+            result[SPAN_GROUPS.get(name, "frontend")] += ms
+        backend_ms = self.telemetry.get("duration_ms") if isinstance(self.telemetry, dict) else None
+        if isinstance(backend_ms, (int, float)) and "ttfb" in self.spans:
+            # Lo que el TTFB excede a la corrida del backend es red (cola, proxy, cold start)
+            agent = min(float(backend_ms), self.spans["ttfb"])
+            result["red"] += self.spans["ttfb"] - agent
+            result["agente"] -= self.spans["ttfb"] - agent
+        return result
+
+
+def get_turn_traces() -> Deque[TurnTrace]:
+    """Ring buffer de la sesión con los últimos LATENCY_RING_SIZE turnos."""
+    traces = st.session_state.get("turn_traces")
+    if traces is None:
+        traces = deque(maxlen=LATENCY_RING_SIZE)
+        st.session_state.turn_traces = traces
+    return traces
+
+
+def begin_turn(prompt: str, source: str = "http") -> TurnTrace:
+    trace = TurnTrace(prompt=prompt, source=source)
+    get_turn_traces().append(trace)
+    return trace
+
+
+def current_turn() -> Optional[TurnTrace]:
+    """Último turno registrado (el que se está atendiendo o el recién respondido)."""
+    traces = st.session_state.get("turn_traces")
+    return traces[-1] if traces else None
+
+
+def latency_percentiles(traces: Iterable[TurnTrace]) -> Dict[str, Dict[str, float]]:
+    """p50/p95 (ms) por tramo y por origen (red/agente/frontend) sobre los turnos dados."""
+    traces = list(traces)
+    series: Dict[str, List[float]] = {}
+    for trace in traces:
+        for name, ms in trace.spans.items():
+            series.setdefault(name, []).append(ms)
+        for group, ms in trace.breakdown().items():
+            series.setdefault(group, []).append(ms)
+        series.setdefault("total", []).append(trace.total_ms)
+
+    result = {}
+    for name, values in series.items():
+        p50, p95 = np.percentile(np.asarray(values, dtype=np.float64), (50, 95))
+        result[name] = {"turns": len(values), "p50_ms": float(p50), "p95_ms": float(p95)}
+    return result
@@ -0,0 +1,67 @@
+# src/services/wire_format.py
+
+from typing import Any, Dict
+
+from src.config import BINARY_PAYLOADS
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/vnd.msgpack", "application/msgpack", "application/x-msgpack")
+
+# Formas compactas de TABLE que el frontend sabe leer (ver `table_frame`):
+# - columns: columnas completas en lugar de filas-dict (sin repetir los nombres en cada fila)
+# - arrow: Arrow IPC stream (bytes en MessagePack, base64 en JSON)
+PAYLOAD_ENCODINGS_HEADER = "X-Payload-Encodings"
+
+
+def _msgpack():
+    try:
+        import msgpack
+        return msgpack
+    except ImportError:
+        return None
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def negotiation_headers(binary: bool = True) -> Dict[str, str]:
+    """
+    Headers de negociación del formato del cuerpo de /chat.
+
+    - Accept: MessagePack (si `msgpack` está instalado) con JSON como respaldo.
+    - X-Payload-Encodings: formas compactas de TABLE aceptadas.
+
+    La compresión de transporte no se toca: requests/urllib3 y httpx ya envían su propio
+    Accept-Encoding (gzip/deflate, + br si `brotli` está instalado) y descomprimen solos.
+
+    `binary=False` pide solo JSON y columnas (sin Arrow): respuestas que terminan en el cache de
+    respuestas, que las guarda como JSON.
+    """
+    accept = JSON_MEDIA_TYPE
+    encodings = ["columns"]
+    if binary and BINARY_PAYLOADS:
+        if _msgpack() is not None:
+            accept = f"{MSGPACK_MEDIA_TYPES[0]}, {JSON_MEDIA_TYPE};q=0.9"
+        if _has_pyarrow():
+            encodings.append("arrow")
+    return {
+        "Accept": accept,
+        PAYLOAD_ENCODINGS_HEADER: ", ".join(encodings),
+    }
+
+
+def is_msgpack(content_type: str) -> bool:
+    return (content_type or "").split(";")[0].strip().lower() in MSGPACK_MEDIA_TYPES
+
+
+def decode_msgpack(body: bytes) -> Any:
+    msgpack = _msgpack()
+    if msgpack is None:
+        # Solo se pide MessagePack si está instalado: el backend no debería enviarlo
+        raise ValueError("Respuesta MessagePack recibida pero `msgpack` no está instalado")
+    return msgpack.unpackb(body, raw=False)
@@ -3,6 +3,8 @@ import streamlit as st
 import time
 from typing import Dict, List, Any, Optional
 from src.security.models import UserProfile
+from src.utils.history_store import HistoryStore
+from src.utils.lru_cache import approx_sizeof
 
 def init_session():
     """
@@ -15,7 +17,8 @@ def init_session():
         
     # 2. Memoria del Chat (Atomicidad)
     if "chat_history" not in st.session_state:
-        st.session_state.chat_history = [] # Lista de dicts: {'role', 'content', 'metadata'}
+        # Lista de dicts: {'role', 'content', 'metadata'} con presupuesto de memoria (spill a disco)
+        st.session_state.chat_history = HistoryStore()
         
     # Compatibilidad con código legado que busca 'messages'
     if "messages" not in st.session_state:
@@ -34,6 +37,27 @@ def init_session():
     if "backend_sync" not in st.session_state:
         st.session_state.backend_sync = time.time()
 
+def get_history() -> HistoryStore:
+    """Historial de chat de la sesión (crea el store si la sesión aún no lo tiene)."""
+    if "messages" not in st.session_state:
+        init_session()
+    return st.session_state.messages
+
+def session_memory_stats() -> Dict[str, int]:
+    """Memoria estimada de la sesión por componente (bytes)."""
+    stats = {}
+    history = st.session_state.get("messages")
+    if isinstance(history, HistoryStore):
+        h = history.stats()
+        stats["history_hot"] = h["hot_bytes"] + h["rehydrated_bytes"]
+        stats["history_spilled_disk"] = h["disk_bytes"]
+    for key in ("render_cache", "export_cache"):
+        cache = st.session_state.get(key)
+        if cache is not None:
+            stats[key] = cache.stats()["bytes"]
+    stats["last_api_response"] = approx_sizeof(st.session_state.get("last_api_response"))
+    return stats
+
 def get_user() -> Optional[UserProfile]:
     return st.session_state.user
 
@@ -1,6 +1,8 @@
 import streamlit as st
 from src.config import IS_PROD
+from src.utils.profiler import profiled
 
+@profiled("apply_custom_css")
 def apply_custom_css():
     st.markdown("""
     <style>
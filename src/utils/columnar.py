@@ -0,0 +1,229 @@
+import base64
+import itertools
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from src.config import ARROW_TABLES
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # Sin pyarrow: DataFrames de pandas (numpy/object) como antes
+    pa = pc = None
+
+# Columnas de texto con a lo sumo esta fracción de valores distintos se guardan como categorías
+CATEGORY_MAX_RATIO = 0.5
+
+
+def _as_dict(obj: Any) -> Any:
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return obj
+
+
+def to_float_array(values: Any) -> Any:
+    """float64 con NaN para faltantes (None). Si la serie no es numérica se deja como lista."""
+    try:
+        return np.asarray(values if values is not None else [], dtype=np.float64)
+    except (TypeError, ValueError):
+        return list(values)
+
+
+def _columnar_datasets(ds_list: Optional[List[Any]]) -> List[Dict[str, Any]]:
+    """Datasets con `data` como array float64 (y `related_datasets` anidados igual)."""
+    result = []
+    for ds in ds_list or []:
+        ds = dict(_as_dict(ds))
+        ds["data"] = to_float_array(ds.get("data"))
+        if ds.get("related_datasets"):
+            ds["related_datasets"] = _columnar_datasets(ds["related_datasets"])
+        result.append(ds)
+    return result
+
+
+@dataclass
+class ColumnarChart:
+    """
+    Payload de un CHART en forma columnar, construido una vez al ingresar el bloque.
+
+    - `labels`: categorías + códigos (filtro por códigos, sin comparar strings).
+    - `label_list`: labels en orden original (opciones del filtro).
+    - `datasets` / `tooltip_datasets`: dicts del contrato con `data` como float64 (NaN = faltante).
+    """
+    labels: pd.Categorical
+    label_list: List[Any]
+    datasets: List[Dict[str, Any]]
+    tooltip_datasets: List[Dict[str, Any]]
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> "ColumnarChart":
+        payload = _as_dict(payload)
+        label_list = list(payload.get("labels") or [])
+        return cls(
+            labels=pd.Categorical(label_list),
+            label_list=label_list,
+            datasets=_columnar_datasets(payload.get("datasets")),
+            tooltip_datasets=_columnar_datasets(payload.get("tooltip_datasets")),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        def ds_bytes(ds_list):
+            return sum(
+                getattr(ds["data"], "nbytes", 0) + ds_bytes(ds.get("related_datasets") or [])
+                for ds in ds_list
+            )
+        return int(self.labels.codes.nbytes) + ds_bytes(self.datasets) + ds_bytes(self.tooltip_datasets)
+
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Payload del contrato (listas, None para faltantes) reconstruido desde los arrays."""
+        return {
+            "labels": list(self.label_list),
+            "datasets": _plain_datasets(self.datasets),
+            "tooltip_datasets": _plain_datasets(self.tooltip_datasets) or None,
+        }
+
+
+def _plain_datasets(ds_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    result = []
+    for ds in ds_list:
+        ds = dict(ds)
+        data = ds["data"]
+        if isinstance(data, np.ndarray):
+            ds["data"] = [None if v != v else v for v in data.tolist()]
+        if ds.get("related_datasets"):
+            ds["related_datasets"] = _plain_datasets(ds["related_datasets"])
+        result.append(ds)
+    return result
+
+
+def table_rows(frame: pd.DataFrame) -> List[List[Any]]:
+    """Filas (listas, None para faltantes) de un DataFrame de `table_frame`."""
+    return frame.astype(object).where(frame.notna(), None).values.tolist()
+
+
+def has_table_data(payload: Any) -> bool:
+    """El TABLE trae datos en alguna de sus formas (rows, columns o arrow)."""
+    get = payload.get if isinstance(payload, dict) else lambda name: getattr(payload, name, None)
+    return bool(get("rows") or get("columns") or get("arrow"))
+
+
+def _ipc_table(data: Any) -> "pa.Table":
+    """Tabla Arrow desde un Arrow IPC stream (bytes, o base64 si vino dentro de JSON)."""
+    if pa is None:
+        raise ImportError("TABLE en Arrow IPC requiere pyarrow")
+    if isinstance(data, str):
+        data = base64.b64decode(data)
+    with pa.ipc.open_stream(pa.py_buffer(data)) as reader:
+        return reader.read_all()
+
+
+def _row_columns(rows: List[Any], keys: List[Any], missing: Any) -> List[List[Any]]:
+    """Transpone las filas (dicts por `keys`, o listas por posición) a una lista por columna."""
+    if not rows:
+        return [[] for _ in keys]
+    if isinstance(rows[0], dict):
+        return [[row.get(key, missing) for row in rows] for key in keys]
+    columns = [list(col) for col in itertools.zip_longest(*rows)]
+    if len(columns) > len(keys):
+        raise ValueError(f"{len(keys)} columns passed, passed data had {len(columns)} columns")
+    return columns + [[None] * len(rows) for _ in range(len(keys) - len(columns))]
+
+
+def _arrow_series(values: Any, n_rows: int) -> pd.Series:
+    """
+    Columna con dtype Arrow, vista sin copia sobre el array Arrow. Texto de baja cardinalidad:
+    `category` (diccionario Arrow -> códigos + categorías). Tipos mezclados: `object`.
+    """
+    if isinstance(values, (pa.Array, pa.ChunkedArray)):
+        array = values
+    else:
+        try:
+            array = pa.array(values, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return pd.Series(values, dtype=object)
+    if pa.types.is_null(array.type):
+        return pd.Series([None] * n_rows, dtype=object)
+    if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+        distinct = pc.count_distinct(array).as_py()
+        if distinct and distinct <= CATEGORY_MAX_RATIO * n_rows:
+            return array.dictionary_encode().to_pandas()
+    return pd.Series(pd.arrays.ArrowExtensionArray(array), copy=False)
+
+
+def _categorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Columnas de texto (object/str) de baja cardinalidad -> `category`."""
+    if len(df):
+        for pos in range(df.shape[1]):
+            col = df.iloc[:, pos]
+            if col.dtype != object and not pd.api.types.is_string_dtype(col.dtype):
+                continue
+            values = col.dropna()
+            if len(values) and values.map(type).eq(str).all() and values.nunique() <= CATEGORY_MAX_RATIO * len(df):
+                df.isetitem(pos, col.astype("category"))
+    return df
+
+
+def table_frame(payload: Any) -> pd.DataFrame:
+    """
+    DataFrame de un TABLE, construido una vez al ingresar el bloque.
+
+    Formas del payload: `rows` (listas o dicts), `columns` (una lista por columna) o `arrow`
+    (Arrow IPC stream). Las filas se transponen una vez a columnas; cada columna se convierte
+    a Arrow y se expone como vista pandas sin copia (dtypes `[pyarrow]`). Las columnas de texto
+    de baja cardinalidad se guardan como `category` (códigos enteros + categorías únicas).
+    Soporta headers con accessors (`[{accessor, header}]`).
+
+    Sin pyarrow (o ARROW_TABLES=false): DataFrame de pandas con dtypes numpy/object.
+    """
+    payload = _as_dict(payload)
+    headers = payload.get("headers", [])
+    keys, missing = headers, None
+
+    # --- NORMALIZATION LAYER ---
+    # Handle cases where columns are defined with accessors (Section 6 format)
+    if isinstance(headers, list) and len(headers) > 0 and isinstance(headers[0], dict):
+        keys, missing = [h.get("accessor") for h in headers], ""
+        headers = [h.get("header", h.get("accessor", "Col")) for h in headers]
+
+    if payload.get("arrow"):
+        table = _ipc_table(payload["arrow"])
+        columns = table.columns
+        headers = headers or table.column_names
+    elif payload.get("columns"):
+        columns = payload["columns"]
+    else:
+        columns = _row_columns(payload.get("rows", []), keys, missing)
+    if len(columns) != len(headers):
+        raise ValueError(f"{len(headers)} columns passed, passed data had {len(columns)} columns")
+
+    if pa is None or not ARROW_TABLES:
+        if payload.get("arrow"):
+            columns = [col.to_pandas() for col in columns]
+        df = pd.DataFrame(dict(enumerate(columns)))
+        df.columns = headers
+        return _categorize(df)
+
+    n_rows = len(columns[0]) if columns else 0
+    df = pd.DataFrame({pos: _arrow_series(col, n_rows) for pos, col in enumerate(columns)}, copy=False)
+    df.columns = headers
+    return df
+
+
+def display_values(values: Any) -> pd.Series:
+    """Serie para mostrar/exportar: float64 enteros sin faltantes vuelven a int64 (sin '.0')."""
+    series = pd.Series(values)
+    if series.dtype == np.float64 and len(series) and series.notna().all() and (series % 1 == 0).all():
+        return series.astype(np.int64)
+    return series
+
+
+def columnar_nbytes(obj: Any) -> int:
+    """Memoria de una representación columnar (ColumnarChart o DataFrame)."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    return getattr(obj, "nbytes", 0)
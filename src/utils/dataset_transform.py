@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+SORT_DEFAULT = "Predeterminado"
+SORT_ASC = "Ascendente"
+SORT_DESC = "Descendente"
+
+
+def filter_indices(labels: Sequence[Any], selected_labels: Iterable[Any]) -> np.ndarray:
+    """
+    Posiciones (en orden original) de los labels seleccionados. Pertenencia por set: O(n).
+    Con labels categóricos (payload columnar) se compara por códigos, sin tocar los strings.
+    """
+    if isinstance(labels, pd.Categorical):
+        wanted = labels.categories.get_indexer(pd.Index(list(selected_labels)).unique())
+        return np.flatnonzero(np.isin(labels.codes, wanted[wanted >= 0]))
+    selected = set(selected_labels)
+    return np.fromiter((i for i, label in enumerate(labels) if label in selected), dtype=np.intp)
+
+
+def sort_permutation(values: Sequence[Any], sort_option: str) -> np.ndarray:
+    """
+    Permutación estable que ordena `values` (métrica principal).
+
+    Los None van como 0 en orden ascendente y al final en descendente. Los empates conservan
+    el orden original en ambos sentidos (igual que `list.sort(reverse=True)`).
+    """
+    descending = sort_option == SORT_DESC
+    missing = -np.inf if descending else 0.0
+    if isinstance(values, np.ndarray) and values.dtype.kind == "f":
+        # Serie columnar: NaN = faltante
+        keys = np.where(np.isnan(values), missing, values)
+        return np.argsort(-keys if descending else keys, kind="stable")
+    try:
+        keys = np.array([missing if v is None else v for v in values], dtype=float)
+    except (TypeError, ValueError):
+        # Valores no numéricos: orden Python con la misma clave
+        order = sorted(range(len(values)), key=lambda i: missing if values[i] is None else values[i], reverse=descending)
+        return np.asarray(order, dtype=np.intp)
+    return np.argsort(-keys if descending else keys, kind="stable")
+
+
+def take(data: Sequence[Any], index: np.ndarray) -> Any:
+    """
+    `[data[i] for i in index]` ignorando posiciones fuera de rango (series más cortas que labels).
+    Arrays NumPy se indexan directo (devuelve array); labels categóricos devuelven lista.
+    """
+    index = index[index < len(data)]
+    if isinstance(data, np.ndarray):
+        return data[index]
+    if isinstance(data, pd.Categorical):
+        return data[index].tolist()
+    # Gather en Python sobre índices ya resueltos: los puntos pueden ser listas/dicts (bubble)
+    return [data[i] for i in index.tolist()]
+
+
+def take_datasets(ds_list: List[Dict[str, Any]], index: np.ndarray) -> List[Dict[str, Any]]:
+    """Aplica el mismo índice a cada dataset y a sus `related_datasets` (copias superficiales)."""
+    result = []
+    for ds in ds_list:
+        new_ds = ds.copy()
+        new_ds["data"] = take(ds.get("data", []), index)
+        if ds.get("related_datasets"):
+            new_ds["related_datasets"] = take_datasets(ds["related_datasets"], index)
+        result.append(new_ds)
+    return result
+
+
+def transform_chart_datasets(labels: Sequence[Any], datasets: List[Dict[str, Any]],
+                             tooltip_datasets: Optional[List[Dict[str, Any]]],
+                             selected_labels: Iterable[Any], sort_option: str) -> Dict[str, Any]:
+    """
+    Filtro + orden de un gráfico como UNA permutación de índices aplicada en una sola pasada
+    a labels, datasets principales, tooltip y related_datasets anidados.
+
+    Al ordenar, las series se alinean al largo de la más corta (como el zip original) y el
+    orden lo define el primer dataset principal. Con labels duplicados, los related_datasets
+    siguen la misma permutación (antes se re-indexaban por `labels.index`, primera ocurrencia).
+    """
+    tooltip_datasets = tooltip_datasets or []
+    index = filter_indices(labels, selected_labels)
+
+    if datasets and sort_option != SORT_DEFAULT:
+        # Largo común tras filtrar (series más cortas que labels truncan el resultado)
+        n = len(index)
+        for ds in list(datasets) + list(tooltip_datasets):
+            n = min(n, int(np.count_nonzero(index < len(ds.get("data", [])))))
+        # Sin filas alineadas no se ordena (queda solo el filtro)
+        if n:
+            index = index[:n]
+            primary = take(datasets[0].get("data", []), index)
+            index = index[sort_permutation(primary, sort_option)]
+
+    return {
+        "labels": take(labels, index),
+        "datasets": take_datasets(datasets, index),
+        "tooltip_datasets": take_datasets(tooltip_datasets, index),
+    }
@@ -0,0 +1,75 @@
+import io
+import streamlit as st
+import pandas as pd
+from typing import Callable, Dict, Hashable
+from src.config import EXPORT_CACHE_MAX_ENTRIES, EXPORT_CACHE_MAX_MB, EXPORT_CSV_CHUNK_ROWS
+from src.utils.lru_cache import LRUCache
+
+# Formato -> (extensión, mime, etiqueta)
+EXPORT_FORMATS: Dict[str, tuple] = {
+    "CSV": ("csv", "text/csv", "📥 Descargar CSV"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet", "📥 Descargar Parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "📥 Descargar Excel"),
+}
+
+
+def available_formats() -> list:
+    """Formatos soportados por el entorno (Parquet requiere pyarrow; Excel, openpyxl)."""
+    formats = ["CSV"]
+    try:
+        import pyarrow  # noqa: F401
+        formats.append("Parquet")
+    except ImportError:
+        pass
+    try:
+        import openpyxl  # noqa: F401
+        formats.append("Excel")
+    except ImportError:
+        pass
+    return formats
+
+
+def encode_dataframe(df: pd.DataFrame, fmt: str) -> bytes:
+    """
+    Serializa el DataFrame al formato pedido.
+
+    El resultado es el archivo completo en memoria: `st.download_button` y el cache de
+    exportaciones trabajan con bytes. En CSV pandas escribe por bloques de filas
+    (`EXPORT_CSV_CHUNK_ROWS`) directo al buffer, sin armar antes el texto de toda la tabla.
+    """
+    buffer = io.BytesIO()
+    if fmt == "CSV":
+        df.to_csv(buffer, index=False, encoding="utf-8", chunksize=EXPORT_CSV_CHUNK_ROWS)
+    elif fmt == "Parquet":
+        df.to_parquet(buffer, index=False, engine="pyarrow")
+    elif fmt == "Excel":
+        df.to_excel(buffer, index=False, engine="openpyxl")
+    else:
+        raise ValueError(f"Formato de exportación no soportado: {fmt}")
+    return buffer.getvalue()
+
+
+def get_export_cache() -> LRUCache:
+    """Cache de archivos exportados de la sesión (LRU con tope de memoria)."""
+    cache = st.session_state.get("export_cache")
+    if cache is None:
+        cache = LRUCache(max_items=EXPORT_CACHE_MAX_ENTRIES, max_bytes=int(EXPORT_CACHE_MAX_MB * 1024 * 1024))
+        st.session_state.export_cache = cache
+    return cache
+
+
+def lazy_export(df_provider: Callable[[], pd.DataFrame], fmt: str, cache_key: Hashable) -> Callable[[], bytes]:
+    """
+    Devuelve un callable para `st.download_button(data=...)`.
+
+    El archivo se genera recién al hacer click (en el hilo de descarga de Streamlit) y se
+    memoriza por `cache_key` (hash del payload + filtros activos) y formato. El cache se
+    captura aquí porque el hilo de descarga no tiene acceso a la sesión.
+    """
+    cache = get_export_cache()
+    key = (cache_key, fmt)
+
+    def build() -> bytes:
+        return cache.get_or_compute(key, lambda: encode_dataframe(df_provider(), fmt))
+
+    return build
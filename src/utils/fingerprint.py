@@ -0,0 +1,31 @@
+import hashlib
+import json
+from typing import Any
+
+# 8 bytes -> 16 caracteres hex: suficiente para claves de widgets/cache dentro de una sesión
+FINGERPRINT_BYTES = 8
+
+
+def _json_default(obj: Any) -> Any:
+    # Modelos anidados en listas (ej. List[IndicatorInternal]); cualquier otra cosa como texto
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    return str(obj)
+
+
+def _canonical_bytes(obj: Any) -> bytes:
+    """Serialización canónica: JSON de pydantic para modelos, json con claves ordenadas para el resto."""
+    if hasattr(obj, "model_dump_json"):
+        # El orden de campos lo fija el esquema: ya es canónico
+        return obj.model_dump_json().encode("utf-8")
+    try:
+        text = json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_json_default)
+    except (TypeError, ValueError):
+        # Claves no ordenables (int y str mezclados) o referencias circulares
+        text = repr(obj)
+    return text.encode("utf-8")
+
+
+def content_fingerprint(obj: Any) -> str:
+    """Hash corto (blake2b) y estable del contenido de un payload. Mismo contenido -> misma clave."""
+    return hashlib.blake2b(_canonical_bytes(obj), digest_size=FINGERPRINT_BYTES).hexdigest()
@@ -0,0 +1,224 @@
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import weakref
+import zlib
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.config import HISTORY_MEMORY_BUDGET_MB, HISTORY_HOT_TURNS, HISTORY_SPILL_DIR, HISTORY_REHYDRATED_TURNS
+from src.utils.lru_cache import LRUCache, approx_sizeof
+
+
+def message_nbytes(message: Dict[str, Any]) -> int:
+    """Memoria estimada de un mensaje del historial (incluye modelos validados y copias columnar)."""
+    content = message.get("content")
+    if isinstance(content, list):
+        # Bloque a bloque: cada bloque es un árbol profundo (payload -> filas -> celdas)
+        rest = {k: v for k, v in message.items() if k != "content"}
+        return approx_sizeof(rest) + sum(approx_sizeof(block) for block in content)
+    return approx_sizeof(message)
+
+
+_BLOCK_TYPE_TITLES = {
+    "KPI_ROW": "Indicadores", "kpi_row": "Indicadores",
+    "CHART": "Gráfico", "plot": "Gráfico", "data_series": "Serie de datos",
+    "TABLE": "Tabla", "table": "Tabla", "talent_matrix": "Matriz de talento",
+}
+
+
+def block_titles(content: Any) -> List[str]:
+    """Títulos de los bloques de un paquete visual (metadata.title o el tipo de bloque)."""
+    titles = []
+    for block in content if isinstance(content, list) else []:
+        if isinstance(block, dict):
+            b_type, metadata = block.get("type"), block.get("metadata") or {}
+        else:
+            b_type, metadata = getattr(block, "type", None), getattr(block, "metadata", None) or {}
+        title = metadata.get("title") if isinstance(metadata, dict) else None
+        if title or b_type in _BLOCK_TYPE_TITLES:
+            titles.append(title or _BLOCK_TYPE_TITLES[b_type])
+    return titles
+
+
+class _SpilledTurn:
+    """Marcador de un mensaje guardado en disco: solo lo necesario para dibujarlo plegado."""
+    __slots__ = ("key", "role", "summary", "titles", "nbytes", "disk_bytes")
+
+    def __init__(self, key: int, role: str, summary: str, titles: List[str], nbytes: int, disk_bytes: int):
+        self.key = key
+        self.role = role
+        self.summary = summary
+        self.titles = titles
+        self.nbytes = nbytes
+        self.disk_bytes = disk_bytes
+
+
+class _SpillFile:
+    """Archivo SQLite temporal de UNA sesión (mensajes pickle + zlib). Se borra al cerrar."""
+
+    def __init__(self, directory: str):
+        fd, self.path = tempfile.mkstemp(prefix="chat_history_", suffix=".sqlite3", dir=directory or None)
+        os.close(fd)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE turns (key INTEGER PRIMARY KEY, body BLOB NOT NULL)")
+        self._conn.commit()
+
+    def put(self, key: int, body: bytes) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO turns (key, body) VALUES (?, ?)", (key, body))
+            self._conn.commit()
+
+    def get(self, key: int) -> bytes:
+        with self._lock:
+            return self._conn.execute("SELECT body FROM turns WHERE key = ?", (key,)).fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM turns")
+            self._conn.commit()
+
+    @staticmethod
+    def close(conn: sqlite3.Connection, path: str) -> None:
+        try:
+            conn.close()
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class HistoryStore:
+    """
+    Historial de chat de una sesión con presupuesto de memoria (reemplaza la lista `messages`).
+
+    Se comporta como una lista de mensajes (`append`, `len`, índices, `clear`, iteración).
+    Los últimos `hot_turns` mensajes siempre quedan en memoria. Si el total estimado supera
+    `budget_mb`, los paquetes visuales más antiguos se serializan (pickle + zlib) a un SQLite
+    temporal de la sesión y en memoria queda solo un marcador con rol y resumen.
+
+    Un mensaje en disco se recarga al pedirlo por índice (`store[i]`) y se conserva en un LRU
+    pequeño (`rehydrated_turns`). Para dibujar el historial sin recargar usar `peek(i)`.
+    """
+
+    def __init__(self, budget_mb: float = HISTORY_MEMORY_BUDGET_MB, hot_turns: int = HISTORY_HOT_TURNS,
+                 spill_dir: str = HISTORY_SPILL_DIR, rehydrated_turns: int = HISTORY_REHYDRATED_TURNS):
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.hot_turns = hot_turns
+        self.spill_dir = spill_dir
+        self._items: List[Any] = []
+        self._sizes: List[int] = []
+        self._hot_bytes = 0
+        self._next_key = 0
+        self._spill: Optional[_SpillFile] = None
+        self._rehydrated = LRUCache(max_items=max(rehydrated_turns, 0))
+        self.spills = 0
+        self.rehydrations = 0
+
+    # --- Protocolo de lista ---
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # Recarga los mensajes en disco: para dibujar usar `peek`
+        for idx in range(len(self._items)):
+            yield self[idx]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self._items)))]
+        item = self._items[idx]
+        if isinstance(item, _SpilledTurn):
+            return self._load(item)
+        return item
+
+    def append(self, message: Dict[str, Any]) -> None:
+        size = message_nbytes(message)
+        self._items.append(message)
+        self._sizes.append(size)
+        self._hot_bytes += size
+        self._enforce_budget()
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._sizes.clear()
+        self._hot_bytes = 0
+        self._rehydrated.clear()
+        if self._spill is not None:
+            self._spill.clear()
+
+    # --- Acceso sin recarga ---
+    def is_spilled(self, idx: int) -> bool:
+        return isinstance(self._items[idx], _SpilledTurn)
+
+    def peek(self, idx: int) -> Dict[str, Any]:
+        """El mensaje si está en memoria; si está en disco, solo {role, summary, titles, spilled}."""
+        item = self._items[idx]
+        if isinstance(item, _SpilledTurn):
+            return {"role": item.role, "summary": item.summary, "titles": item.titles, "spilled": True}
+        return item
+
+    def is_visual(self, idx: int) -> bool:
+        """True si el mensaje es un paquete visual (en memoria o archivado)."""
+        item = self._items[idx]
+        return isinstance(item, _SpilledTurn) or (isinstance(item, dict) and isinstance(item.get("content"), list))
+
+    # --- Spill / rehydrate ---
+    def _enforce_budget(self) -> None:
+        if not self.budget_bytes or self._hot_bytes <= self.budget_bytes:
+            return
+        protected_from = max(len(self._items) - self.hot_turns, 0)
+        for idx in range(protected_from):
+            if self._hot_bytes <= self.budget_bytes:
+                break
+            item = self._items[idx]
+            # Solo paquetes visuales: los textos son chicos y se dibujan siempre
+            if isinstance(item, dict) and isinstance(item.get("content"), list):
+                self._spill_item(idx)
+
+    def _spill_item(self, idx: int) -> None:
+        message = self._items[idx]
+        if self._spill is None:
+            self._spill = _SpillFile(self.spill_dir)
+            # Borra el archivo cuando la sesión (y este store) desaparecen
+            weakref.finalize(self, _SpillFile.close, self._spill._conn, self._spill.path)
+
+        body = zlib.compress(pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        key = self._next_key
+        self._next_key += 1
+        self._spill.put(key, body)
+
+        size = self._sizes[idx]
+        self._items[idx] = _SpilledTurn(key, message.get("role", "assistant"), message.get("summary", ""),
+                                        block_titles(message.get("content")), size, len(body))
+        self._sizes[idx] = 0
+        self._hot_bytes -= size
+        self.spills += 1
+
+    def _load(self, turn: _SpilledTurn) -> Dict[str, Any]:
+        message = self._rehydrated.get(turn.key)
+        if message is None:
+            message = pickle.loads(zlib.decompress(self._spill.get(turn.key)))
+            self._rehydrated.put(turn.key, message, size=turn.nbytes)
+            self.rehydrations += 1
+        return message
+
+    # --- Instrumentación ---
+    def stats(self) -> Dict[str, Any]:
+        spilled = [item for item in self._items if isinstance(item, _SpilledTurn)]
+        return {
+            "turns": len(self._items),
+            "hot_turns": len(self._items) - len(spilled),
+            "hot_bytes": self._hot_bytes,
+            "rehydrated_bytes": self._rehydrated.current_bytes,
+            "spilled_turns": len(spilled),
+            "spilled_bytes": sum(t.nbytes for t in spilled),
+            "disk_bytes": sum(t.disk_bytes for t in spilled),
+            "budget_bytes": self.budget_bytes,
+            "spills": self.spills,
+            "rehydrations": self.rehydrations,
+        }
@@ -0,0 +1,132 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def approx_sizeof(obj: Any, _depth: int = 0) -> int:
+    """
+    Estimación rápida (no exacta) del tamaño en bytes de un objeto.
+
+    Recorre contenedores hasta una profundidad limitada y muestrea listas largas
+    para que el costo sea O(1) aproximado, no O(n).
+    """
+    if obj is None:
+        return 0
+    if hasattr(obj, "memory_usage") and hasattr(obj, "columns"):  # pandas DataFrame
+        return int(obj.memory_usage(index=True, deep=False).sum())
+    if hasattr(obj, "nbytes"):  # numpy / pyarrow
+        return int(obj.nbytes)
+    if isinstance(obj, (bytes, bytearray, str)):
+        return sys.getsizeof(obj)
+    if hasattr(obj, "__pydantic_fields_set__"):  # Modelo pydantic: sus campos (y privados) sin sumar profundidad
+        private = getattr(obj, "__pydantic_private__", None) or {}
+        return sys.getsizeof(obj) + approx_sizeof(obj.__dict__, _depth) + approx_sizeof(private, _depth)
+    if _depth > 4:
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            approx_sizeof(k, _depth + 1) + approx_sizeof(v, _depth + 1) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        n = len(obj)
+        if n == 0:
+            return sys.getsizeof(obj)
+        sample = list(obj)[:32] if n > 32 else obj
+        avg = sum(approx_sizeof(x, _depth + 1) for x in sample) / len(sample)
+        return sys.getsizeof(obj) + int(avg * n)
+    return sys.getsizeof(obj)
+
+
+class LRUCache:
+    """
+    Cache LRU thread-safe con límite de entradas y de memoria (bytes estimados).
+
+    Args:
+        max_items: Máximo de entradas.
+        max_bytes: Presupuesto de memoria estimada. 0 = sin límite.
+        sizeof: Función que estima el tamaño de un valor (por defecto `approx_sizeof`).
+    """
+
+    def __init__(self, max_items: int = 256, max_bytes: int = 0, sizeof: Optional[Callable[[Any], int]] = None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or approx_sizeof
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> None:
+        size = self.sizeof(value) if size is None else size
+        with self._lock:
+            if key in self._data:
+                self.current_bytes -= self._data.pop(key)[1]
+            # Un valor más grande que todo el presupuesto no se cachea
+            if self.max_bytes and size > self.max_bytes:
+                return
+            self._data[key] = (value, size)
+            self.current_bytes += size
+            self._evict()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        sentinel = _MISSING
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return default
+            self.current_bytes -= entry[1]
+            return entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.current_bytes = 0
+
+    def _evict(self) -> None:
+        while self._data and (
+            len(self._data) > self.max_items
+            or (self.max_bytes and self.current_bytes > self.max_bytes)
+        ):
+            _, (_, size) = self._data.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.current_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+_MISSING = object()
@@ -0,0 +1,134 @@
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.config import PROFILER_ENABLED, PROFILER_MAX_SAMPLES
+
+# Límites de los buckets del histograma (ms); el último bucket es "> 5000"
+HISTOGRAM_BOUNDS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class Profiler:
+    """
+    Tiempos de render del frontend por sección (CSS, sidebar, renderers, validación, figuras,
+    serialización de `st.plotly_chart`), compartido por el proceso.
+
+    Cada nombre guarda las últimas `max_samples` duraciones (ms). Los tiempos son inclusivos:
+    `Visualizer._render_block` incluye el `_render_chart_v2` que llama.
+    """
+
+    def __init__(self, max_samples: int = PROFILER_MAX_SAMPLES):
+        self.max_samples = max_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.max_samples)
+            samples.append(elapsed_ms)
+            self._calls[name] = self._calls.get(name, 0) + 1
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._calls.clear()
+            self.started_at = time.time()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Por nombre: llamadas, p50/p95/máx/total (ms, sobre las muestras retenidas) e histograma."""
+        with self._lock:
+            snapshot = {name: (np.fromiter(samples, dtype=np.float64), self._calls[name])
+                        for name, samples in self._samples.items()}
+        result = {}
+        for name, (values, calls) in snapshot.items():
+            p50, p95 = np.percentile(values, (50, 95))
+            counts = np.bincount(np.searchsorted(HISTOGRAM_BOUNDS_MS, values, side="left"),
+                                 minlength=len(HISTOGRAM_BOUNDS_MS) + 1)
+            result[name] = {
+                "calls": calls,
+                "samples": len(values),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "max_ms": float(values.max()),
+                "total_ms": float(values.sum()),
+                "histogram": dict(zip(_histogram_labels(), counts.tolist())),
+            }
+        # Más costoso primero (p95)
+        return dict(sorted(result.items(), key=lambda item: item[1]["p95_ms"], reverse=True))
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "started_at": self.started_at,
+            "exported_at": time.time(),
+            "max_samples": self.max_samples,
+            "stats": self.stats(),
+        }, indent=2)
+
+
+def _histogram_labels() -> Tuple[str, ...]:
+    bounds = HISTOGRAM_BOUNDS_MS
+    return tuple(f"<= {b} ms" for b in bounds) + (f"> {bounds[-1]} ms",)
+
+
+_PROFILER = Profiler()
+_NULL_SPAN = nullcontext()
+
+
+def get_profiler() -> Profiler:
+    return _PROFILER
+
+
+def profile_span(name: str):
+    """`with profile_span("x"):` mide el bloque. Deshabilitado: un nullcontext compartido."""
+    if not PROFILER_ENABLED:
+        return _NULL_SPAN
+    return _PROFILER.span(name)
+
+
+def profiled(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorador que mide cada llamada a la función. Con el profiler deshabilitado devuelve
+    la función original (sin costo por llamada).
+    """
+    def decorator(func: Callable) -> Callable:
+        if not PROFILER_ENABLED:
+            return func
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _PROFILER.record(label, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorator
+
+
+def instrument_methods(cls: type, prefixes: Tuple[str, ...]) -> type:
+    """Aplica `profiled` a los staticmethods de `cls` cuyo nombre empieza con `prefixes`."""
+    if not PROFILER_ENABLED:
+        return cls
+    for attr, value in list(vars(cls).items()):
+        if isinstance(value, staticmethod) and attr.startswith(prefixes):
+            setattr(cls, attr, staticmethod(profiled(f"{cls.__name__}.{attr}")(value.__func__)))
+    return cls
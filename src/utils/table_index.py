@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Separador entre columnas en el índice de búsqueda: un término nunca "cruza" dos celdas
+_COLUMN_SEP = "\x1f"
+
+
+def build_search_index(df: pd.DataFrame) -> pd.Series:
+    """
+    Construye el índice de búsqueda global de una tabla (una sola vez por payload).
+
+    Cada fila se representa como el texto en minúsculas de todas sus celdas (`astype(str)`),
+    concatenado con un separador. La concatenación es vectorizada por columna, no por fila.
+
+    A diferencia del filtro original, las celdas faltantes son texto vacío: buscar "none" o
+    "nan" ya no encuentra las celdas sin valor.
+    """
+    if df.empty or len(df.columns) == 0:
+        return pd.Series([""] * len(df), index=df.index, dtype=object)
+
+    index = None
+    # Por posición (iloc): tolera encabezados duplicados
+    for pos in range(df.shape[1]):
+        col = df.iloc[:, pos]
+        # Faltantes -> "" antes de astype(str) (en object serían "None"/"nan"; en str/[pyarrow]
+        # seguirían siendo NA y anularían la fila entera al concatenar)
+        part = col.astype(object).where(col.notna(), "").astype(str).str.lower()
+        index = part if index is None else index + _COLUMN_SEP + part
+    return index
+
+
+def search_mask(index: pd.Series, term: str) -> np.ndarray:
+    """Máscara booleana de filas cuyo texto contiene `term` (sin distinguir mayúsculas, sin regex)."""
+    if not term:
+        return np.ones(len(index), dtype=bool)
+    return index.str.contains(term.lower(), regex=False, na=False).to_numpy(dtype=bool)
+
+
+# Columnas con menos valores distintos que esto ofrecen filtro (multiselect)
+FACET_MAX_VALUES = 50
+
+
+@dataclass
+class Facet:
+    """Columna filtrable: valores distintos ordenados (opciones) y las filas de cada uno."""
+    values: List[Any]
+    bitmaps: Dict[Any, np.ndarray]  # valor -> bits empaquetados (np.packbits), un bit por fila
+
+
+@dataclass
+class FacetIndex:
+    """
+    Índice de facetas de una tabla (una sola vez por payload): cardinalidad de las columnas
+    candidatas y, para las filtrables, valor -> bitmap de filas. Aplicar varios filtros es
+    una intersección de bitmaps, sin `isin` ni DataFrames intermedios.
+    """
+    n_rows: int
+    cardinality: Dict[Any, int]
+    facets: Dict[Any, Facet]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(bits.nbytes for facet in self.facets.values() for bits in facet.bitmaps.values())
+
+    def mask(self, selections: Dict[Any, Iterable[Any]]) -> Optional[np.ndarray]:
+        """
+        Filas que cumplen las selecciones (OR dentro de una columna, AND entre columnas) como
+        máscara booleana. None si no hay ninguna selección activa.
+        """
+        packed = None
+        for column, selected in selections.items():
+            facet = self.facets.get(column)
+            if facet is None or not selected:
+                continue
+            column_bits = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+            for value in selected:
+                bits = facet.bitmaps.get(value)
+                if bits is not None:
+                    np.bitwise_or(column_bits, bits, out=column_bits)
+            packed = column_bits if packed is None else np.bitwise_and(packed, column_bits, out=packed)
+        if packed is None:
+            return None
+        return np.unpackbits(packed, count=self.n_rows).view(bool)
+
+
+def _is_label_dtype(dtype: Any) -> bool:
+    return dtype == object or isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(dtype)
+
+
+def build_facet_index(df: pd.DataFrame, include_numeric: bool = False) -> FacetIndex:
+    """
+    Facetas de las columnas de texto (object / str / [pyarrow] / category) y, con
+    `include_numeric`, también numéricas, con menos de FACET_MAX_VALUES valores distintos.
+    Encabezados duplicados: se indexa solo la primera columna con ese nombre.
+    """
+    cardinality: Dict[Any, int] = {}
+    facets: Dict[Any, Facet] = {}
+    first = ~df.columns.duplicated()
+    for pos, column in enumerate(df.columns):
+        if not first[pos]:
+            continue
+        series = df.iloc[:, pos]
+        if not (_is_label_dtype(series.dtype) or (include_numeric and pd.api.types.is_numeric_dtype(series.dtype))):
+            continue
+        codes, uniques = pd.factorize(series)
+        cardinality[column] = len(uniques)
+        if not 0 < len(uniques) < FACET_MAX_VALUES:
+            continue
+        values = uniques.tolist()
+        try:
+            order = sorted(range(len(values)), key=values.__getitem__)
+        except TypeError:
+            # Tipos mezclados no ordenables: orden por su texto
+            order = sorted(range(len(values)), key=lambda i: str(values[i]))
+        facets[column] = Facet(
+            values=[values[i] for i in order],
+            bitmaps={values[i]: np.packbits(codes == i) for i in order},
+        )
+    return FacetIndex(n_rows=len(df), cardinality=cardinality, facets=facets)
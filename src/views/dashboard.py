@@ -1,6 +1,7 @@
 # src/views/dashboard.py
 import streamlit as st
-from src.state import get_user
+from src.state import get_user, get_history, session_memory_stats
+from src.utils.history_store import block_titles
 from src.services.api_client import ApiClient
 from src.components.sidebar import render_sidebar
 from src.components.dashboard_widgets import (
@@ -9,9 +10,18 @@ from src.components.dashboard_widgets import (
     render_suggestions_grid
 )
 from src.components.visualizer import Visualizer
-from src.config import SHOW_DEBUG_UI
+from src.schemas import VisualBlock, parse_visual_blocks
+from src.services.response_cache import data_period, get_response_cache
+from src.utils.profiler import get_profiler
+from src.services.turn_latency import GROUPS, current_turn, get_turn_traces, latency_percentiles
+from src.config import (
+    SHOW_DEBUG_UI, CHAT_STREAMING, ASYNC_TRANSPORT, PREFETCH_CANNED_PROMPTS, RESPONSE_CACHE_ENABLED,
+    HISTORY_COMPACT, HISTORY_LIVE_TURNS, PROFILER_ENABLED
+)
 import json
 import re
+import time
+from contextlib import nullcontext
 
 def render_dashboard():
     user = get_user()
@@ -22,40 +32,25 @@ def render_dashboard():
 
 
 
+    # --- Pre-carga concurrente de prompts predefinidos (pantalla inicial) ---
+    if ASYNC_TRANSPORT and PREFETCH_CANNED_PROMPTS and not st.session_state.get("messages") \
+            and "prefetch_futures" not in st.session_state:
+        api_client.prefetch_canned_prompts(user)
+
     # --- UI Principal ---
     render_welcome_header(user, api_client)
     render_action_cards(user)
     render_suggestions_grid()
 
     # --- HISTORIAL DE CHAT ---
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-
-    # Mostrar mensajes anteriores
-    for idx, msg in enumerate(st.session_state.messages):
-        if msg["role"] == "user":
-            with st.chat_message("user"):
-                st.markdown(msg["content"])
-        else:  # Assistant
-            # --- EXTRACT AND DISPLAY SUMMARY FIRST (OUTSIDE CHAT BUBBLE) ---
-            if isinstance(msg["content"], list):
-                summary = msg.get("summary", "")
-                if summary:
-                    st.info(summary, icon="📊")
-                    st.divider()
-            
-            with st.chat_message("assistant"):
-                # Si es lista (Visual Package), renderizamos con el motor
-                if isinstance(msg["content"], list):
-                    Visualizer.render(msg["content"], key_prefix=f"msg_{idx}")
-                else:
-                    st.markdown(msg["content"])
+    render_chat_history(get_history())
 
     # --- INPUT DEL USUARIO ---
     if prompt := st.chat_input("Escribe tu consulta aquí..."):
         # Limpiar estado de Debugger anterior
         if "last_api_response" in st.session_state:
             st.session_state.last_api_response = {}
+        st.session_state.last_response_cached = False
         # Agregar mensaje del usuario al historial
         st.session_state.messages.append({"role": "user", "content": prompt})
         # Renderizar feedback inmediato
@@ -70,8 +65,79 @@ def render_dashboard():
     if SHOW_DEBUG_UI and st.session_state.get("show_debugger", False):
         _render_debugger()
 
+def render_chat_history(history, compact: bool = None, live_turns: int = None):
+    """
+    Dibuja el historial de chat.
+
+    Modo compacto (HISTORY_COMPACT): solo las últimas `live_turns` respuestas visuales se dibujan
+    completas; las anteriores (y las archivadas en disco) son tarjetas livianas con el resumen
+    y los títulos de sus bloques, que se expanden a `Visualizer.render` bajo demanda. Así el
+    costo de cada rerun no crece con el largo de la conversación.
+    """
+    compact = HISTORY_COMPACT if compact is None else compact
+    live_turns = HISTORY_LIVE_TURNS if live_turns is None else live_turns
+
+    # Índice desde el cual las respuestas visuales quedan vivas
+    live_from = 0
+    if compact:
+        visual_idx = [idx for idx in range(len(history)) if history.is_visual(idx)]
+        if live_turns <= 0:
+            live_from = len(history)
+        elif len(visual_idx) > live_turns:
+            live_from = visual_idx[-live_turns]
+
+    # Primer render de la última respuesta: cierra los tramos de latencia del turno
+    trace = current_turn()
+    pending_idx = trace.message_idx if trace is not None and not trace.rendered else None
+    # En SSE el primer render fue el de los bloques en vivo (ya medido en `stream_chat`): este no suma
+    timed_idx = pending_idx if trace is not None and trace.source != "stream" else None
+
+    # peek: los turnos archivados en disco no se recargan
+    for idx in range(len(history)):
+        msg = history.peek(idx)
+        if msg.get("spilled") or (idx < live_from and history.is_visual(idx)):
+            _render_history_card(history, idx, msg)
+            continue
+
+        if msg["role"] == "user":
+            with st.chat_message("user"):
+                st.markdown(msg["content"])
+        else:  # Assistant
+            # --- EXTRACT AND DISPLAY SUMMARY FIRST (OUTSIDE CHAT BUBBLE) ---
+            if isinstance(msg["content"], list):
+                summary = msg.get("summary", "")
+                if summary:
+                    st.info(summary, icon="📊")
+                    st.divider()
+            
+            with st.chat_message("assistant"), (trace.span("render") if idx == timed_idx else nullcontext()):
+                # Si es lista (Visual Package), renderizamos con el motor
+                if isinstance(msg["content"], list):
+                    Visualizer.render(msg["content"], key_prefix=f"msg_{idx}")
+                else:
+                    st.markdown(msg["content"])
+            if idx == pending_idx:
+                trace.rendered = True
+
+def _render_history_card(history, idx, msg):
+    """Tarjeta compacta de una respuesta anterior: resumen + títulos, expandible bajo demanda."""
+    titles = msg.get("titles") if msg.get("spilled") else block_titles(msg.get("content"))
+    with st.chat_message("assistant"):
+        with st.container(border=True):
+            if msg.get("summary"):
+                st.markdown(f"📊 {msg['summary']}")
+            if titles:
+                st.caption(" · ".join(titles))
+            if st.toggle("🔎 Ver respuesta completa", key=f"expand_{idx}"):
+                full_msg = history[idx]  # Recarga desde disco si estaba archivada
+                Visualizer.render(full_msg["content"], key_prefix=f"msg_{idx}")
+
 def _handle_backend_response(prompt_content, user, api_client):
     """Maneja la llamada al backend y el procesamiento de la respuesta."""
+    if CHAT_STREAMING:
+        _handle_streaming_response(prompt_content, user, api_client)
+        return
+
     with st.status("🧠 **Analizando...**", expanded=True) as status:
         st.write("📡 Conectando con Nexus AI...")
         response_data = api_client.send_chat(prompt_content, user)
@@ -85,7 +151,58 @@ def _handle_backend_response(prompt_content, user, api_client):
         _process_response_data(response_data)
         st.rerun()
 
+def _handle_streaming_response(prompt_content, user, api_client):
+    """Consume /chat/stream y renderiza cada bloque visual apenas llega."""
+    msg_idx = len(st.session_state.messages)
+    response_data = None
+
+    with st.chat_message("assistant"):
+        progress_bar = st.progress(0, text="📡 Conectando con Nexus AI...")
+        block_count = 0
+
+        for event in api_client.stream_chat(prompt_content, user):
+            kind = event["event"]
+            progress = event.get("progress")
+
+            if kind == "block":
+                block_count += 1
+                Visualizer.render([event["block"]], key_prefix=f"msg_{msg_idx}_live_{block_count}")
+                label = f"🧩 Bloque {block_count} recibido..."
+            elif kind == "status":
+                label = f"🧠 {event.get('message') or 'Analizando...'}"
+            elif kind == "error":
+                progress_bar.empty()
+                st.error(event["message"])
+                return
+            else:  # done
+                response_data = event["response"]
+                progress_bar.progress(100, text="✅ **Respuesta Recibida**")
+                continue
+
+            if isinstance(progress, (int, float)):
+                progress_bar.progress(max(0, min(100, int(progress))), text=label)
+            else:
+                progress_bar.progress(min(95, block_count * 10), text=label)
+
+    if response_data:
+        _process_response_data(response_data)
+        st.rerun()
+
 def _process_response_data(response_data):
+    """Procesa la respuesta raw del backend y registra sus tramos (process / validate) en el turno."""
+    trace = current_turn()
+    if trace is not None and trace.message_idx is not None:
+        trace = None  # El turno ya se procesó: esta respuesta no tiene traza propia
+    started_at = time.perf_counter()
+    # La decodificación incremental ya puede haber registrado validación: solo se descuenta la de aquí
+    validate_before = trace.spans.get("validate", 0.0) if trace is not None else 0.0
+    _apply_response_data(response_data, trace)
+    if trace is not None:
+        validate_ms = trace.spans.get("validate", 0.0) - validate_before
+        trace.record("process", (time.perf_counter() - started_at) * 1000 - validate_ms)
+        trace.message_idx = len(st.session_state.messages) - 1
+
+def _apply_response_data(response_data, trace=None):
     """Procesa la respuesta raw del backend (alertas, visuales, texto)."""
     # 1. Detección de Anomalías
     anomalia = response_data.get("anomalia_detectada", False)
@@ -129,6 +246,10 @@ def _process_response_data(response_data):
             except json.JSONDecodeError:
                 pass
 
+    # La respuesta cruda solo la usa el Debugger: fuera de él no se duplica el paquete en sesión
+    if not SHOW_DEBUG_UI:
+        st.session_state.last_api_response = {}
+
     # 3. Guardar en Historial
     if is_visual:
         # --- EXTRACT ALERT/SUMMARY HIGHLIGHT ---
@@ -146,9 +267,12 @@ def _process_response_data(response_data):
             st.divider()
         # ------------------------------------------------
         
+        # Validación única al ingresar: el historial guarda modelos tipados, no dicts crudos
+        with trace.span("validate") if trace is not None else nullcontext():
+            content = parse_visual_blocks(content_payload)
         st.session_state.messages.append({
             "role": "assistant", 
-            "content": content_payload,
+            "content": content,
             "summary": summary
         })
     else:
@@ -173,7 +297,15 @@ def _render_debugger():
                 if telemetry.get("tools_executed"):
                     st.write(f"🔧 **Herramientas usadas:** `{', '.join(telemetry['tools_executed'])}`")
             
+            if st.session_state.get("last_response_cached"):
+                st.success("⚡ Respuesta servida desde el cache de prompts predefinidos.")
+
             st.write("📄 **Raw JSON Response:**")
+            content = res.get("content")
+            if isinstance(content, list) and any(isinstance(b, VisualBlock) for b in content):
+                # Decodificación incremental: `content` ya viene como modelos tipados
+                # (CHART/TABLE guardan sus datos en forma columnar: se reconstruye el payload completo)
+                res = {**res, "content": [b.dump_json() if isinstance(b, VisualBlock) else b for b in content]}
             st.json(res)
             
             st.divider()
@@ -182,3 +314,106 @@ def _render_debugger():
                 st.code(json.dumps(st.session_state.last_request_payload, indent=2), language="json")
         else:
             st.info("Esperando la primera consulta para mostrar datos de debug.")
+
+        _render_turn_latency()
+
+        _render_session_memory()
+
+        if RESPONSE_CACHE_ENABLED:
+            _render_response_cache_stats()
+
+        _render_profiler()
+
+def _render_turn_latency():
+    traces = list(get_turn_traces())
+    st.divider()
+    st.write("⏱️ **Latencia por Turno** (red / agente / frontend)")
+    if not traces:
+        st.caption("Sin turnos registrados todavía.")
+        return
+
+    last = traces[-1]
+    breakdown = last.breakdown()
+    cols = st.columns(4)
+    cols[0].metric("Total", f"{last.total_ms:,.0f} ms")
+    for col, group in zip(cols[1:], GROUPS):
+        col.metric(group.capitalize(), f"{breakdown[group]:,.0f} ms")
+    backend_id = f" · backend `{last.backend_request_id}`" if last.backend_request_id else ""
+    st.caption(f"Turno `{last.turn_id}` ({last.source}){backend_id} · "
+               + " · ".join(f"{name}: {ms:,.1f} ms" for name, ms in last.spans.items()))
+
+    if len(traces) > 1:
+        stats = latency_percentiles(traces)
+        st.dataframe(
+            [{"Tramo": name, "Turnos": s["turns"], "p50 (ms)": round(s["p50_ms"], 1), "p95 (ms)": round(s["p95_ms"], 1)}
+             for name, s in stats.items()],
+            width='stretch', hide_index=True
+        )
+        slowest = max(GROUPS, key=lambda group: stats[group]["p95_ms"])
+        st.caption(f"Últimos {len(traces)} turnos: el p95 lo domina **{slowest}**.")
+
+def _render_session_memory():
+    history_stats = get_history().stats()
+    memory = session_memory_stats()
+    st.divider()
+    st.write("🧠 **Memoria de la Sesión**")
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Total (est)", f"{sum(v for k, v in memory.items() if k != 'history_spilled_disk') / (1024 * 1024):.1f} MB")
+    c2.metric("Historial en memoria", f"{memory.get('history_hot', 0) / (1024 * 1024):.1f} MB",
+              help=f"Presupuesto: {history_stats['budget_bytes'] / (1024 * 1024):.0f} MB")
+    c3.metric("Turnos archivados", f"{history_stats['spilled_turns']} / {history_stats['turns']}")
+    c4.metric("En disco", f"{history_stats['disk_bytes'] / (1024 * 1024):.1f} MB")
+    st.caption(" · ".join(f"{k}: {v / 1024:.0f} KB" for k, v in memory.items()))
+
+def _render_response_cache_stats():
+    cache = get_response_cache()
+    stats = cache.stats()
+    st.divider()
+    st.write(f"⚡ **Cache de Respuestas** (periodo `{data_period()}`, TTL {stats['ttl_s'] / 3600:.1f} h)")
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Entradas", stats["entries"])
+    c2.metric("Hit Rate", f"{stats['hit_rate']:.0%}")
+    c3.metric("Hits / Misses", f"{stats['hits']} / {stats['misses']}")
+    c4.metric("Memoria", f"{stats['bytes'] / (1024 * 1024):.1f} MB")
+    if stats["disk_entries"] is not None:
+        st.caption(f"💾 Disco: {stats['disk_entries']} entradas · {stats['disk_hits']} hits · {stats['expired']} expiradas")
+    if st.button("🗑️ Vaciar cache de respuestas", key="clear_response_cache"):
+        cache.clear()
+        st.rerun()
+
+def _render_profiler():
+    st.divider()
+    st.write("⏱️ **Profiler de Render** (frontend)")
+    if not PROFILER_ENABLED:
+        st.caption("Desactivado. Definir `PROFILER_ENABLED=true` para medir CSS, sidebar, renderers, validación y figuras.")
+        return
+
+    profiler = get_profiler()
+    stats = profiler.stats()
+    if not stats:
+        st.info("Sin muestras todavía.")
+        return
+
+    rerun = stats.get("rerun")
+    if rerun:
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Reruns", rerun["calls"])
+        c2.metric("Rerun p50", f"{rerun['p50_ms']:.0f} ms")
+        c3.metric("Rerun p95", f"{rerun['p95_ms']:.0f} ms")
+
+    st.dataframe(
+        [{"Sección": name, "Llamadas": s["calls"], "p50 (ms)": round(s["p50_ms"], 2),
+          "p95 (ms)": round(s["p95_ms"], 2), "Máx (ms)": round(s["max_ms"], 2), "Total (ms)": round(s["total_ms"], 1)}
+         for name, s in stats.items()],
+        width='stretch', hide_index=True
+    )
+    st.caption("Tiempos inclusivos sobre las últimas muestras de cada sección (compartido por el proceso).")
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.download_button("📥 Exportar JSON", data=profiler.to_json, file_name="render_profile.json",
+                           mime="application/json", key="export_profile")
+    with c2:
+        if st.button("🔄 Reiniciar profiler", key="reset_profiler"):
+            profiler.reset()
+            st.rerun()
@@ -76,3 +76,16 @@ SUGGESTIONS_COLUMNS = [
         ]
     }
 ]
+
+# --- ÍNDICE DE PROMPTS PREDEFINIDOS ---
+def get_canned_prompts(role=None):
+    """Prompts fijos (tarjetas + sugerencias) disponibles para un rol. None = todos."""
+    prompts = [
+        card["prompt"] for card in ACTION_CARDS
+        if role is None or card["role_required"] is None or role in card["role_required"]
+    ]
+    for column in SUGGESTIONS_COLUMNS:
+        prompts.extend(item["prompt"] for item in column["items"])
+    return prompts
+
+CANNED_PROMPTS = frozenset(get_canned_prompts())
@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.security.models import UserProfile
+from src.services.async_client import AsyncApiClient
+
+ANA = UserProfile(username="ana", name="Ana", role="analyst", token="token-ana")
+LUIS = UserProfile(username="luis", name="Luis", role="analyst", token="token-luis")
+
+
+@pytest.fixture
+def client():
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)  # Mantiene la llamada en vuelo mientras llegan las demás
+        body = json.loads(request.content)
+        requests.append((request.headers["Authorization"], body["session_id"]))
+        return httpx.Response(200, json={"session_id": body["session_id"],
+                                         "token": request.headers["Authorization"]})
+
+    async def mock_client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(base_url="http://backend", transport=httpx.MockTransport(handler))
+
+    api = AsyncApiClient(base_url="http://backend")
+    api.run(api._client.aclose())
+    api._client = api.run(mock_client())
+    api.requests = requests
+    yield api
+    api.close()
+
+
+async def _gather(*coros):
+    return await asyncio.gather(*coros)
+
+
+def test_same_user_same_prompt_is_coalesced(client):
+    first, second = client.run(_gather(client.chat("Rotación 2024", ANA), client.chat("  rotación   2024 ", ANA)))
+    assert first == second
+    assert client.backend_calls == 1
+    assert client.coalesced_calls == 1
+
+
+def test_other_user_with_same_role_gets_its_own_request(client):
+    ana, luis = client.run(_gather(client.chat("Rotación 2024", ANA), client.chat("Rotación 2024", LUIS)))
+    assert client.backend_calls == 2
+    assert client.coalesced_calls == 0
+    assert ana == {"session_id": "session-ana", "token": "Bearer token-ana"}
+    assert luis == {"session_id": "session-luis", "token": "Bearer token-luis"}
+
+
+def test_prefetch_is_shared_through_the_neutral_role_session(client):
+    ana, luis = client.run(_gather(client.prefetch(["Rotación 2024"], ANA), client.prefetch(["Rotación 2024"], LUIS)))
+    assert client.backend_calls == 1
+    assert ana["Rotación 2024"]["session_id"] == luis["Rotación 2024"]["session_id"] == "prefetch-analyst"
+
+
+def test_prefetch_does_not_serve_a_user_chat(client):
+    client.run(_gather(client.prefetch(["Rotación 2024"], ANA), client.chat("Rotación 2024", ANA)))
+    assert sorted(session for _, session in client.requests) == ["prefetch-analyst", "session-ana"]
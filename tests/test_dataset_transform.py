@@ -0,0 +1,127 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from benchmarks.bench_dataset_transform import legacy_transform
+from src.utils.columnar import ColumnarChart
+from src.utils.dataset_transform import transform_chart_datasets
+
+SORT_OPTIONS = ["Predeterminado", "Ascendente", "Descendente"]
+
+
+def random_case(rng: random.Random, max_labels: int = 40):
+    n = rng.randint(0, max_labels)
+    labels = [f"L{i}" for i in rng.sample(range(max_labels * 10), n)]
+
+    def series(length):
+        return [None if rng.random() < 0.1 else rng.choice([rng.randint(-5, 5), round(rng.uniform(-10, 10), 2)])
+                for _ in range(length)]
+
+    def dataset(with_related):
+        ds = {"label": "m", "data": series(max(0, n - rng.choice([0, 0, 0, 1, 3])))}
+        if with_related:
+            ds["related_datasets"] = [{"label": "r", "data": series(n)}]
+        return ds
+
+    datasets = [dataset(rng.random() < 0.5) for _ in range(rng.randint(0, 3))]
+    tooltip = [dataset(False) for _ in range(rng.randint(0, 2))]
+    selected = [l for l in labels if rng.random() < 0.7]
+    return labels, datasets, tooltip, selected, rng.choice(SORT_OPTIONS)
+
+
+def _to_lists(obj):
+    """Arrays columnar (NaN) y enteros -> listas de float/None, para comparar con la referencia."""
+    if isinstance(obj, dict):
+        return {k: _to_lists(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple, np.ndarray)):
+        return [_to_lists(v) for v in obj]
+    if isinstance(obj, float) and math.isnan(obj):
+        return None
+    if isinstance(obj, (int, float)) and not isinstance(obj, bool):
+        return float(obj)
+    return obj
+
+
+def _columnar(labels, datasets, tooltip, selected, sort_option):
+    chart = ColumnarChart.from_payload({"labels": labels, "datasets": datasets, "tooltip_datasets": tooltip})
+    return transform_chart_datasets(chart.labels, chart.datasets, chart.tooltip_datasets, selected, sort_option)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_cases_match_legacy(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        case = random_case(rng)
+        assert transform_chart_datasets(*case) == legacy_transform(*case)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_columnar_cases_match_legacy(seed):
+    rng = random.Random(1000 + seed)
+    for _ in range(50):
+        case = random_case(rng)
+        assert _to_lists(_columnar(*case)) == _to_lists(legacy_transform(*case))
+
+
+@pytest.mark.parametrize("sort_option", SORT_OPTIONS)
+def test_empty_input(sort_option):
+    assert transform_chart_datasets([], [], None, [], sort_option) == legacy_transform([], [], None, [], sort_option)
+    case = ([], [{"label": "m", "data": []}], [{"label": "t", "data": []}], [], sort_option)
+    assert transform_chart_datasets(*case) == legacy_transform(*case)
+    assert _to_lists(_columnar(*case)) == _to_lists(legacy_transform(*case))
+
+
+@pytest.mark.parametrize("sort_option", SORT_OPTIONS)
+@pytest.mark.parametrize("value", [None, 0, -3.5, 7])
+def test_single_row(sort_option, value):
+    case = (["A"], [{"label": "m", "data": [value], "related_datasets": [{"label": "r", "data": [1]}]}],
+            [{"label": "t", "data": ["x"]}], ["A"], sort_option)
+    assert transform_chart_datasets(*case) == legacy_transform(*case)
+    assert transform_chart_datasets(*case[:3], [], sort_option) == legacy_transform(*case[:3], [], sort_option)
+
+
+@pytest.mark.parametrize("sort_option", SORT_OPTIONS)
+def test_none_cells_sort_like_legacy(sort_option):
+    case = (list("abcdef"), [{"label": "m", "data": [None, 2, None, -1, 2.5, 0]}], None, list("abcdef"), sort_option)
+    assert transform_chart_datasets(*case) == legacy_transform(*case)
+    assert _to_lists(_columnar(*case)) == _to_lists(legacy_transform(*case))
+
+
+def test_nan_cells_are_kept_when_filtering():
+    nan = float("nan")
+    case = (list("abcd"), [{"label": "m", "data": [1.0, nan, None, 4]}], [{"label": "t", "data": [nan, 1, 2, 3]}],
+            ["b", "c", "d"], "Predeterminado")
+    assert _to_lists(transform_chart_datasets(*case)) == _to_lists(legacy_transform(*case))
+
+
+@pytest.mark.parametrize("sort_option", SORT_OPTIONS)
+def test_mixed_value_types(sort_option):
+    # Enteros y floats en la métrica; strings, bools y dicts (bubble) en las series que la acompañan
+    case = (["x", "y", "z", "w"],
+            [{"label": "m", "data": [3, 1.5, -2, 1.5]},
+             {"label": "bubble", "data": [{"x": 1, "y": 2, "r": 3}, {"x": 0, "y": 0, "r": 1}, [1, 2], None]}],
+            [{"label": "t", "data": ["uno", True, None, 4.0]}],
+            ["w", "x", "y", "z"], sort_option)
+    assert transform_chart_datasets(*case) == legacy_transform(*case)
+
+
+@pytest.mark.parametrize("sort_option", ["Ascendente", "Descendente"])
+def test_non_numeric_primary_metric(sort_option):
+    case = (["a", "b", "c"], [{"label": "m", "data": ["b", "c", "a"]}], None, ["a", "b", "c"], sort_option)
+    assert transform_chart_datasets(*case) == legacy_transform(*case)
+
+
+@pytest.mark.parametrize("sort_option", SORT_OPTIONS)
+def test_numeric_labels_and_unknown_selection(sort_option):
+    case = ([2020, 2021, 2022], [{"label": "m", "data": [5, None, 1]}], None, [2022, 2020, 1999], sort_option)
+    assert transform_chart_datasets(*case) == legacy_transform(*case)
+
+
+def test_input_is_not_mutated():
+    datasets = [{"label": "m", "data": [3, 1, 2], "related_datasets": [{"label": "r", "data": [30, 10, 20]}]}]
+    snapshot = [dict(ds, data=list(ds["data"])) for ds in datasets]
+    transform_chart_datasets(["a", "b", "c"], datasets, None, ["a", "b", "c"], "Ascendente")
+    assert datasets[0]["data"] == snapshot[0]["data"]
+    assert datasets[0]["related_datasets"][0]["data"] == [30, 10, 20]
@@ -0,0 +1,121 @@
+import gc
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.stub_backend import sample_visual_package
+from src.schemas import ChartBlock, TableBlock, parse_visual_blocks
+from src.utils.history_store import HistoryStore, block_titles
+
+
+def _visual_turn(n_rows: int = 200) -> dict:
+    package = sample_visual_package(n_rows=n_rows)
+    return {"role": "assistant", "summary": package["summary"], "content": parse_visual_blocks(package["content"])}
+
+
+def _text_turn(text: str = "hola") -> dict:
+    return {"role": "user", "content": text}
+
+
+@pytest.fixture
+def store(tmp_path):
+    # Presupuesto mínimo: todo paquete visual fuera de los turnos calientes va a disco
+    return HistoryStore(budget_mb=0.001, hot_turns=2, spill_dir=str(tmp_path), rehydrated_turns=1)
+
+
+def _fill(store: HistoryStore, n_pairs: int = 3) -> list:
+    originals = []
+    for i in range(n_pairs):
+        for message in (_text_turn(f"pregunta {i}"), _visual_turn()):
+            store.append(message)
+            originals.append(message)
+    return originals
+
+
+def test_old_visual_turns_spill_and_hot_turns_stay(store):
+    originals = _fill(store)
+    assert len(store) == 6
+    # Solo los paquetes visuales fuera de los 2 últimos turnos
+    assert [store.is_spilled(i) for i in range(6)] == [False, True, False, True, False, False]
+    assert store[0] is originals[0] and store[5] is originals[5]
+    stats = store.stats()
+    assert stats["spilled_turns"] == store.spills == 2
+    assert stats["disk_bytes"] > 0 and stats["rehydrations"] == 0
+
+
+def test_no_spill_under_budget(tmp_path):
+    store = HistoryStore(budget_mb=64, hot_turns=0, spill_dir=str(tmp_path))
+    _fill(store)
+    assert store.spills == 0 and not os.listdir(tmp_path)
+
+
+def test_peek_does_not_rehydrate(store):
+    originals = _fill(store)
+    peeked = store.peek(1)
+    assert peeked == {"role": "assistant", "summary": originals[1]["summary"],
+                      "titles": block_titles(originals[1]["content"]), "spilled": True}
+    assert store.is_visual(1) and not store.is_visual(0)
+    assert store.rehydrations == 0
+
+
+def test_round_trip_keeps_blocks_fingerprint_and_columnar_form(store):
+    originals = _fill(store)
+    original = originals[1]
+    restored = store[1]
+    assert restored is not original
+    assert restored["summary"] == original["summary"]
+    assert [type(b) for b in restored["content"]] == [type(b) for b in original["content"]]
+
+    for before, after in zip(original["content"], restored["content"]):
+        # La huella viaja con el bloque: no se recalcula sobre el payload ya liberado
+        assert after._fingerprint == before.fingerprint
+        assert after.dump_json() == before.dump_json()
+        if isinstance(before, TableBlock):
+            assert after._columnar_built
+            pd.testing.assert_frame_equal(after.columnar, before.columnar)
+            assert after.payload.rows == []  # Sigue sin duplicar las filas
+        if isinstance(before, ChartBlock):
+            assert after._columnar_built
+            assert after.columnar.label_list == before.columnar.label_list
+            for ds_after, ds_before in zip(after.columnar.datasets + after.columnar.tooltip_datasets,
+                                           before.columnar.datasets + before.columnar.tooltip_datasets):
+                assert ds_after["data"].dtype == np.float64
+                np.testing.assert_array_equal(ds_after["data"], ds_before["data"])
+
+
+def test_rehydrated_turns_are_kept_in_a_small_lru(store):
+    _fill(store)
+    first = store[1]
+    assert store[1] is first and store.rehydrations == 1
+    store[3]  # Expulsa al turno 1 (LRU de un solo turno)
+    assert store.rehydrations == 2
+    assert store[1] is not first and store.rehydrations == 3
+    assert store.is_spilled(1)  # Recargar no lo devuelve a la memoria caliente
+
+
+def test_iteration_and_slices_rehydrate(store):
+    originals = _fill(store)
+    assert [m["summary"] if m["role"] == "assistant" else m["content"] for m in store] == \
+        [m["summary"] if m["role"] == "assistant" else m["content"] for m in originals]
+    assert [m["role"] for m in store[-3:]] == ["assistant", "user", "assistant"]
+
+
+def test_clear_empties_memory_and_disk(store):
+    _fill(store)
+    store.clear()
+    assert len(store) == 0 and not store
+    assert store.stats()["hot_bytes"] == 0
+    store.append(_text_turn())
+    assert store[0]["content"] == "hola"
+
+
+def test_spill_file_is_removed_with_the_store(tmp_path):
+    store = HistoryStore(budget_mb=0.001, hot_turns=0, spill_dir=str(tmp_path))
+    store.append(_visual_turn())
+    store.append(_visual_turn())
+    assert len(os.listdir(tmp_path)) == 1
+    del store
+    gc.collect()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,113 @@
+import pytest
+
+from src.components.render_cache import RenderCache
+from src.utils.lru_cache import LRUCache, approx_sizeof
+
+
+def test_evicts_least_recently_used_by_count():
+    cache = LRUCache(max_items=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" pasa a ser el menos usado
+    cache.put("c", 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.evictions == 1
+
+
+def test_evicts_under_the_byte_budget():
+    cache = LRUCache(max_items=100, max_bytes=100)
+    for key in "abcd":
+        cache.put(key, key, size=30)
+    assert cache.current_bytes == 90
+    cache.put("e", "e", size=30)
+    assert [key for key in "abcde" if key in cache] == ["c", "d", "e"]
+    assert cache.current_bytes == 90
+    assert cache.evictions == 2
+
+
+def test_large_value_evicts_as_many_entries_as_needed():
+    cache = LRUCache(max_items=100, max_bytes=100)
+    for key in range(10):
+        cache.put(key, key, size=10)
+    cache.put("big", "x", size=75)
+    assert len(cache) == 3 and "big" in cache
+    assert cache.current_bytes == 95
+
+
+def test_value_larger_than_budget_is_not_cached():
+    cache = LRUCache(max_items=10, max_bytes=100)
+    cache.put("a", 1, size=50)
+    cache.put("a", 2, size=500)  # Reemplazo demasiado grande: se descarta también la versión previa
+    cache.put("b", 3, size=101)
+    assert len(cache) == 0 and cache.current_bytes == 0
+
+
+def test_replacing_and_popping_keep_the_byte_count():
+    cache = LRUCache(max_items=10, max_bytes=1000)
+    cache.put("a", 1, size=100)
+    cache.put("a", 2, size=40)
+    cache.put("b", 3, size=10)
+    assert cache.current_bytes == 50
+    assert cache.pop("a") == 2
+    assert cache.pop("missing", "default") == "default"
+    assert cache.current_bytes == 10
+    cache.clear()
+    assert cache.current_bytes == 0 and len(cache) == 0
+
+
+def test_sizes_come_from_sizeof_when_not_given():
+    cache = LRUCache(max_items=10, max_bytes=0, sizeof=len)
+    cache.put("a", "x" * 7)
+    assert cache.current_bytes == 7
+
+
+def test_get_or_compute_computes_once_and_counts_hits():
+    cache = LRUCache(max_items=10)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute("k", lambda: calls.append(1) or "v") == "v"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+
+def test_cached_none_is_a_hit():
+    cache = LRUCache(max_items=10)
+    calls = []
+    cache.get_or_compute("k", lambda: calls.append(1))
+    cache.get_or_compute("k", lambda: calls.append(1))
+    assert len(calls) == 1
+
+
+# --- RenderCache.memo ---
+
+def test_memo_is_keyed_by_identity_of_the_source():
+    cache = RenderCache(max_items=10, max_mb=1)
+    source = {"rows": [1, 2, 3]}
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+    assert cache.memo("ns", source, compute) == 1
+    assert cache.memo("ns", source, compute) == 1
+    # Otro objeto igual: nunca recibe el resultado del anterior
+    assert cache.memo("ns", {"rows": [1, 2, 3]}, compute) == 2
+
+
+def test_memo_counts_the_pinned_source_in_the_budget():
+    cache = RenderCache(max_items=10, max_mb=1)
+    source = ["x" * 1000] * 100
+    cache.memo("ns", source, lambda: 0)
+    assert cache.entries.current_bytes >= approx_sizeof(source)
+
+
+def test_memo_sources_are_evicted_under_the_budget():
+    cache = RenderCache(max_items=100, max_mb=0.1)  # ~105 KB
+    sources = [["x" * 1000] * 30 for _ in range(10)]  # ~30 KB cada una
+    for source in sources:
+        cache.memo("ns", source, lambda: 0)
+    assert cache.entries.current_bytes <= cache.entries.max_bytes
+    assert len(cache.entries) < len(sources)
+
+
+@pytest.mark.parametrize("max_items", [0, 1])
+def test_tiny_caches_still_compute(max_items):
+    cache = RenderCache(max_items=max_items, max_mb=1)
+    assert cache.get_or_build("k", lambda: 42) == 42
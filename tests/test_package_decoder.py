@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from src.services.package_decoder import StreamingPackageDecoder
+
+PACKAGES = [
+    {},
+    {"content": []},
+    {"summary": "ok", "content": [{"type": "KPI", "value": 1}, [1, 2, [3]], "x", 1.5, None, True]},
+    {"content": [{"rows": [{"a": "}]{[", "b": "quote \" and \\ backslash"}], "meta": {"k": []}}]},
+    {"text": "línea\nnueva é 中 \U0001F600 \\u0041", "content": [{"s": "\\\"]}"}], "n": -1.25e-3},
+    {"telemetry": {"nested": [{"deep": [[[]]]}]}, "content": [{}, [], ""], "tail": False},
+    {"content": [{"arrow": "A" * 5000 + "\\\"" + "B" * 3000}]},
+]
+
+
+def _decode(chunks, **kwargs):
+    return StreamingPackageDecoder(on_item=lambda raw: raw, **kwargs).decode(chunks)
+
+
+def _body(package) -> bytes:
+    return json.dumps(package, ensure_ascii=False, indent=1).encode("utf-8")
+
+
+@pytest.mark.parametrize("package", PACKAGES)
+def test_matches_json_loads_for_every_single_split(package):
+    body = _body(package)
+    for cut in range(len(body) + 1):
+        assert _decode([body[:cut], body[cut:]]) == package
+
+
+@pytest.mark.parametrize("package", PACKAGES)
+def test_matches_json_loads_byte_by_byte(package):
+    body = _body(package)
+    assert _decode(body[i:i + 1] for i in range(len(body))) == package
+
+
+def test_splits_inside_escapes_and_multibyte_characters():
+    package = {"content": [{"s": "a\\\"b\\\\\"c" + "ñ€😀" * 10}]}
+    body = json.dumps(package, ensure_ascii=False).encode("utf-8")
+    for size in (1, 2, 3, 5, 7):
+        assert _decode(body[i:i + size] for i in range(0, len(body), size)) == package
+
+
+def test_items_are_passed_to_on_item_in_order():
+    seen = []
+    result = StreamingPackageDecoder(on_item=lambda raw: seen.append(raw) or len(seen)).decode(
+        [b'{"content": [{"a": 1}, ', b'[2], "x"], "other": [9]}'])
+    assert seen == [{"a": 1}, [2], "x"]
+    assert result == {"content": [1, 2, 3], "other": [9]}
+
+
+def test_non_object_root_is_decoded_whole():
+    assert _decode([b"[1, ", b"2]"]) == [1, 2]
+    assert _decode([b'"x"']) == "x"
+
+
+@pytest.mark.parametrize("package", PACKAGES)
+def test_every_truncated_body_raises_decode_error(package):
+    body = _body(package).rstrip()
+    for cut in range(len(body)):
+        with pytest.raises(json.JSONDecodeError):
+            _decode([body[:cut]])
+
+
+@pytest.mark.parametrize("body", [b'{"a":', b'{"content":[1,', b'{"a":1,', b"{", b'{"content":[', b'{"a":"x'])
+def test_connection_dropped_mid_body_raises_decode_error(body):
+    with pytest.raises(json.JSONDecodeError):
+        _decode([body])
+
+
+@pytest.mark.parametrize("body", [b'{"a": 1} x', b'{"a": 1}{"b": 2}', b'{"content": []}]', b"[1] 2"])
+def test_trailing_data_raises(body):
+    with pytest.raises(json.JSONDecodeError):
+        _decode([body[:5], body[5:]])
+
+
+def test_trailing_whitespace_is_allowed():
+    assert _decode([b'{"a": 1}', b" \r\n\t "]) == {"a": 1}
+
+
+@pytest.mark.parametrize("body", [b'{"a" 1}', b'{1: 2}', b'{"content": [1 2]}', b'{"a": 1 "b": 2}'])
+def test_malformed_body_raises(body):
+    with pytest.raises(json.JSONDecodeError):
+        _decode([body])
+
+
+def test_buffer_holds_at_most_about_one_block():
+    block = {"rows": [{"a": i, "b": "x" * 20} for i in range(200)]}
+    body = json.dumps({"content": [block] * 50}).encode("utf-8")
+    block_size = len(json.dumps(block))
+    decoder = StreamingPackageDecoder(on_item=lambda raw: None)
+    decoder.decode(body[i:i + 1024] for i in range(0, len(body), 1024))
+    assert decoder.max_buffer_bytes < block_size + 2 * 1024
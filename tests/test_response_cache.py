@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from src.security.models import UserProfile
+from src.services import response_cache
+from src.services.response_cache import ResponseCache, response_cache_key
+
+ANA = UserProfile(username="ana", name="Ana", role="analyst", token="token-ana")
+LUIS = UserProfile(username="luis", name="Luis", role="analyst", token="token-luis")
+ADMIN = UserProfile(username="root", name="Root", role="admin", token="token-root")
+
+
+@pytest.fixture
+def month(monkeypatch):
+    current = {"value": "2026-10"}
+    real_strftime = time.strftime
+    monkeypatch.setattr(response_cache, "DATA_PERIOD", "")
+    monkeypatch.setattr(time, "strftime", lambda fmt, *args: current["value"] if fmt == "%Y-%m" else real_strftime(fmt, *args))
+    return current
+
+
+def test_key_rolls_over_with_the_month_without_restart(month):
+    cache = ResponseCache(directory="")
+    cache.put(response_cache_key("Rotación", ANA), {"month": "october"})
+    assert cache.get(response_cache_key("Rotación", ANA)) == {"month": "october"}
+
+    month["value"] = "2026-11"
+    assert response_cache_key("Rotación", ANA)[2] == "2026-11"
+    assert cache.get(response_cache_key("Rotación", ANA)) is None
+
+
+def test_fixed_data_period_overrides_the_month(month, monkeypatch):
+    monkeypatch.setattr(response_cache, "DATA_PERIOD", "carga-7")
+    month["value"] = "2030-01"
+    assert response_cache_key("x", ANA)[2] == "carga-7"
+
+
+def test_answers_are_shared_by_role_by_default(month, monkeypatch):
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_PER_USER", False)
+    cache = ResponseCache(directory="")
+    cache.put(response_cache_key("  ROTACIÓN ", ANA), {"answer": 1})
+    assert cache.get(response_cache_key("rotación", LUIS)) == {"answer": 1}
+    assert cache.get(response_cache_key("rotación", ADMIN)) is None
+
+
+def test_per_user_scope_does_not_share_answers(month, monkeypatch):
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_PER_USER", True)
+    cache = ResponseCache(directory="")
+    cache.put(response_cache_key("Rotación", ANA), {"answer": 1})
+    assert cache.get(response_cache_key("Rotación", ANA)) == {"answer": 1}
+    assert cache.get(response_cache_key("Rotación", LUIS)) is None
+
+
+def test_expired_entries_are_dropped(month, tmp_path):
+    cache = ResponseCache(ttl_s=60, directory=str(tmp_path))
+    key = response_cache_key("Rotación", ANA)
+    cache.put(key, {"answer": 1})
+    cache.memory.put(key, (time.time() - 120, {"answer": 1}))
+    assert cache.get(key) is None
+    assert cache.expired == 1
+    assert len(cache.disk) == 0
+
+
+def test_disk_entries_survive_a_new_process_cache(month, tmp_path):
+    key = response_cache_key("Rotación", ANA)
+    ResponseCache(directory=str(tmp_path)).put(key, {"answer": "ñ"})
+    restarted = ResponseCache(directory=str(tmp_path))
+    assert restarted.get(key) == {"answer": "ñ"}
+    assert restarted.disk_hits == 1
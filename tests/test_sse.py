@@ -0,0 +1,140 @@
+import json
+
+import pytest
+
+import src.services.api_client as api_client
+from benchmarks.stub_backend import start_stub_server
+from src.security.models import UserProfile
+from src.services.api_client import ApiClient, iter_sse_events, iter_sse_lines
+
+USER = UserProfile(username="ana", name="Ana", role="analyst", token="token-ana")
+
+BLOCK = {"type": "text", "payload": "hola"}
+FRAMED = (
+    ": keep-alive\n"
+    "\n"
+    "event: status\n"
+    "data: {\"message\": \"Consultando...\",\n"
+    "data:  \"progress\": 5}\n"
+    "\n"
+    ":ping\n"
+    "\n"
+    "event: block\n"
+    f"data: {json.dumps({'block': BLOCK, 'progress': 50})}\n"
+    "\n"
+    "event: done\n"
+    "data: {\"summary\": \"ok\"}\n"
+    "\n"
+)
+
+
+# --- Parser sobre líneas ---
+
+def test_multi_line_data_is_joined_with_newlines():
+    lines = ["event: status", "data: uno", "data:dos", "data:", "data:  tres", ""]
+    assert list(iter_sse_events(lines)) == [("status", "uno\ndos\n\n tres")]
+
+
+def test_comments_and_keep_alives_produce_no_events():
+    lines = [": keep-alive", "", ":", "", "data: x", ": comentario en medio", "data: y", "", ""]
+    assert list(iter_sse_events(lines)) == [("message", "x\ny")]
+
+
+def test_event_name_resets_after_each_event():
+    lines = ["event: block", "data: 1", "", "data: 2", "", "event:", "data: 3", ""]
+    assert list(iter_sse_events(lines)) == [("block", "1"), ("message", "2"), ("message", "3")]
+
+
+def test_crlf_line_endings():
+    lines = "event: block\r\ndata: 1\r\n\r\ndata: 2\r\n\r\n".split("\n")
+    assert list(iter_sse_events(lines)) == [("block", "1"), ("message", "2")]
+
+
+def test_final_event_without_trailing_blank_line_is_delivered():
+    assert list(iter_sse_events(["data: 1", "", "event: done", "data: {}"])) == [("message", "1"), ("done", "{}")]
+
+
+def test_unknown_fields_and_events_without_data_are_ignored():
+    lines = ["id: 7", "retry: 1000", "event: status", "", "data: x", "", "event: orphan"]
+    assert list(iter_sse_events(lines)) == [("message", "x")]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 64])
+def test_lines_from_chunks_any_split(size):
+    body = "data: ñandú 😀\r\n\r\ndata: a\rdata: b\n\ndata: fin".encode("utf-8")
+    chunks = [body[i:i + size] for i in range(0, len(body), size)]
+    assert list(iter_sse_lines(chunks)) == ["data: ñandú 😀", "", "data: a", "data: b", "", "data: fin"]
+
+
+def test_lines_trailing_line_ends():
+    assert list(iter_sse_lines([b"a\r\n", b"\r"])) == ["a", ""]
+    assert list(iter_sse_lines([b"a\r"])) == ["a"]
+    assert list(iter_sse_lines([b""])) == []
+
+
+# --- Framing real sobre HTTP (stub) ---
+
+@pytest.fixture
+def stub(monkeypatch):
+    servers = []
+
+    def start(raw_sse: bytes, sse_chunk_bytes: int = 0) -> ApiClient:
+        server, url = start_stub_server(raw_sse=raw_sse, sse_chunk_bytes=sse_chunk_bytes)
+        servers.append(server)
+        monkeypatch.setattr(api_client, "BACKEND_URL", url)
+        return ApiClient()
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def _events(client: ApiClient):
+    return [{k: v for k, v in event.items() if k != "data"} for event in client.stream_chat("hola", USER)]
+
+
+EXPECTED = [
+    {"event": "status", "message": "Consultando...", "progress": 5},
+    {"event": "block", "block": BLOCK, "progress": 50},
+    {"event": "done", "response": {"summary": "ok", "response_type": "visual_package", "content": [BLOCK]}},
+]
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+@pytest.mark.parametrize("chunk", [0, 1, 2, 3, 7])
+def test_stream_chat_framing_across_chunk_boundaries(stub, newline, chunk):
+    body = FRAMED.replace("\n", newline).encode("utf-8")
+    assert _events(stub(body, chunk)) == EXPECTED
+
+
+@pytest.mark.parametrize("chunk", [0, 1, 5])
+def test_stream_chat_without_trailing_blank_line(stub, chunk):
+    body = FRAMED.rstrip("\n").encode("utf-8")
+    assert _events(stub(body, chunk)) == EXPECTED
+
+
+@pytest.mark.parametrize("cut", ["data: {\"block\": {\"type\": \"te", "event: block\n"])
+def test_stream_chat_ending_mid_event(stub, cut):
+    body = FRAMED[:FRAMED.index("event: block")] + cut
+    events = _events(stub(body.encode("utf-8"), 4))
+    assert events[0] == EXPECTED[0]
+    if cut.startswith("data"):
+        # JSON cortado: error en lugar de un bloque o estado basura, y sin paquete "done"
+        assert [e["event"] for e in events] == ["status", "error"]
+    else:
+        # Evento sin datos: no hay nada que entregar
+        assert [e["event"] for e in events] == ["status", "done"]
+
+
+def test_non_json_data_is_wrapped_as_message(stub):
+    body = b"event: status\ndata: texto plano\n\nevent: done\ndata: {}\n\n"
+    assert _events(stub(body))[0] == {"event": "status", "message": "texto plano", "progress": None}
+
+
+def test_executive_report_sections_and_truncation(stub):
+    section = {"section_id": "kpis", "blocks": [BLOCK], "progress": 40}
+    body = f": hola\r\ndata: {json.dumps(section)}\r\n\r\ndata: {{\"section_id\": \"trend\", \"blo".encode("utf-8")
+    events = list(stub(body, 3).stream_executive_report("2025", USER))
+    assert events[0] == section
+    assert events[1]["event"] == "error"
+    assert len(events) == 2
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.table_index import FACET_MAX_VALUES, build_facet_index, build_search_index, search_mask
+
+
+def _random_frame(seed: int, n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "area": rng.choice(["Finanzas", "RRHH", "TI", None], n_rows),
+        "nivel": rng.integers(1, 4, n_rows),
+        "motivo": pd.Categorical(rng.choice(["RENUNCIA", "DESPIDO"], n_rows)),
+        "sede": pd.array(rng.choice(["Lima", "Cusco", "Piura"], n_rows), dtype="str"),
+        "id": np.arange(n_rows),  # Alta cardinalidad: sin faceta
+    })
+
+
+# --- FacetIndex ---
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("n_rows", [1, 7, 8, 9, 200])
+def test_mask_matches_isin_intersection(seed, n_rows):
+    df = _random_frame(seed, n_rows)
+    index = build_facet_index(df, include_numeric=True)
+    rng = np.random.default_rng(seed + 100)
+    for _ in range(5):
+        selections = {}
+        expected = np.ones(n_rows, dtype=bool)
+        for column, facet in index.facets.items():
+            if rng.random() < 0.5:
+                continue
+            chosen = [v for v in facet.values if rng.random() < 0.5]
+            selections[column] = chosen
+            if chosen:
+                expected &= df[column].isin(chosen).to_numpy()
+        mask = index.mask(selections)
+        if any(selections.values()):
+            assert mask.dtype == bool and len(mask) == n_rows
+            np.testing.assert_array_equal(mask, expected)
+        else:
+            assert mask is None
+
+
+def test_or_within_a_column_and_across_columns():
+    df = pd.DataFrame({"area": ["A", "B", "C", "A", "B"], "nivel": ["x", "x", "y", "y", "y"]})
+    index = build_facet_index(df)
+    np.testing.assert_array_equal(index.mask({"area": ["A", "B"]}), [True, True, False, True, True])
+    np.testing.assert_array_equal(index.mask({"area": ["A", "B"], "nivel": ["y"]}), [False, False, False, True, True])
+    np.testing.assert_array_equal(index.mask({"area": ["C"], "nivel": ["x"]}), [False] * 5)
+
+
+def test_empty_and_unknown_selections():
+    df = pd.DataFrame({"area": ["A", "B"]})
+    index = build_facet_index(df)
+    assert index.mask({}) is None
+    assert index.mask({"area": []}) is None
+    assert index.mask({"otra": ["A"]}) is None
+    np.testing.assert_array_equal(index.mask({"area": ["Z"]}), [False, False])
+
+
+def test_facet_values_are_sorted_and_missing_is_not_a_value():
+    df = pd.DataFrame({"area": ["TI", None, "Finanzas", "RRHH", "TI"], "mixto": [1, "b", 2.5, "a", 1]})
+    index = build_facet_index(df)
+    assert index.facets["area"].values == ["Finanzas", "RRHH", "TI"]
+    assert index.facets["mixto"].values == [1, 2.5, "a", "b"]
+    np.testing.assert_array_equal(index.mask({"area": ["TI"]}), [True, False, False, False, True])
+
+
+def test_candidate_columns():
+    df = pd.DataFrame({
+        "texto": ["a", "b"] * 30,
+        "numero": [1, 2] * 30,
+        "alta": [f"v{i}" for i in range(60)],
+    })
+    assert set(build_facet_index(df).facets) == {"texto"}
+    index = build_facet_index(df, include_numeric=True)
+    assert set(index.facets) == {"texto", "numero"}
+    assert index.cardinality["alta"] == 60 >= FACET_MAX_VALUES
+
+
+def test_duplicate_headers_index_the_first_column():
+    df = pd.DataFrame([["a", "x"], ["b", "y"]], columns=["col", "col"])
+    index = build_facet_index(df)
+    assert index.facets["col"].values == ["a", "b"]
+
+
+def test_bitmaps_are_packed():
+    df = pd.DataFrame({"area": ["A", "B"] * 500})
+    index = build_facet_index(df)
+    assert index.nbytes == 2 * 125
+
+
+# --- Índice de búsqueda ---
+
+@pytest.fixture
+def frame_with_missing():
+    return pd.DataFrame({
+        "nombre": ["Ana", None, "Luis", "Nora"],
+        "score": [1.5, np.nan, 2.0, None],
+        "sede": pd.array(["Lima", None, "None", "Piura"], dtype="str"),
+        "motivo": pd.Categorical(["RENUNCIA", None, "DESPIDO", "NaN"]),
+    })
+
+
+@pytest.mark.parametrize("term, expected", [
+    # Solo las celdas con ese texto real ("None" en sede, "NaN" en motivo), nunca los faltantes
+    ("none", [False, False, True, False]),
+    ("None", [False, False, True, False]),
+    ("nan", [False, False, False, True]),
+    ("<NA>", [False, False, False, False]),
+    ("na", [True, False, False, True]),
+])
+def test_missing_cells_are_empty_text(frame_with_missing, term, expected):
+    np.testing.assert_array_equal(search_mask(build_search_index(frame_with_missing), term), expected)
+
+
+def test_missing_cells_do_not_hide_the_rest_of_the_row(frame_with_missing):
+    index = build_search_index(frame_with_missing)
+    np.testing.assert_array_equal(search_mask(index, "piura"), [False, False, False, True])
+    np.testing.assert_array_equal(search_mask(index, "2.0"), [False, False, True, False])
+    assert index.iloc[1] == "\x1f\x1f\x1f"
+
+
+def test_search_is_case_insensitive_literal_and_per_cell():
+    df = pd.DataFrame({"a": ["Jefe (TI)", "ab"], "b": ["x", "cd"]})
+    index = build_search_index(df)
+    np.testing.assert_array_equal(search_mask(index, "JEFE (ti"), [True, False])
+    np.testing.assert_array_equal(search_mask(index, "."), [False, False])
+    np.testing.assert_array_equal(search_mask(index, "bc"), [False, False])  # No cruza de una celda a otra
+    np.testing.assert_array_equal(search_mask(index, ""), [True, True])
+
+
+def test_search_index_of_empty_frames():
+    assert len(build_search_index(pd.DataFrame())) == 0
+    assert build_search_index(pd.DataFrame(index=range(3))).tolist() == ["", "", ""]